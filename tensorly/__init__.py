@@ -1,5 +1,6 @@
 __version__ = "0.8.1"
 
+import importlib
 import sys
 
 from .base import unfold, fold
@@ -7,40 +8,6 @@ from .base import tensor_to_vec, vec_to_tensor
 from .base import partial_unfold, partial_fold
 from .base import partial_tensor_to_vec, partial_vec_to_tensor
 
-from .cp_tensor import (
-    cp_to_tensor,
-    cp_to_unfolded,
-    cp_to_vec,
-    cp_norm,
-    cp_mode_dot,
-    cp_normalize,
-    validate_cp_rank,
-)
-from .tucker_tensor import (
-    tucker_to_tensor,
-    tucker_to_unfolded,
-    tucker_to_vec,
-    tucker_mode_dot,
-    validate_tucker_rank,
-)
-from .tt_tensor import (
-    tt_to_tensor,
-    tt_to_unfolded,
-    tt_to_vec,
-    validate_tt_rank,
-    pad_tt_rank,
-)
-from .tt_matrix import (
-    tt_matrix_to_tensor,
-    tt_matrix_to_tensor,
-    validate_tt_matrix_rank,
-    tt_matrix_to_unfolded,
-    tt_matrix_to_vec,
-    tt_matrix_to_matrix,
-)
-from .tr_tensor import tr_to_tensor, tr_to_unfolded, tr_to_vec, validate_tr_rank
-from .tenalg import SVD_FUNS, svd_interface, truncated_svd
-
 from .backend import (
     set_backend,
     get_backend,
@@ -131,13 +98,62 @@ from .backend import (
 )
 
 from . import backend
-from . import decomposition
-from . import plugins
-from . import metrics
-from . import regression
-from . import tenalg
-from . import random
-from . import datasets
+from .utils.threads import set_num_threads, get_num_threads, threads
+
+# Imported on first access by __getattr__, to keep `import tensorly` fast
+_LAZY_SUBMODULES = [
+    "tenalg",
+    "cp_tensor",
+    "tucker_tensor",
+    "tt_tensor",
+    "tt_matrix",
+    "tr_tensor",
+    "parafac2_tensor",
+    "_factorized_tensor",
+    "decomposition",
+    "plugins",
+    "metrics",
+    "regression",
+    "random",
+    "datasets",
+]
+_LAZY_FUNCTIONS = {
+    "cp_tensor": [
+        "cp_to_tensor",
+        "cp_to_unfolded",
+        "cp_to_vec",
+        "cp_norm",
+        "cp_mode_dot",
+        "cp_normalize",
+        "validate_cp_rank",
+    ],
+    "tucker_tensor": [
+        "tucker_to_tensor",
+        "tucker_to_unfolded",
+        "tucker_to_vec",
+        "tucker_mode_dot",
+        "validate_tucker_rank",
+    ],
+    "tt_tensor": [
+        "tt_to_tensor",
+        "tt_to_unfolded",
+        "tt_to_vec",
+        "validate_tt_rank",
+        "pad_tt_rank",
+    ],
+    "tt_matrix": [
+        "tt_matrix_to_tensor",
+        "validate_tt_matrix_rank",
+        "tt_matrix_to_unfolded",
+        "tt_matrix_to_vec",
+        "tt_matrix_to_matrix",
+    ],
+    "tr_tensor": ["tr_to_tensor", "tr_to_unfolded", "tr_to_vec", "validate_tr_rank"],
+    "tenalg": ["SVD_FUNS", "svd_interface", "truncated_svd"],
+}
+_LAZY_MODULE_OF = {
+    name: module for module, names in _LAZY_FUNCTIONS.items() for name in names
+}
 
 
 # Add Backend functions, dynamically dispatched
@@ -146,11 +162,21 @@ def __dir__():
     and augmenting it with the dynamically dispatched variables from backend.
     """
     static_items = list(sys.modules[__name__].__dict__.keys())
-    return backend.get_backend_dir() + static_items
+    lazy_items = _LAZY_SUBMODULES + list(_LAZY_MODULE_OF)
+    return backend.get_backend_dir() + static_items + lazy_items
     # return _get_backend_dir() + static_items
 
 
-__getattr__ = backend.__getattribute__
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in _LAZY_MODULE_OF:
+        module = importlib.import_module(f"{__name__}.{_LAZY_MODULE_OF[name]}")
+        value = getattr(module, name)
+        # Cached, so that __getattr__ is only called once
+        globals()[name] = value
+        return value
+    return backend.__getattribute__(name)
 
 
 # override_module_dispatch(__name__,
@@ -1,6 +1,7 @@
 import warnings
 
 from .core import Backend, backend_array
+from .workspace import Workspace
 import importlib
 import os
 import threading
@@ -166,6 +167,30 @@ class BackendManager(types.ModuleType):
         for name in cls._attributes:
             setattr(cls, name, getattr(cls.current_backend(), name))
 
+    @classmethod
+    @contextmanager
+    def pinned(cls):
+        """Context manager pinning the backend currently in use, for tight loops
+
+        Each call to a dynamically dispatched function, e.g. ``tl.dot``, looks up the
+        backend of the current thread. The methods of the backend yielded by this context
+        manager are called directly instead. Unlike `use_static_dispatch`, no global
+        state is modified: it is thread safe, and everything else, including the ``tl``
+        functions, remains dynamically dispatched.
+
+        Yields
+        ------
+        backend : tensorly.backend.Backend
+            Backend instance in use when entering the context
+
+        Examples
+        --------
+        >>> import tensorly as tl
+        >>> with tl.backend.pinned() as backend:
+        ...     total = sum(backend.sum(backend.ones(3)) for _ in range(100))
+        """
+        yield cls.current_backend()
+
     @classmethod
     def current_backend(cls):
         """Returns the currently used backend instance
@@ -348,6 +373,7 @@ class BackendManager(types.ModuleType):
             "dynamically_dispatched_class_attribute",
             "backend_manager",
             "BackendManager",
+            "Workspace",
         ]
         return cls.get_backend_dir() + additionals
 
@@ -8,8 +8,6 @@ import warnings
 import math
 
 import numpy as np
-import scipy.special
-
 
 backend_types = [
     "int32",
@@ -1162,6 +1160,8 @@ class Backend(object):
 
         The logarithmic derivative of the gamma function evaluated at z.
         """
+        import scipy.special
+
         return self.tensor(scipy.special.digamma(x), **self.context(x))
 
     @staticmethod
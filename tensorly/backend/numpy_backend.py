@@ -5,7 +5,6 @@ from .core import (
     backend_basic_math,
     backend_array,
 )
-import scipy.special
 
 
 class NumpyBackend(Backend, backend_name="numpy"):
@@ -30,13 +29,25 @@ class NumpyBackend(Backend, backend_name="numpy"):
         return tensor.ndim
 
     @staticmethod
-    def clip(tensor, a_min=None, a_max=None):
-        return np.clip(tensor, a_min, a_max)
+    def clip(tensor, a_min=None, a_max=None, inplace=False):
+        if inplace:
+            return np.clip(tensor, a_min, a_max, out=tensor)
+        else:
+            return np.clip(tensor, a_min, a_max)
 
+    # scipy.special is only imported when needed, as it is slow to import
     @staticmethod
     def logsumexp(tensor, axis=0):
+        import scipy.special
+
         return scipy.special.logsumexp(tensor, axis=axis)
 
+    @staticmethod
+    def digamma(tensor):
+        import scipy.special
+
+        return scipy.special.digamma(tensor)
+
 
 for name in (
     backend_types
@@ -74,6 +85,3 @@ for name in (
 
 for name in ["solve", "qr", "svd", "eigh", "lstsq"]:
     NumpyBackend.register_method(name, getattr(np.linalg, name))
-
-for name in ["digamma"]:
-    NumpyBackend.register_method(name, getattr(scipy.special, name))
@@ -0,0 +1,236 @@
+from math import prod
+
+import numpy as np
+
+from .. import backend as T
+
+# Backends whose tensors can be written in place, and whose matmul takes an `out=` argument
+_OUT_BACKENDS = ("numpy", "cupy", "pytorch")
+
+
+class Workspace:
+    """Pool of arrays reused across the iterations of a solver
+
+    Each operation takes a `key`, and writes its result in the buffer stored under
+    that key, which is only (re)allocated when it is too small or of a different
+    context. The result of an operation is therefore valid until the next operation
+    using the same key, and an operand must not be the current result of the key
+    the result is written to.
+
+    With NumPy, CuPy and PyTorch (for tensors that do not require gradients), no
+    temporary is allocated. With the other backends, for other tensors (e.g. sparse),
+    or for operands of different dtypes, whose result needs a promoted dtype, the
+    operations transparently fall back to the usual functions, which return new
+    tensors.
+
+    Examples
+    --------
+    >>> import tensorly as tl
+    >>> workspace = tl.backend.Workspace()
+    >>> matrices = [tl.ones((3, 2)), tl.ones((4, 2))]
+    >>> for _ in range(10):
+    ...     product = workspace.matmul("gram", tl.transpose(matrices[0]), matrices[0])
+    ...     kr_product = workspace.khatri_rao("khatri_rao", matrices)
+    >>> tl.shape(kr_product)
+    (12, 2)
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    @staticmethod
+    def supports_out(*tensors):
+        """True if the results of operations on `tensors` can be written in buffers
+
+        The operands must all have the same context, which is that of the result.
+        """
+        if T.get_backend() not in _OUT_BACKENDS or not all(
+            T.is_tensor(tensor) and not getattr(tensor, "requires_grad", False)
+            for tensor in tensors
+        ):
+            return False
+        context = T.context(tensors[0])
+        return all(T.context(tensor) == context for tensor in tensors[1:])
+
+    @staticmethod
+    def _supports_scalar(tensor, scalar):
+        """True if an operation between `tensor` and `scalar` keeps the dtype of `tensor`"""
+        dtype = T.context(tensor)["dtype"]
+        if isinstance(scalar, complex):
+            return dtype in (T.complex64, T.complex128)
+        if isinstance(scalar, float):
+            return dtype in (T.float32, T.float64, T.complex64, T.complex128)
+        return isinstance(scalar, int)
+
+    def get(self, key, shape, **context):
+        """Buffer of the given shape and context stored under `key`
+
+        Parameters
+        ----------
+        key : hashable
+        shape : int tuple
+        context : dict
+            context of the buffer, as returned by ``tl.context``
+
+        Returns
+        -------
+        buffer : tl.tensor
+            uninitialised tensor of shape `shape`
+        """
+        size = prod(shape)
+        buffer = self._buffers.get(key)
+        if buffer is None or T.shape(buffer)[0] < size or T.context(buffer) != context:
+            buffer = T.zeros((size,), **context)
+            self._buffers[key] = buffer
+        return T.reshape(buffer[:size], shape)
+
+    def clear(self):
+        """Releases all the buffers"""
+        self._buffers.clear()
+
+    def matmul(self, key, a, b):
+        """Same as `tl.matmul`, written in the buffer `key` for (stacks of) matrices"""
+        if not (self.supports_out(a, b) and T.ndim(a) >= 2 and T.ndim(b) >= 2):
+            return T.matmul(a, b)
+        batch_shape = np.broadcast_shapes(
+            tuple(T.shape(a))[:-2], tuple(T.shape(b))[:-2]
+        )
+        out = self.get(
+            key, (*batch_shape, T.shape(a)[-2], T.shape(b)[-1]), **T.context(a)
+        )
+        return T.matmul(a, b, out=out)
+
+    def dot(self, key, a, b):
+        """Same as `tl.dot`, written in the buffer `key` for matrices"""
+        if T.ndim(a) == 2 and T.ndim(b) == 2:
+            return self.matmul(key, a, b)
+        return T.dot(a, b)
+
+    def _supports_operands(self, a, b):
+        if T.is_tensor(b):
+            return self.supports_out(a, b)
+        return self.supports_out(a) and self._supports_scalar(a, b)
+
+    def _elementwise(self, key, a, b, operation):
+        """Writes `a` in the buffer `key`, then applies ``operation(buffer, b)`` in place"""
+        shape = np.broadcast_shapes(
+            tuple(T.shape(a)), tuple(T.shape(b)) if T.is_tensor(b) else ()
+        )
+        out = self.get(key, shape, **T.context(a))
+        out[...] = a
+        return operation(out, b)
+
+    def add(self, key, a, b):
+        """``a + b``, written in the buffer `key`"""
+        if not self._supports_operands(a, b):
+            return a + b
+
+        def operation(out, b):
+            out += b
+            return out
+
+        return self._elementwise(key, a, b, operation)
+
+    def subtract(self, key, a, b):
+        """``a - b``, written in the buffer `key`"""
+        if not self._supports_operands(a, b):
+            return a - b
+
+        def operation(out, b):
+            out -= b
+            return out
+
+        return self._elementwise(key, a, b, operation)
+
+    def multiply(self, key, a, b):
+        """``a * b``, written in the buffer `key`"""
+        if not self._supports_operands(a, b):
+            return a * b
+
+        def operation(out, b):
+            out *= b
+            return out
+
+        return self._elementwise(key, a, b, operation)
+
+    def divide(self, key, a, b):
+        """``a / b``, written in the buffer `key`"""
+        # The quotient of integers is a float
+        if not (self._supports_operands(a, b) and self._supports_scalar(a, 1.0)):
+            return a / b
+
+        def operation(out, b):
+            out /= b
+            return out
+
+        return self._elementwise(key, a, b, operation)
+
+    def unfold(self, key, tensor, mode):
+        """Same as `tl.unfold`, copied in the buffer `key` when it is not a view"""
+        if mode == 0 or not self.supports_out(tensor):
+            return T.reshape(T.moveaxis(tensor, mode, 0), (T.shape(tensor)[mode], -1))
+        moved = T.moveaxis(tensor, mode, 0)
+        out = self.get(key, T.shape(moved), **T.context(tensor))
+        out[...] = moved
+        return T.reshape(out, (T.shape(tensor)[mode], -1))
+
+    def mode_dot(self, key, tensor, matrix, mode):
+        """Same as `tl.tenalg.mode_dot` with a matrix, written in the buffer `key`
+
+        `tensor` is seen as a stack of matrices, without being unfolded.
+        """
+        if not (self.supports_out(tensor, matrix) and T.ndim(matrix) == 2):
+            from ..tenalg import mode_dot
+
+            return mode_dot(tensor, matrix, mode)
+
+        shape = list(T.shape(tensor))
+        n_before, n_after = prod(shape[:mode]), prod(shape[mode + 1 :])
+        new_shape = shape[:mode] + [T.shape(matrix)[0]] + shape[mode + 1 :]
+        out = self.get(key, new_shape, **T.context(tensor))
+        if n_after == 1:
+            # Last mode: a single matrix product
+            T.matmul(
+                T.reshape(tensor, (n_before, shape[mode])),
+                T.transpose(matrix),
+                out=T.reshape(out, (n_before, -1)),
+            )
+        else:
+            T.matmul(
+                matrix,
+                T.reshape(tensor, (n_before, shape[mode], n_after)),
+                out=T.reshape(out, (n_before, -1, n_after)),
+            )
+        return out
+
+    def khatri_rao(self, key, matrices, weights=None, skip_matrix=None):
+        """Same as `tl.tenalg.khatri_rao`, written in the buffers `key`
+
+        The partial products alternate between the buffers ``(key, 0)`` and
+        ``(key, 1)``, the result being in the former.
+        """
+        if skip_matrix is not None:
+            matrices = [m for i, m in enumerate(matrices) if i != skip_matrix]
+        if len(matrices) < 2 or not self.supports_out(*matrices):
+            from ..tenalg import khatri_rao
+
+            return khatri_rao(matrices, weights=weights)
+
+        n_rows, n_columns = T.shape(matrices[0])
+        context = T.context(matrices[0])
+        result = matrices[0]
+        n_products = len(matrices) - 1
+        for i, matrix in enumerate(matrices[1:]):
+            out = self.get(
+                (key, (n_products - 1 - i) % 2),
+                (n_rows, T.shape(matrix)[0], n_columns),
+                **context,
+            )
+            out[...] = T.reshape(result, (n_rows, 1, n_columns))
+            out *= T.reshape(matrix, (1, -1, n_columns))
+            n_rows *= T.shape(matrix)[0]
+            result = T.reshape(out, (n_rows, n_columns))
+
+        if weights is not None:
+            result *= T.reshape(weights, (1, -1))
+        return result
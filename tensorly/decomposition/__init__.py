@@ -15,6 +15,12 @@ from ._tucker import (
 from .robust_decomposition import robust_pca
 from ._tt import tensor_train, tensor_train_matrix
 from ._tt import TensorTrain, TensorTrainMatrix
+from ._tt_als import (
+    tensor_train_als,
+    tensor_train_dmrg,
+    TensorTrainALS,
+    TensorTrainDMRG,
+)
 from ._tr_svd import tensor_ring, TensorRing
 from ._tr_als import (
     tensor_ring_als,
@@ -23,6 +29,7 @@ from ._tr_als import (
     TensorRingALSSampled,
 )
 from ._parafac2 import parafac2, Parafac2
+from ._constrained_parafac2 import constrained_parafac2, ConstrainedParafac2
 from ._symmetric_cp import (
     symmetric_parafac_power_iteration,
     symmetric_power_iteration,
@@ -10,7 +10,6 @@ from ..tenalg.proximal import admm, proximal_operator, validate_constraints
 from ..tenalg.svd import svd_interface
 from ..tenalg import unfolding_dot_khatri_rao
 
-
 # Author: Jean Kossaifi
 #         Jeremy Cohen <jeremy.cohen@irisa.fr>
 #         Caglayan Tuna <caglayantun@gmail.com>
@@ -36,6 +35,7 @@ def initialize_constrained_parafac(
     smoothness=None,
     monotonicity=None,
     hard_sparsity=None,
+    constraints=None,
 ):
     r"""Initialize factors used in `constrained_parafac`.
 
@@ -88,6 +88,9 @@ def initialize_constrained_parafac(
         If it is True, monotonicity constraint is applied to all modes.
     hard_sparsity : float or list or dictionary, optional
         Hard thresholding with the given threshold
+    constraints : dictionary, optional
+        Constraints registered with `tensorly.tenalg.proximal.register_constraint`,
+        as ``{name: value}``. Several constraints given for the same mode are composed.
     Returns
     -------
     factors : CPTensor
@@ -155,6 +158,7 @@ def initialize_constrained_parafac(
             smoothness=smoothness,
             monotonicity=monotonicity,
             hard_sparsity=hard_sparsity,
+            constraints=constraints,
             n_const=n_modes,
             order=i,
         )
@@ -188,6 +192,10 @@ def constrained_parafac(
     smoothness=None,
     monotonicity=None,
     hard_sparsity=None,
+    adaptive_rho=False,
+    over_relaxation=1.0,
+    constraints=None,
+    n_jobs=1,
 ):
     """CANDECOMP/PARAFAC decomposition via alternating optimization of
     alternating direction method of multipliers (AO-ADMM):
@@ -255,6 +263,17 @@ def constrained_parafac(
         If it is True, monotonicity constraint is applied to all modes.
     hard_sparsity : float or list or dictionary, optional
         Hard thresholding with the given threshold
+    adaptive_rho : bool, default is False
+        If True, the step size of the inner ADMM iterations is adapted by residual
+        balancing, see `tensorly.tenalg.proximal.admm`.
+    over_relaxation : float, default is 1.0
+        Relaxation parameter of the inner ADMM iterations, 1 is no relaxation
+    constraints : dictionary, optional
+        Constraints registered with `tensorly.tenalg.proximal.register_constraint`,
+        as ``{name: value}``. Several constraints given for the same mode are composed.
+    n_jobs : int, default is 1
+        Number of threads updating blocks of rows of each factor in parallel, for the
+        modes whose constraints act on each row independently (e.g. non_negative, l1_reg)
     cvg_criterion : {'abs_rec_error', 'rec_error'}, optional
        Stopping criterion if `tol` is not None.
        If 'rec_error',  algorithm stops at current iteration if ``(previous rec_error - current rec_error) < tol``.
@@ -293,6 +312,7 @@ def constrained_parafac(
         smoothness=smoothness,
         monotonicity=monotonicity,
         hard_sparsity=hard_sparsity,
+        constraints=constraints,
         n_const=tl.ndim(tensor),
     )
 
@@ -314,6 +334,7 @@ def constrained_parafac(
         smoothness=smoothness,
         monotonicity=monotonicity,
         hard_sparsity=hard_sparsity,
+        constraints=constraints,
     )
 
     rec_errors = []
@@ -374,6 +395,10 @@ def constrained_parafac(
                 monotonicity=monotonicity,
                 hard_sparsity=hard_sparsity,
                 tol=tol_inner,
+                adaptive_rho=adaptive_rho,
+                over_relaxation=over_relaxation,
+                constraints=constraints,
+                n_jobs=n_jobs,
             )
 
         factors_norm = cp_norm((weights, factors))
@@ -489,6 +514,17 @@ class ConstrainedCP(DecompositionMixin):
         If it is True, monotonicity constraint is applied to all modes.
     hard_sparsity : float or list or dictionary, optional
         Hard thresholding with the given threshold
+    adaptive_rho : bool, default is False
+        If True, the step size of the inner ADMM iterations is adapted by residual
+        balancing, see `tensorly.tenalg.proximal.admm`.
+    over_relaxation : float, default is 1.0
+        Relaxation parameter of the inner ADMM iterations, 1 is no relaxation
+    constraints : dictionary, optional
+        Constraints registered with `tensorly.tenalg.proximal.register_constraint`,
+        as ``{name: value}``. Several constraints given for the same mode are composed.
+    n_jobs : int, default is 1
+        Number of threads updating blocks of rows of each factor in parallel, for the
+        modes whose constraints act on each row independently (e.g. non_negative, l1_reg)
     cvg_criterion : {'abs_rec_error', 'rec_error'}, optional
        Stopping criterion if `tol` is not None.
        If 'rec_error',  algorithm stops at current iteration if ``(previous rec_error - current rec_error) < tol``.
@@ -540,6 +576,10 @@ class ConstrainedCP(DecompositionMixin):
         smoothness=None,
         monotonicity=None,
         hard_sparsity=None,
+        adaptive_rho=False,
+        over_relaxation=1.0,
+        constraints=None,
+        n_jobs=1,
     ):
         self.rank = rank
         self.n_iter_max = n_iter_max
@@ -565,6 +605,10 @@ class ConstrainedCP(DecompositionMixin):
         self.smoothness = smoothness
         self.monotonicity = monotonicity
         self.hard_sparsity = hard_sparsity
+        self.adaptive_rho = adaptive_rho
+        self.over_relaxation = over_relaxation
+        self.constraints = constraints
+        self.n_jobs = n_jobs
 
     def fit_transform(self, tensor):
         """Decompose an input tensor
@@ -604,6 +648,10 @@ class ConstrainedCP(DecompositionMixin):
             smoothness=self.smoothness,
             monotonicity=self.monotonicity,
             hard_sparsity=self.hard_sparsity,
+            adaptive_rho=self.adaptive_rho,
+            over_relaxation=self.over_relaxation,
+            constraints=self.constraints,
+            n_jobs=self.n_jobs,
             return_errors=True,
         )
         self.decomposition_ = cp_tensor
@@ -0,0 +1,598 @@
+import tensorly as tl
+from ._base_decomposition import DecompositionMixin
+from ._parafac2 import initialize_decomposition, _parafac2_reconstruction_error
+from ..parafac2_tensor import Parafac2Tensor
+from ..tenalg.proximal import _admm_blocks, _apply_constraints, _constraint_plans
+
+# License: BSD 3 clause
+
+
+def _regularized_inverses(grams, n_aux):
+    """Inverses of the (batched) Gram matrices of the ADMM least squares updates
+
+    The step size of each problem is ``rho = trace(gram) / rank`` [1]_. The matrices
+    ``gram + n_aux * rho * I`` only change between outer iterations, so their
+    factorization is computed once and reused by all the inner ADMM iterations.
+    With this choice of ``rho``, their condition number is at most ``rank + 1``,
+    which makes it safe to use their explicit (rank x rank) inverse.
+
+    Parameters
+    ----------
+    grams : ndarray of shape (n_problems, rank, rank)
+    n_aux : int
+        number of auxiliary variables coupled to the variable, each adds a ``rho`` term
+
+    Returns
+    -------
+    inverses : ndarray of shape (n_problems, rank, rank)
+    rho : ndarray of shape (n_problems, )
+    """
+    n_problems, rank, _ = tl.shape(grams)
+    eye = tl.eye(rank, **tl.context(grams))
+    rho = tl.sum(grams * eye, axis=(1, 2)) / rank
+    identities = eye * tl.ones((n_problems, 1, 1), **tl.context(grams))
+    inverses = tl.solve(
+        grams + n_aux * tl.reshape(rho, (-1, 1, 1)) * identities, identities
+    )
+    return inverses, rho
+
+
+def _admm_rows(
+    rhs, inverses, rho, aux, dual, n_iter_max, tol, prox, over_relaxation=1.0
+):
+    """ADMM for a matrix whose rows are the solutions of independent least squares problems
+
+    Solves for each row i ``min_x x^T G_i x / 2 - x^T rhs_i + g(z)`` subject to ``x = z``,
+    where ``inverses[i]`` is the cached inverse of ``G_i + rho_i I``.
+    If ``inverses`` has a single matrix, it is shared by all the rows.
+
+    `tensorly.tenalg.proximal.admm` solves problems sharing a single Gram matrix, this
+    is its counterpart for the rows of :math:`A`, which each have their own.
+    """
+    rho = tl.reshape(rho, (-1, 1))
+    for _ in range(n_iter_max):
+        targets = rhs + rho * (aux - dual)
+        if tl.shape(inverses)[0] == 1:
+            x = tl.dot(targets, inverses[0])
+        else:
+            x = tl.matmul(inverses, tl.reshape(targets, (*tl.shape(targets), 1)))[
+                ..., 0
+            ]
+        if over_relaxation != 1:
+            x = over_relaxation * x + (1 - over_relaxation) * aux
+        aux_old = aux
+        aux = prox(x + dual)
+        dual = dual + x - aux
+
+        if tl.norm(x - aux) < tol * tl.norm(x) and tl.norm(
+            aux - aux_old
+        ) < tol * tl.norm(dual):
+            break
+    return x, aux, dual
+
+
+def _coupled_evolving_factors(
+    rhs, inverses, rho, factors_B, aux, blueprint, n_iter_max, tol, prox
+):
+    """ADMM update of the evolving factors :math:`B_i` of PARAFAC2
+
+    Each :math:`B_i` is coupled to :math:`P_i \\Delta`, with :math:`P_i` orthonormal
+    and :math:`\\Delta` shared by all slices (the PARAFAC2 constraint) and, if the
+    mode is constrained, to the output of the proximal operator.
+    """
+    coupled, coupled_dual, reg, reg_dual = aux
+    n_slices = len(factors_B)
+
+    for _ in range(n_iter_max):
+        old_coupled = coupled
+        for i in range(n_slices):
+            targets = rhs[i] + rho[i] * (coupled[i] - coupled_dual[i])
+            if prox is not None:
+                targets = targets + rho[i] * (reg[i] - reg_dual[i])
+            factors_B[i] = tl.dot(targets, inverses[i])
+
+        if prox is not None:
+            reg = [prox(factors_B[i] + reg_dual[i]) for i in range(n_slices)]
+            reg_dual = [reg_dual[i] + factors_B[i] - reg[i] for i in range(n_slices)]
+
+        # Projection on the PARAFAC2 constraint: B_i = P_i blueprint
+        shifted = [factors_B[i] + coupled_dual[i] for i in range(n_slices)]
+        projections = []
+        for shifted_B in shifted:
+            U, _, Vh = tl.svd(
+                tl.dot(shifted_B, tl.transpose(blueprint)), full_matrices=False
+            )
+            projections.append(tl.dot(U, Vh))
+        blueprint = sum(
+            rho[i] * tl.dot(tl.transpose(projections[i]), shifted[i])
+            for i in range(n_slices)
+        ) / tl.sum(rho)
+
+        coupled = [tl.dot(projection, blueprint) for projection in projections]
+        coupled_dual = [
+            coupled_dual[i] + factors_B[i] - coupled[i] for i in range(n_slices)
+        ]
+
+        norm_B = tl.sqrt(sum(tl.norm(B_i) ** 2 for B_i in factors_B))
+        gap = tl.sqrt(
+            sum(tl.norm(factors_B[i] - coupled[i]) ** 2 for i in range(n_slices))
+        )
+        change = tl.sqrt(
+            sum(tl.norm(coupled[i] - old_coupled[i]) ** 2 for i in range(n_slices))
+        )
+        if gap < tol * norm_B and change < tol * norm_B:
+            break
+
+    return (
+        factors_B,
+        (coupled, coupled_dual, reg, reg_dual),
+        projections,
+        blueprint,
+    )
+
+
+def constrained_parafac2(
+    tensor_slices,
+    rank,
+    n_iter_max=100,
+    n_iter_max_inner=5,
+    init="svd",
+    svd="truncated_svd",
+    tol_outer=1e-8,
+    tol_inner=1e-6,
+    tol_feasibility=1e-5,
+    random_state=None,
+    verbose=0,
+    return_errors=False,
+    non_negative=None,
+    l1_reg=None,
+    l2_reg=None,
+    l2_square_reg=None,
+    unimodality=None,
+    normalize=None,
+    simplex=None,
+    normalized_sparsity=None,
+    soft_sparsity=None,
+    smoothness=None,
+    monotonicity=None,
+    hard_sparsity=None,
+    constraints=None,
+    adaptive_rho=False,
+    over_relaxation=1.0,
+    n_jobs=1,
+):
+    r"""PARAFAC2 decomposition via alternating optimization of
+    alternating direction method of multipliers (AO-ADMM) [1]_
+
+    Computes a rank-`rank` PARAFAC2 decomposition of the third-order tensor defined by
+    `tensor_slices`, such that the i-th slice is :math:`X_i = B_i diag(a_i) C^T`
+    (see :py:func:`parafac2`), where the factors :math:`A`, :math:`B_i` and :math:`C`
+    are penalized or constrained according to the user-defined constraints.
+    Mode 0 corresponds to :math:`A`, mode 1 to the evolving factors :math:`B_i` and
+    mode 2 to :math:`C`.
+
+    Each factor is updated with a few iterations of ADMM. The evolving factors are
+    coupled to the PARAFAC2 constraint :math:`B_i = P_i \Delta`, with :math:`P_i`
+    orthonormal, as well as to the proximal operator of their regularization (e.g.
+    non-negativity or smoothness of the :math:`B_i`), which is not possible with ALS.
+    The factorizations of the normal equations only change between outer iterations
+    and are reused by all the inner ADMM iterations.
+
+    Parameters
+    ----------
+    tensor_slices : ndarray or list of ndarrays
+        Either a third order tensor or a list of second order tensors that may have
+        different number of rows.
+    rank : int
+        Number of components.
+    n_iter_max : int
+        Maximum number of iteration for outer loop
+    n_iter_max_inner : int
+        Maximum number of ADMM iterations for each factor update
+    init : {'svd', 'random', CPTensor, Parafac2Tensor}
+        Type of factor matrix initialization. See `initialize_decomposition`.
+    svd : str, default is 'truncated_svd'
+        function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+    tol_outer : float, optional
+        (Default: 1e-8) Relative reconstruction error tolerance for the outer loop.
+        The algorithm stops when the decrease of the relative reconstruction error is
+        less than `tol_outer` and the factors are feasible (see `tol_feasibility`).
+    tol_inner : float, optional
+        (Default: 1e-6) Relative tolerance on the residuals of the ADMM inner loops.
+    tol_feasibility : float, optional
+        (Default: 1e-5) Maximum relative distance between the factors and the auxiliary
+        variables satisfying the constraints (including the PARAFAC2 constraint) at
+        convergence.
+    random_state : {None, int, np.random.RandomState}
+    verbose : int, optional
+        Level of verbosity
+    return_errors : bool, optional
+        Activate return of iteration errors
+    non_negative : bool or dictionary
+        This constraint is clipping negative values to '0'.
+        If it is True, non-negative constraint is applied to all modes.
+    l1_reg : float or list or dictionary, optional
+        Penalizes the factor with the l1 norm using the input value as regularization parameter.
+    l2_reg : float or list or dictionary, optional
+        Penalizes the factor with the l2 norm using the input value as regularization parameter.
+    l2_square_reg : float or list or dictionary, optional
+        Penalizes the factor with the l2 square norm using the input value as regularization parameter.
+    unimodality : bool or dictionary, optional
+        If it is True, unimodality constraint is applied to all modes.
+        Applied to each column seperately.
+    normalize : bool or dictionary, optional
+        This constraint divides all the values by maximum value of the input array.
+        If it is True, normalize constraint is applied to all modes.
+    simplex : float or list or dictionary, optional
+        Projects on the simplex with the given parameter
+        Applied to each column seperately.
+    normalized_sparsity : float or list or dictionary, optional
+        Normalizes with the norm after hard thresholding
+    soft_sparsity : float or list or dictionary, optional
+        Impose that the columns of factors have L1 norm bounded by a user-defined threshold.
+    smoothness : float or list or dictionary, optional
+        Optimizes the factors by solving a banded system
+    monotonicity : bool or dictionary, optional
+        Projects columns to monotonically decreasing distrbution
+        Applied to each column seperately.
+        If it is True, monotonicity constraint is applied to all modes.
+    hard_sparsity : float or list or dictionary, optional
+        Hard thresholding with the given threshold
+    constraints : dictionary, optional
+        Constraints registered with `tensorly.tenalg.proximal.register_constraint`,
+        as ``{name: value}``. Several constraints given for the same mode are composed.
+    adaptive_rho : bool, default is False
+        If True, the step size of the ADMM iterations of :math:`C` is adapted by residual
+        balancing, see `tensorly.tenalg.proximal.admm`.
+    over_relaxation : float, default is 1.0
+        Relaxation parameter of the ADMM iterations of :math:`A` and :math:`C`,
+        1 is no relaxation
+    n_jobs : int, default is 1
+        Number of threads updating blocks of rows of :math:`C` in parallel, if its
+        constraints act on each row independently (e.g. non_negative, l1_reg), and
+        computing the reconstruction error
+
+    Returns
+    -------
+    Parafac2Tensor : (weight, factors, projection_matrices)
+        * weights : 1D array of shape (rank, ), all ones
+        * factors : List of factors of the CP decomposition element `i` is of shape
+            (tensor.shape[i], rank)
+        * projection_matrices : List of projection matrices used to create evolving
+            factors.
+
+        The constrained :math:`A` and :math:`C` are the outputs of the proximal operators.
+        The evolving factors are :math:`P_i \Delta`, they satisfy the constraints of
+        mode 1 up to `tol_feasibility`.
+    errors : list
+        A list of reconstruction errors at each iteration of the algorithms.
+
+    References
+    ----------
+    .. [1] M. Roald, C. Schenker, V. D. Calhoun, T. Adali, R. Bro, J. E. Cohen, E. Acar,
+           "An AO-ADMM approach to constraining PARAFAC2 on all modes",
+           SIAM Journal on Mathematics of Data Science 4.3 (2022): 1191-1222.
+    .. [2] Huang, Kejun, Nicholas D. Sidiropoulos, and Athanasios P. Liavas.
+           "A flexible and efficient algorithmic framework for constrained matrix and tensor factorization." IEEE
+           Transactions on Signal Processing 64.19 (2016): 5052-5065.
+    """
+    # The constraints are validated once, not at every inner ADMM iteration
+    plans = _constraint_plans(
+        {
+            **dict(
+                non_negative=non_negative,
+                l1_reg=l1_reg,
+                l2_reg=l2_reg,
+                l2_square_reg=l2_square_reg,
+                unimodality=unimodality,
+                normalize=normalize,
+                simplex=simplex,
+                normalized_sparsity=normalized_sparsity,
+                soft_sparsity=soft_sparsity,
+                smoothness=smoothness,
+                monotonicity=monotonicity,
+                hard_sparsity=hard_sparsity,
+            ),
+            **(constraints or {}),
+        },
+        3,
+    )
+    proxes = [
+        (lambda x, plan=plan: _apply_constraints(x, plan)) if plan else None
+        for plan in plans[:2]
+    ]
+
+    _, (A, blueprint, C), projections = initialize_decomposition(
+        tensor_slices, rank, init=init, svd=svd, random_state=random_state
+    )
+    context = tl.context(A)
+    n_slices = len(tensor_slices)
+    factors_B = [tl.dot(projection, blueprint) for projection in projections]
+
+    # Auxiliary variables and (scaled) dual variables
+    aux_A, dual_A = tl.copy(A), tl.zeros(tl.shape(A), **context)
+    aux_C, dual_C = tl.copy(C), tl.zeros(tl.shape(C), **context)
+    aux_B = (
+        [tl.copy(B_i) for B_i in factors_B],
+        [tl.zeros(tl.shape(B_i), **context) for B_i in factors_B],
+        [tl.copy(B_i) for B_i in factors_B],
+        [tl.zeros(tl.shape(B_i), **context) for B_i in factors_B],
+    )
+
+    norm_tensor = tl.sqrt(sum(tl.norm(t_slice, 2) ** 2 for t_slice in tensor_slices))
+    rec_errors = []
+
+    for iteration in range(n_iter_max):
+        if verbose > 1:
+            print("Starting iteration", iteration + 1)
+
+        # Mode 0: each row of A solves a separate least squares problem
+        CtC = tl.dot(tl.transpose(C), C)
+        BtB = tl.stack([tl.dot(tl.transpose(B_i), B_i) for B_i in factors_B])
+        XC = [tl.dot(t_slice, C) for t_slice in tensor_slices]
+        rhs = tl.stack([tl.sum(B_i * XC_i, axis=0) for B_i, XC_i in zip(factors_B, XC)])
+        if proxes[0] is None:
+            A = tl.solve(BtB * CtC, tl.reshape(rhs, (n_slices, rank, 1)))[..., 0]
+            aux_A = A
+        else:
+            inverses, rho = _regularized_inverses(BtB * CtC, 1)
+            A, aux_A, dual_A = _admm_rows(
+                rhs,
+                inverses,
+                rho,
+                aux_A,
+                dual_A,
+                n_iter_max_inner,
+                tol_inner,
+                proxes[0],
+                over_relaxation=over_relaxation,
+            )
+
+        # Mode 1: the evolving factors, always coupled to the PARAFAC2 constraint
+        grams = CtC * tl.reshape(aux_A, (n_slices, rank, 1))
+        grams = grams * tl.reshape(aux_A, (n_slices, 1, rank))
+        rhs = [XC[i] * aux_A[i] for i in range(n_slices)]
+        inverses, rho = _regularized_inverses(grams, 1 if proxes[1] is None else 2)
+        factors_B, aux_B, projections, blueprint = _coupled_evolving_factors(
+            rhs,
+            inverses,
+            rho,
+            factors_B,
+            aux_B,
+            blueprint,
+            n_iter_max_inner,
+            tol_inner,
+            proxes[1],
+        )
+
+        # Mode 2: C
+        AtA = tl.reshape(aux_A, (n_slices, rank, 1)) * tl.reshape(
+            aux_A, (n_slices, 1, rank)
+        )
+        BtB = tl.stack([tl.dot(tl.transpose(B_i), B_i) for B_i in factors_B])
+        gram = tl.sum(BtB * AtA, axis=0)
+        rhs = sum(
+            tl.dot(tl.transpose(t_slice), B_i * a_i)
+            for t_slice, B_i, a_i in zip(tensor_slices, factors_B, aux_A)
+        )
+        if not plans[2]:
+            C = tl.transpose(tl.solve(gram, tl.transpose(rhs)))
+            aux_C = C
+        else:
+            aux_C, C, dual_C = _admm_blocks(
+                rhs,
+                gram,
+                aux_C,
+                dual_C,
+                plans[2],
+                n_jobs=n_jobs,
+                n_iter_max=n_iter_max_inner,
+                tol=tol_inner,
+                adaptive_rho=adaptive_rho,
+                over_relaxation=over_relaxation,
+            )
+            C = tl.transpose(C)
+
+        decomposition = Parafac2Tensor((None, [aux_A, blueprint, aux_C], projections))
+        rec_error = (
+            _parafac2_reconstruction_error(
+                tensor_slices, decomposition, norm_tensor, n_jobs=n_jobs
+            )
+            / norm_tensor
+        )
+        rec_errors.append(rec_error)
+
+        coupled, _, reg, _ = aux_B
+        norm_B = tl.sqrt(sum(tl.norm(B_i) ** 2 for B_i in factors_B))
+        feasibility_gaps = [
+            tl.norm(A - aux_A) / tl.norm(A),
+            tl.norm(C - aux_C) / tl.norm(C),
+            tl.sqrt(
+                sum(tl.norm(factors_B[i] - coupled[i]) ** 2 for i in range(n_slices))
+            )
+            / norm_B,
+        ]
+        if proxes[1] is not None:
+            feasibility_gaps.append(
+                tl.sqrt(
+                    sum(tl.norm(factors_B[i] - reg[i]) ** 2 for i in range(n_slices))
+                )
+                / norm_B
+            )
+
+        if tol_outer and iteration >= 1:
+            rec_error_decrease = rec_errors[-2] - rec_errors[-1]
+            if verbose:
+                print(
+                    f"iteration {iteration}, reconstruction error: {rec_error}, decrease = {rec_error_decrease}"
+                )
+            if (
+                tl.abs(rec_error_decrease) < tol_outer
+                and max(feasibility_gaps) < tol_feasibility
+            ):
+                if verbose:
+                    print(f"PARAFAC2 converged after {iteration} iterations")
+                break
+        elif verbose:
+            print(f"reconstruction error={rec_error}")
+
+    parafac2_tensor = Parafac2Tensor(
+        (tl.ones(rank, **context), [aux_A, blueprint, aux_C], projections)
+    )
+
+    if return_errors:
+        return parafac2_tensor, rec_errors
+    else:
+        return parafac2_tensor
+
+
+class ConstrainedParafac2(DecompositionMixin):
+    r"""PARAFAC2 decomposition via alternating optimization of
+    alternating direction method of multipliers (AO-ADMM) [1]_
+
+    Computes a rank-`rank` PARAFAC2 decomposition of the third-order tensor defined by
+    `tensor_slices`, such that the i-th slice is :math:`X_i = B_i diag(a_i) C^T`,
+    where the factors :math:`A` (mode 0), :math:`B_i` (mode 1) and :math:`C` (mode 2)
+    are penalized or constrained according to the user-defined constraints.
+    See :py:func:`constrained_parafac2` for more details.
+
+    Parameters
+    ----------
+    rank : int
+        Number of components.
+    n_iter_max : int
+        Maximum number of iteration for outer loop
+    n_iter_max_inner : int
+        Maximum number of ADMM iterations for each factor update
+    init : {'svd', 'random', CPTensor, Parafac2Tensor}
+        Type of factor matrix initialization. See `initialize_decomposition`.
+    svd : str, default is 'truncated_svd'
+        function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+    tol_outer : float, optional
+        (Default: 1e-8) Relative reconstruction error tolerance for outer loop.
+    tol_inner : float, optional
+        (Default: 1e-6) Relative tolerance on the residuals of the ADMM inner loops.
+    tol_feasibility : float, optional
+        (Default: 1e-5) Maximum relative distance between the factors and the auxiliary
+        variables satisfying the constraints at convergence.
+    random_state : {None, int, np.random.RandomState}
+    verbose : int, optional
+        Level of verbosity
+    non_negative, l1_reg, l2_reg, l2_square_reg, unimodality, normalize, simplex,
+    normalized_sparsity, soft_sparsity, smoothness, monotonicity, hard_sparsity :
+        Constraints of each mode, see :py:func:`constrained_parafac2`.
+    constraints : dictionary, optional
+        Constraints registered with `tensorly.tenalg.proximal.register_constraint`,
+        as ``{name: value}``.
+    adaptive_rho, over_relaxation, n_jobs :
+        Parameters of the ADMM iterations, see :py:func:`constrained_parafac2`.
+
+    References
+    ----------
+    .. [1] M. Roald, C. Schenker, V. D. Calhoun, T. Adali, R. Bro, J. E. Cohen, E. Acar,
+           "An AO-ADMM approach to constraining PARAFAC2 on all modes",
+           SIAM Journal on Mathematics of Data Science 4.3 (2022): 1191-1222.
+    """
+
+    def __init__(
+        self,
+        rank,
+        n_iter_max=100,
+        n_iter_max_inner=5,
+        init="svd",
+        svd="truncated_svd",
+        tol_outer=1e-8,
+        tol_inner=1e-6,
+        tol_feasibility=1e-5,
+        random_state=None,
+        verbose=0,
+        non_negative=None,
+        l1_reg=None,
+        l2_reg=None,
+        l2_square_reg=None,
+        unimodality=None,
+        normalize=None,
+        simplex=None,
+        normalized_sparsity=None,
+        soft_sparsity=None,
+        smoothness=None,
+        monotonicity=None,
+        hard_sparsity=None,
+        constraints=None,
+        adaptive_rho=False,
+        over_relaxation=1.0,
+        n_jobs=1,
+    ):
+        self.rank = rank
+        self.n_iter_max = n_iter_max
+        self.n_iter_max_inner = n_iter_max_inner
+        self.init = init
+        self.svd = svd
+        self.tol_outer = tol_outer
+        self.tol_inner = tol_inner
+        self.tol_feasibility = tol_feasibility
+        self.random_state = random_state
+        self.verbose = verbose
+        self.non_negative = non_negative
+        self.l1_reg = l1_reg
+        self.l2_reg = l2_reg
+        self.l2_square_reg = l2_square_reg
+        self.unimodality = unimodality
+        self.normalize = normalize
+        self.simplex = simplex
+        self.normalized_sparsity = normalized_sparsity
+        self.soft_sparsity = soft_sparsity
+        self.smoothness = smoothness
+        self.monotonicity = monotonicity
+        self.hard_sparsity = hard_sparsity
+        self.constraints = constraints
+        self.adaptive_rho = adaptive_rho
+        self.over_relaxation = over_relaxation
+        self.n_jobs = n_jobs
+
+    def fit_transform(self, tensor):
+        """Decompose an input tensor
+
+        Parameters
+        ----------
+        tensor : ndarray or list of ndarrays
+            input tensor (or tensor slices) to decompose
+
+        Returns
+        -------
+        Parafac2Tensor
+            decomposed tensor
+        """
+        parafac2_tensor, errors = constrained_parafac2(
+            tensor,
+            rank=self.rank,
+            n_iter_max=self.n_iter_max,
+            n_iter_max_inner=self.n_iter_max_inner,
+            init=self.init,
+            svd=self.svd,
+            tol_outer=self.tol_outer,
+            tol_inner=self.tol_inner,
+            tol_feasibility=self.tol_feasibility,
+            random_state=self.random_state,
+            verbose=self.verbose,
+            non_negative=self.non_negative,
+            l1_reg=self.l1_reg,
+            l2_reg=self.l2_reg,
+            l2_square_reg=self.l2_square_reg,
+            unimodality=self.unimodality,
+            normalize=self.normalize,
+            simplex=self.simplex,
+            normalized_sparsity=self.normalized_sparsity,
+            soft_sparsity=self.soft_sparsity,
+            smoothness=self.smoothness,
+            monotonicity=self.monotonicity,
+            hard_sparsity=self.hard_sparsity,
+            constraints=self.constraints,
+            adaptive_rho=self.adaptive_rho,
+            over_relaxation=self.over_relaxation,
+            n_jobs=self.n_jobs,
+            return_errors=True,
+        )
+        self.decomposition_ = parafac2_tensor
+        self.errors_ = errors
+        return self.decomposition_
@@ -3,6 +3,12 @@ import warnings
 
 import tensorly as tl
 from ._base_decomposition import DecompositionMixin
+from ._sampling import (
+    sample_indices,
+    deterministic_indices,
+    unique_indices,
+    index_tensor,
+)
 from ..random import random_cp
 from ..base import unfold
 from ..cp_tensor import (
@@ -14,6 +20,8 @@ from ..cp_tensor import (
 )
 from ..tenalg.svd import svd_interface
 from ..tenalg import unfolding_dot_khatri_rao
+from ._precision import low_precision_context, is_stalled
+from ..metrics import leverage_score_dist
 
 # Authors: Jean Kossaifi <jean.kossaifi+tensors@gmail.com>
 #          Chris Swierczewski <csw@amazon.com>
@@ -247,6 +255,7 @@ def parafac(
     svd_mask_repeats=5,
     linesearch=False,
     callback=None,
+    precision="full",
 ):
     """CANDECOMP/PARAFAC decomposition via alternating least squares (ALS)
     Computes a rank-`rank` decomposition of `tensor` [1]_ such that:
@@ -296,6 +305,12 @@ def parafac(
         remove the effect of these missing values on the initialization.
     linesearch : bool, default is False
         Whether to perform line search as proposed by Bro [3].
+    precision : {'full', 'mixed'}, default is 'full'
+        If 'mixed', a double precision tensor is stored, and the MTTKRPs computed, in
+        single precision, while the Gram matrices, solves and errors remain in double
+        precision. Once the decrease of the error stalls at the level of the single
+        precision rounding, the remaining iterations are in full precision. The
+        error must be computed for this, i.e. `tol` or `return_errors` must be set.
 
     Returns
     -------
@@ -391,6 +406,11 @@ def parafac(
         else:
             callback(cp_tensor, callback_error)
 
+    # The unfoldings, Khatri-Rao products and MTTKRPs reuse the same buffers
+    workspace = tl.backend.Workspace()
+    low_context = low_precision_context(tensor, precision)
+    low_tensor = None
+
     for iteration in range(n_iter_max):
         if orthogonalise and iteration <= orthogonalise:
             factors = [
@@ -420,7 +440,24 @@ def parafac(
                 * pseudo_inverse
                 * tl.reshape(weights, (1, -1))
             )
-            mttkrp = unfolding_dot_khatri_rao(tensor, (weights, factors), mode)
+            if low_context is None:
+                mttkrp = unfolding_dot_khatri_rao(
+                    tensor, (weights, factors), mode, workspace=workspace
+                )
+            else:
+                # With a mask, the missing values of the tensor change at each mode
+                if low_tensor is None or mask is not None:
+                    low_tensor = tl.tensor(tensor, **low_context)
+                low_cp_tensor = (
+                    tl.tensor(weights, **low_context),
+                    [tl.tensor(f, **low_context) for f in factors],
+                )
+                mttkrp = tl.tensor(
+                    unfolding_dot_khatri_rao(
+                        low_tensor, low_cp_tensor, mode, workspace=workspace
+                    ),
+                    **tl.context(tensor),
+                )
 
             factor = tl.transpose(
                 tl.solve(tl.conj(tl.transpose(pseudo_inverse)), tl.transpose(mttkrp))
@@ -482,10 +519,17 @@ def parafac(
                     if verbose:
                         print("Reducing acceleration.")
 
+        precision_switched = False
         if (tol or return_errors) and not line_iter:
             rec_error = unnorml_rec_error / norm_tensor
             rec_errors.append(rec_error)
 
+            if low_context is not None and is_stalled(rec_errors):
+                if verbose:
+                    print("Error stalled in mixed precision, switching to full.")
+                low_context = low_tensor = None
+                precision_switched = True
+
         if callback is not None:
             cp_tensor = CPTensor((weights, factors))
 
@@ -502,7 +546,7 @@ def parafac(
                     print("Received True from callback function. Exiting.")
                 break
 
-        if tol:
+        if tol and not precision_switched:
             if iteration >= 1:
                 rec_error_decrease = rec_errors[-2] - rec_errors[-1]
 
@@ -606,23 +650,23 @@ def sample_khatri_rao(
             )
         else:
             rng = random_state
-        indices_list = [
-            rng.randint(0, tl.shape(m)[0], size=n_samples, dtype=int) for m in matrices
-        ]
+        indices_list = list(
+            sample_indices(
+                [tl.shape(m)[0] for m in matrices], n_samples, random_state=rng
+            )
+        )
 
     rank = tl.shape(matrices[0])[1]
     sizes = [tl.shape(m)[0] for m in matrices]
 
     if return_sampled_rows:
         # Compute corresponding rows of the full khatri-rao product
-        indices_kr = np.zeros((n_samples), dtype=int)
-        for size, indices in zip(sizes, indices_list):
-            indices_kr = indices_kr * size + indices
+        indices_kr = np.ravel_multi_index(tuple(indices_list), sizes)
 
     # Compute the Khatri-Rao product for the chosen indices
     sampled_kr = tl.ones((n_samples, rank), **tl.context(matrices[0]))
     for indices, matrix in zip(indices_list, matrices):
-        sampled_kr = sampled_kr * matrix[indices, :]
+        sampled_kr = sampled_kr * matrix[index_tensor(indices), :]
 
     if return_sampled_rows:
         return sampled_kr, indices_list, indices_kr
@@ -630,6 +674,63 @@ def sample_khatri_rao(
         return sampled_kr, indices_list
 
 
+def _leverage_sample(shape, probabilities, n_samples, deterministic_threshold, rng):
+    """Samples rows of a Khatri-Rao product following the product of the leverage scores
+
+    Parameters
+    ----------
+    shape : int list
+        number of rows of each of the matrices in the Khatri-Rao product
+    probabilities : list of 1D-array
+        leverage score distribution of each of these matrices
+    n_samples : int
+        total number of rows, deterministic ones included
+    deterministic_threshold : float or None
+        if not None, rows with a probability at least this large are always included
+    rng : np.random.RandomState
+
+    Returns
+    -------
+    indices_list : list of 1D-array
+        for each matrix, the indices of the sampled (unique) rows
+    row_weights : 1D-array
+        weights such that the weighted sampled least squares problem is an unbiased
+        estimate of the full one
+    """
+    if deterministic_threshold is not None:
+        deterministic, deterministic_probs = deterministic_indices(
+            probabilities, deterministic_threshold
+        )
+    else:
+        deterministic = np.zeros((len(shape), 0), dtype=np.int64)
+        deterministic_probs = np.zeros(0)
+
+    # Deterministic rows are included with a weight of one, the others are drawn from
+    # the distribution conditioned on not being deterministic
+    remaining_mass = 1 - np.sum(deterministic_probs)
+    n_random = n_samples - tl.shape(deterministic)[1]
+    if n_random <= 0 or remaining_mass <= np.finfo(np.float64).eps:
+        return list(deterministic), np.ones(tl.shape(deterministic)[1])
+
+    samples = sample_indices(
+        shape,
+        n_random,
+        probabilities,
+        random_state=rng,
+        exclude=np.ravel_multi_index(tuple(deterministic), shape),
+    )
+    samples, counts = unique_indices(samples, shape)
+    sample_probs = np.prod(
+        [probs[mode_samples] for probs, mode_samples in zip(probabilities, samples)],
+        axis=0,
+    )
+    sample_weights = np.sqrt(counts * remaining_mass / (n_random * sample_probs))
+
+    indices = np.concatenate([deterministic, samples], axis=1)
+    row_weights = np.concatenate([np.ones(tl.shape(deterministic)[1]), sample_weights])
+    return list(indices), row_weights
+
+
 def randomised_parafac(
     tensor,
     rank,
@@ -643,6 +744,8 @@ def randomised_parafac(
     random_state=None,
     verbose=0,
     callback=None,
+    sampling="uniform",
+    deterministic_threshold=None,
 ):
     """Randomised CP decomposition via sampled ALS [3]_
 
@@ -669,6 +772,16 @@ def randomised_parafac(
         if True, return a list of all errors
     verbose : int, optional, default is 0
         level of verbosity
+    sampling : {'uniform', 'leverage'}, default is 'uniform'
+        distribution of the sampled rows of the Khatri-Rao product.
+        If 'leverage', rows are sampled proportionally to the product of the leverage
+        scores of the factors (CP-ARLS-LEV [4]_) and reweighted accordingly, which
+        needs far fewer samples than uniform sampling on skewed data.
+    deterministic_threshold : float, optional
+        only used with ``sampling='leverage'``. If specified, the rows of the
+        Khatri-Rao product whose sampling probability is at least
+        `deterministic_threshold` (e.g. ``1/n_samples``) are always included, and the
+        remaining samples are drawn among the other rows [4]_.
 
     Returns
     -------
@@ -680,8 +793,15 @@ def randomised_parafac(
     ----------
     .. [3] Casey Battaglino, Grey Ballard and Tamara G. Kolda,
            "A Practical Randomized CP Tensor Decomposition",
+    .. [4] Brett W. Larsen and Tamara G. Kolda, "Practical Leverage-Based Sampling
+           for Low-Rank Tensor Decomposition", SIAM J. Matrix Analysis and
+           Applications, 43(3):1488-1517, 2022.
     """
     rank = validate_cp_rank(tl.shape(tensor), rank=rank)
+    if sampling not in ["uniform", "leverage"]:
+        raise ValueError(
+            f"Got sampling={sampling}. However, sampling should be 'uniform' or 'leverage'."
+        )
 
     if return_errors:
         DeprecationWarning(
@@ -699,6 +819,10 @@ def randomised_parafac(
 
     weights = tl.ones(rank, **tl.context(tensor))
 
+    if sampling == "leverage":
+        # Leverage score distributions of the factors, kept on the host where sampling happens
+        leverage_scores = [tl.to_numpy(leverage_score_dist(f)) for f in factors]
+
     if callback is not None:
         rec_error = tl.norm(tensor - cp_to_tensor((weights, factors)), 2) / norm_tensor
 
@@ -706,10 +830,29 @@ def randomised_parafac(
 
     for iteration in range(n_iter_max):
         for mode in range(n_dims):
-            kr_prod, indices_list = sample_khatri_rao(
-                factors, n_samples, skip_matrix=mode, random_state=rng
-            )
-            indices_list = [i.tolist() for i in indices_list]
+            if sampling == "leverage":
+                indices_list, row_weights = _leverage_sample(
+                    [tl.shape(tensor)[i] for i in range(n_dims) if i != mode],
+                    [leverage_scores[i] for i in range(n_dims) if i != mode],
+                    n_samples,
+                    deterministic_threshold,
+                    rng,
+                )
+                kr_prod, _ = sample_khatri_rao(
+                    factors,
+                    len(row_weights),
+                    skip_matrix=mode,
+                    indices_list=indices_list,
+                )
+                row_weights = tl.reshape(
+                    tl.tensor(row_weights, **tl.context(tensor)), (-1, 1)
+                )
+                kr_prod = kr_prod * row_weights
+            else:
+                kr_prod, indices_list = sample_khatri_rao(
+                    factors, n_samples, skip_matrix=mode, random_state=rng
+                )
+            indices_list = [index_tensor(i) for i in indices_list]
             # Keep all the elements of the currently considered mode
             indices_list.insert(mode, slice(None, None, None))
             indices_list = tuple(indices_list)
@@ -717,12 +860,17 @@ def randomised_parafac(
                 sampled_unfolding = tensor[indices_list]
             else:
                 sampled_unfolding = tl.transpose(tensor[indices_list])
+            if sampling == "leverage":
+                sampled_unfolding = sampled_unfolding * row_weights
 
             pseudo_inverse = tl.dot(tl.transpose(kr_prod), kr_prod)
             factor = tl.dot(tl.transpose(kr_prod), sampled_unfolding)
             factor = tl.transpose(tl.solve(pseudo_inverse, factor))
             factors[mode] = factor
 
+            if sampling == "leverage":
+                leverage_scores[mode] = tl.to_numpy(leverage_score_dist(factor))
+
         if max_stagnation or tol or (callback is not None):
             rec_error = (
                 tl.norm(tensor - cp_to_tensor((weights, factors)), 2) / norm_tensor
@@ -810,6 +958,12 @@ class CP(DecompositionMixin):
         remove the effect of these missing values on the initialization.
     linesearch : bool, default is False
         Whether to perform line search as proposed by Bro [3].
+    precision : {'full', 'mixed'}, default is 'full'
+        If 'mixed', a double precision tensor is stored, and the MTTKRPs computed, in
+        single precision, while the Gram matrices, solves and errors remain in double
+        precision. Once the decrease of the error stalls at the level of the single
+        precision rounding, the remaining iterations are in full precision. The
+        error must be computed for this, i.e. `tol` or `return_errors` must be set.
 
     Returns
     -------
@@ -855,6 +1009,7 @@ class CP(DecompositionMixin):
         svd_mask_repeats=5,
         linesearch=False,
         callback=None,
+        precision="full",
     ):
         self.rank = rank
         self.n_iter_max = n_iter_max
@@ -873,6 +1028,7 @@ class CP(DecompositionMixin):
         self.svd_mask_repeats = svd_mask_repeats
         self.linesearch = linesearch
         self.callback = callback
+        self.precision = precision
 
     def fit_transform(self, tensor):
         """Decompose an input tensor
@@ -907,6 +1063,7 @@ class CP(DecompositionMixin):
             linesearch=self.linesearch,
             return_errors=True,
             callback=self.callback,
+            precision=self.precision,
         )
         self.decomposition_ = cp_tensor
         self.errors_ = errors
@@ -940,6 +1097,12 @@ class RandomizedCP(DecompositionMixin):
     random_state : {None, int, np.random.RandomState}, default is None
     verbose : int, optional
         level of verbosity
+    sampling : {'uniform', 'leverage'}, default is 'uniform'
+        distribution of the sampled rows of the Khatri-Rao product,
+        see `randomised_parafac`
+    deterministic_threshold : float, optional
+        rows of the Khatri-Rao product with a leverage-based probability at least
+        this large are always included
 
     Returns
     -------
@@ -965,6 +1128,8 @@ class RandomizedCP(DecompositionMixin):
         random_state=None,
         verbose=1,
         callback=None,
+        sampling="uniform",
+        deterministic_threshold=None,
     ):
         self.rank = rank
         self.n_samples = n_samples
@@ -976,6 +1141,8 @@ class RandomizedCP(DecompositionMixin):
         self.random_state = random_state
         self.verbose = verbose
         self.callback = callback
+        self.sampling = sampling
+        self.deterministic_threshold = deterministic_threshold
 
     def fit_transform(self, tensor):
         self.decomposition_, self.errors_ = randomised_parafac(
@@ -991,5 +1158,7 @@ class RandomizedCP(DecompositionMixin):
             random_state=self.random_state,
             verbose=self.verbose,
             callback=self.callback,
+            sampling=self.sampling,
+            deterministic_threshold=self.deterministic_threshold,
         )
         return self.decomposition_
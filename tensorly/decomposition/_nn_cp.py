@@ -1,8 +1,9 @@
 import warnings
+from math import prod
 import tensorly as tl
 from ._base_decomposition import DecompositionMixin
 from ._cp import initialize_cp
-from ..tenalg.proximal import hals_nnls
+from ..tenalg.proximal import hals_nnls, bpp_nnls
 from ..cp_tensor import (
     CPTensor,
     unfolding_dot_khatri_rao,
@@ -24,6 +25,25 @@ from ..tenalg.svd import svd_interface
 # License: BSD 3 clause
 
 
+def _multiplicative_update(factor, mttkrp, accum, epsilon, workspace):
+    """Multiplicative update of `factor`, overwritten in place
+
+    Computes ``factor * max(mttkrp, epsilon) / max(factor accum, epsilon)`` in the two
+    buffers of `workspace`, which have at least as many rows as `factor`, so that no
+    temporary is allocated. Only for the backends with `out=` and in-place clipping
+    (NumPy and PyTorch).
+    """
+    n_rows = tl.shape(factor)[0]
+    numerator, denominator = (buffer[:n_rows] for buffer in workspace)
+    tl.matmul(factor, accum, out=denominator)
+    tl.clip(denominator, a_min=epsilon, inplace=True)
+    numerator[...] = mttkrp
+    tl.clip(numerator, a_min=epsilon, inplace=True)
+    numerator /= denominator
+    factor *= numerator
+    return factor
+
+
 def non_negative_parafac(
     tensor,
     rank,
@@ -38,11 +58,13 @@ def non_negative_parafac(
     mask=None,
     cvg_criterion="abs_rec_error",
     fixed_modes=None,
+    solver="mu",
 ):
     """
     Non-negative CP decomposition
 
-    Uses multiplicative updates, see [2]_
+    Uses multiplicative updates, see [2]_, or exact block principal pivoting updates
+    of the factors, see [3]_
 
     Parameters
     ----------
@@ -65,6 +87,11 @@ def non_negative_parafac(
     fixed_modes : list, default is None
         A list of modes for which the initial value is not modified.
         The last mode cannot be fixed due to error computation.
+    solver : {'mu', 'bpp'}, default is 'mu'
+        Update of the factors. 'mu' uses multiplicative updates, 'bpp' solves the
+        nonnegative least squares problem of each factor exactly with block principal
+        pivoting (see `tensorly.tenalg.proximal.bpp_nnls`), which typically needs far
+        fewer iterations for moderate ranks.
 
     Returns
     -------
@@ -78,7 +105,12 @@ def non_negative_parafac(
            "Non-negative tensor factorization with applications to statistics and computer vision",
            In Proceedings of the International Conference on Machine Learning (ICML),
            pp 792-799, ICML, 2005
+    .. [3] J. Kim and H. Park, "Fast Nonnegative Tensor Factorization with an
+           Active-Set-Like Method", High-Performance Scientific Computing,
+           pp 311-326, Springer, 2012
     """
+    if solver not in ("mu", "bpp"):
+        raise ValueError(f"Unknown solver {solver}, expected 'mu' or 'bpp'.")
     epsilon = tl.eps(tensor.dtype)
     rank = validate_cp_rank(tl.shape(tensor), rank=rank)
 
@@ -105,6 +137,15 @@ def non_negative_parafac(
         fixed_modes.remove(tl.ndim(tensor) - 1)
     modes_list = [mode for mode in range(tl.ndim(tensor)) if mode not in fixed_modes]
 
+    # With NumPy and PyTorch, the multiplicative updates are done in place in buffers
+    # shared by all the modes and iterations
+    workspace = None
+    if solver == "mu" and tl.get_backend() in ("numpy", "pytorch"):
+        for mode in modes_list:
+            factors[mode] = tl.copy(factors[mode])
+        buffer_shape = (max(tl.shape(tensor)), rank)
+        workspace = [tl.zeros(buffer_shape, **tl.context(factors[0])) for _ in range(2)]
+
     for iteration in range(n_iter_max):
         if verbose > 1:
             print("Starting iteration", iteration + 1)
@@ -129,10 +170,19 @@ def non_negative_parafac(
 
             mttkrp = unfolding_dot_khatri_rao(tensor, (weights, factors), mode)
 
-            numerator = tl.clip(mttkrp, a_min=epsilon, a_max=None)
-            denominator = tl.dot(factors[mode], accum)
-            denominator = tl.clip(denominator, a_min=epsilon, a_max=None)
-            factor = factors[mode] * numerator / denominator
+            if solver == "bpp":
+                factor = tl.transpose(
+                    bpp_nnls(tl.transpose(mttkrp), accum, tl.transpose(factors[mode]))
+                )
+            elif workspace is not None:
+                factor = _multiplicative_update(
+                    factors[mode], mttkrp, accum, epsilon, workspace
+                )
+            else:
+                numerator = tl.clip(mttkrp, a_min=epsilon, a_max=None)
+                denominator = tl.dot(factors[mode], accum)
+                denominator = tl.clip(denominator, a_min=epsilon, a_max=None)
+                factor = factors[mode] * numerator / denominator
 
             factors[mode] = factor
             if normalize_factors and mode != modes_list[-1]:
@@ -198,6 +248,10 @@ def non_negative_parafac_hals(
     verbose=False,
     return_errors=False,
     cvg_criterion="abs_rec_error",
+    inner_iter_ratio=0.5,
+    inner_tol=1e-2,
+    solver="hals",
+    n_jobs=1,
 ):
     """
     Non-negative CP decomposition via HALS
@@ -248,8 +302,24 @@ def non_negative_parafac_hals(
         Stopping criterion for ALS, works if `tol` is not None.
         If 'rec_error',  ALS stops at current iteration if ``(previous rec_error - current rec_error) < tol``.
         If 'abs_rec_error', ALS terminates when `|previous rec_error - current rec_error| < tol`.
-    sparsity : float or int
-    random_state : {None, int, np.random.RandomState}
+    inner_iter_ratio : float, default is 0.5
+        The number of inner HALS sweeps on a factor is bounded by
+        ``1 + inner_iter_ratio * complexity_ratio``, where ``complexity_ratio`` is the cost
+        of the MTTKRP and of the Gram matrices divided by the cost of one sweep [1]_.
+        Ignored if `exact` is True.
+    inner_tol : float, default is 1e-2
+        The inner HALS sweeps on a factor stop when the squared norm of the update
+        falls below `inner_tol` times the squared norm of the first update.
+        Ignored if `exact` is True.
+    solver : {'hals', 'bpp'}, default is 'hals'
+        Solver of the nonnegative least squares problem of the non-negative modes.
+        'bpp' solves it exactly with block principal pivoting [2]_ (see
+        `tensorly.tenalg.proximal.bpp_nnls`), in which case `exact`,
+        `inner_iter_ratio` and `inner_tol` are ignored.
+    n_jobs : int, default is 1
+        Number of threads solving the nonnegative least squares problems of blocks of
+        rows of each factor in parallel. With HALS, each block has its own early
+        stopping criterion.
 
     Returns
     -------
@@ -264,7 +334,12 @@ def non_negative_parafac_hals(
     .. [1] N. Gillis and F. Glineur, Accelerated Multiplicative Updates and
            Hierarchical ALS Algorithms for Nonnegative Matrix Factorization,
            Neural Computation 24 (4): 1085-1105, 2012.
+    .. [2] J. Kim and H. Park, "Fast Nonnegative Matrix Factorization: An Active-Set-Like
+           Method and Comparisons", SIAM Journal on Scientific Computing, 33(6):3261-3281,
+           2011.
     """
+    if solver not in ("hals", "bpp"):
+        raise ValueError(f"Unknown solver {solver}, expected 'hals' or 'bpp'.")
 
     weights, factors = initialize_cp(
         tensor,
@@ -300,6 +375,15 @@ def non_negative_parafac_hals(
     # Generating the mode update sequence
     modes = [mode for mode in range(n_modes) if mode not in fixed_modes]
 
+    # Cost of the MTTKRP and of the Gram matrices relative to one HALS sweep on a factor
+    shape = tl.shape(tensor)
+    size = prod(shape)
+    complexity_ratios = [
+        (size * rank + (sum(shape) - shape[mode]) * rank**2)
+        / (shape[mode] * rank * (rank + 1))
+        for mode in range(n_modes)
+    ]
+
     # initialisation - declare local varaibles
     rec_errors = []
 
@@ -322,15 +406,27 @@ def non_negative_parafac_hals(
             )
             mttkrp = unfolding_dot_khatri_rao(tensor, (weights, factors), mode)
 
-            if mode in nn_modes:
+            if mode in nn_modes and solver == "bpp":
+                UtM = tl.transpose(mttkrp)
+                if sparsity_coefficients[mode] is not None:
+                    UtM = UtM - sparsity_coefficients[mode]
+                nn_factor = bpp_nnls(
+                    UtM, pseudo_inverse, tl.transpose(factors[mode]), n_jobs=n_jobs
+                )
+                factors[mode] = tl.transpose(nn_factor)
+            elif mode in nn_modes:
                 # Call the hals resolution with nnls, optimizing the current mode
                 nn_factor, _, _, _ = hals_nnls(
                     tl.transpose(mttkrp),
                     pseudo_inverse,
                     tl.transpose(factors[mode]),
                     n_iter_max=100,
+                    tol=inner_tol,
                     sparsity_coefficient=sparsity_coefficients[mode],
                     exact=exact,
+                    complexity_ratio=complexity_ratios[mode],
+                    alpha=inner_iter_ratio,
+                    n_jobs=n_jobs,
                 )
                 factors[mode] = tl.transpose(nn_factor)
             else:
@@ -424,6 +520,9 @@ class CP_NN(DecompositionMixin):
     svd_mask_repeats: int
         If using a tensor with masked values, this initializes using SVD multiple times to
         remove the effect of these missing values on the initialization.
+    solver : {'mu', 'bpp'}, default is 'mu'
+        Multiplicative updates or block principal pivoting updates of the factors.
+        See `non_negative_parafac`.
 
     Returns
     -------
@@ -461,6 +560,7 @@ class CP_NN(DecompositionMixin):
         mask=None,
         cvg_criterion="abs_rec_error",
         fixed_modes=None,
+        solver="mu",
     ):
         self.n_iter_max = n_iter_max
         self.init = init
@@ -472,6 +572,7 @@ class CP_NN(DecompositionMixin):
         self.mask = mask
         self.cvg_criterion = cvg_criterion
         self.fixed_modes = fixed_modes
+        self.solver = solver
 
     def fit_transform(self, tensor):
         """Decompose an input tensor
@@ -500,6 +601,7 @@ class CP_NN(DecompositionMixin):
             cvg_criterion=self.cvg_criterion,
             fixed_modes=self.fixed_modes,
             return_errors=True,
+            solver=self.solver,
         )
 
         self.decomposition_ = cp_tensor
@@ -557,6 +659,16 @@ class CP_NN_HALS(DecompositionMixin):
     svd_mask_repeats: int
         If using a tensor with masked values, this initializes using SVD multiple times to
         remove the effect of these missing values on the initialization.
+    inner_iter_ratio : float, default is 0.5
+        Bound on the number of inner HALS sweeps, relative to the cost of the MTTKRP
+        and of the Gram matrices. See `non_negative_parafac_hals`.
+    inner_tol : float, default is 1e-2
+        Relative progress below which the inner HALS sweeps stop.
+    solver : {'hals', 'bpp'}, default is 'hals'
+        Solver of the nonnegative least squares problems.
+        See `non_negative_parafac_hals`.
+    n_jobs : int, default is 1
+        Number of threads solving blocks of rows of each factor in parallel.
 
     Returns
     -------
@@ -596,6 +708,10 @@ class CP_NN_HALS(DecompositionMixin):
         normalize_factors=False,
         cvg_criterion="abs_rec_error",
         random_state=None,
+        inner_iter_ratio=0.5,
+        inner_tol=1e-2,
+        solver="hals",
+        n_jobs=1,
     ):
         self.rank = rank
         self.n_iter_max = n_iter_max
@@ -611,6 +727,10 @@ class CP_NN_HALS(DecompositionMixin):
         self.normalize_factors = normalize_factors
         self.cvg_criterion = cvg_criterion
         self.random_state = random_state
+        self.inner_iter_ratio = inner_iter_ratio
+        self.inner_tol = inner_tol
+        self.solver = solver
+        self.n_jobs = n_jobs
 
     def fit_transform(self, tensor):
         """Decompose an input tensor
@@ -642,6 +762,10 @@ class CP_NN_HALS(DecompositionMixin):
             normalize_factors=self.normalize_factors,
             return_errors=True,
             cvg_criterion=self.cvg_criterion,
+            inner_iter_ratio=self.inner_iter_ratio,
+            inner_tol=self.inner_tol,
+            solver=self.solver,
+            n_jobs=self.n_jobs,
         )
 
         self.decomposition_ = cp_tensor
@@ -1,6 +1,8 @@
 from warnings import warn
 from typing import Iterable
 
+import numpy as np
+
 import tensorly as tl
 from ._base_decomposition import DecompositionMixin
 from tensorly.random import random_parafac2
@@ -12,6 +14,8 @@ from ..parafac2_tensor import (
 )
 from ..cp_tensor import CPTensor, cp_normalize
 from ..tenalg.svd import svd_interface
+from ..preprocessing import svd_compress_tensor_slices, svd_decompress_parafac2_tensor
+from ..utils.threads import thread_pool
 
 # Authors: Marie Roald
 #          Yngve Mardal Moe
@@ -96,27 +100,160 @@ def initialize_decomposition(
     raise ValueError(f'Initialization method "{init}" not recognized')
 
 
-def _compute_projections(tensor_slices, factors, svd):
-    n_eig = factors[0].shape[1]
-    out = []
+def _bucket_tensor_slices(tensor_slices, max_padding=0.25):
+    """Groups the tensor slices in buckets of slices with a similar number of rows
+
+    The slices of a bucket are zero-padded to the same number of rows and stacked,
+    so that the projection step can be done with batched matrix products and SVDs
+    instead of a loop over the slices.
+
+    Parameters
+    ----------
+    tensor_slices : ndarray or list of ndarrays
+    max_padding : float, default is 0.25
+        slices are padded with at most ``max_padding`` times their number of rows
+
+    Returns
+    -------
+    buckets : list of (indices, n_rows, stacked_slices)
+        * indices : list of int, position of the slices of the bucket in `tensor_slices`
+        * n_rows : list of int, number of rows of each of these slices
+        * stacked_slices : ndarray of shape (len(indices), max(n_rows), n_columns)
+    """
+    if tl.is_tensor(tensor_slices) and tl.ndim(tensor_slices) == 3:
+        n_slices, n_rows, _ = tl.shape(tensor_slices)
+        return [(list(range(n_slices)), [n_rows] * n_slices, tensor_slices)]
+
+    n_rows = [tl.shape(tensor_slice)[0] for tensor_slice in tensor_slices]
+    # Stable sort: slices of same length stay in their original order
+    order = sorted(range(len(n_rows)), key=lambda i: -n_rows[i])
+
+    groups = []
+    for i in order:
+        if groups and n_rows[i] * (1 + max_padding) >= n_rows[groups[-1][0]]:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+
+    buckets = []
+    for indices in groups:
+        length = n_rows[indices[0]]
+        padded = []
+        for i in indices:
+            tensor_slice = tensor_slices[i]
+            if n_rows[i] < length:
+                padding = tl.zeros(
+                    (length - n_rows[i], tl.shape(tensor_slice)[1]),
+                    **tl.context(tensor_slice),
+                )
+                tensor_slice = tl.concatenate([tensor_slice, padding], axis=0)
+            padded.append(tensor_slice)
+        buckets.append((indices, [n_rows[i] for i in indices], tl.stack(padded)))
+    return buckets
+
+
+def _compute_slice_projection(tensor_slice, A, factors, svd):
+    lhs = T.dot(factors[1], T.transpose(A * factors[2]))
+    rhs = T.transpose(tensor_slice)
+    U, _, Vh = svd_interface(
+        T.dot(lhs, rhs), n_eigenvecs=factors[0].shape[1], method=svd, flip_sign=False
+    )
+    return T.transpose(T.dot(U, Vh))
+
+
+def _compute_projections(tensor_slices, factors, svd, buckets=None):
+    """Computes the orthogonal projection matrices of all the slices
+
+    With the default SVD, the slices are processed by buckets of similar length
+    (see `_bucket_tensor_slices`) with batched matrix products and a batched SVD.
+    The projection of a slice is the polar factor of
+    :math:`B (a_i * C)^T X_i^T`, which is unchanged by zero-padding :math:`X_i`
+    as long as this matrix has full row rank. Padded slices for which it does not
+    are recomputed separately, so that the result matches the per-slice computation.
+
+    Parameters
+    ----------
+    tensor_slices : ndarray or list of ndarrays
+    factors : (A, B, C)
+    svd : str or callable
+    buckets : list, optional
+        output of `_bucket_tensor_slices` for `tensor_slices`, can be provided
+        to avoid stacking the slices at every call.
+
+    Returns
+    -------
+    projections : list of ndarrays
+    """
+    A, B, C = factors
+    n_eig = tl.shape(A)[1]
 
-    for A, tensor_slice in zip(factors[0], tensor_slices):
-        lhs = T.dot(factors[1], T.transpose(A * factors[2]))
-        rhs = T.transpose(tensor_slice)
-        U, _, Vh = svd_interface(
-            T.dot(lhs, rhs), n_eigenvecs=n_eig, method=svd, flip_sign=False
+    if svd != "truncated_svd":
+        return [
+            _compute_slice_projection(tensor_slice, A[i], factors, svd)
+            for i, tensor_slice in enumerate(tensor_slices)
+        ]
+
+    if buckets is None:
+        buckets = _bucket_tensor_slices(tensor_slices)
+
+    out = [None] * len(tensor_slices)
+    for indices, n_rows, stacked_slices in buckets:
+        length = tl.shape(stacked_slices)[1]
+        if length < n_eig:
+            # Not supported by the batched SVD, handled (and reported) slice per slice
+            for i in indices:
+                out[i] = _compute_slice_projection(tensor_slices[i], A[i], factors, svd)
+            continue
+
+        A_bucket = A[tl.tensor(indices, dtype=tl.int64)]
+        lhs = tl.matmul(
+            B * tl.reshape(A_bucket, (-1, 1, n_eig)), tl.transpose(C)
+        )  # lhs[n] = B (a_n * C)^T
+        U, S, Vh = tl.svd(
+            tl.matmul(lhs, tl.transpose(stacked_slices, (0, 2, 1))),
+            full_matrices=False,
         )
+        projections = tl.transpose(tl.matmul(U, Vh), (0, 2, 1))
+
+        if min(n_rows) < length:
+            S = tl.to_numpy(S)
+            rank_deficient = S[:, -1] <= S[:, 0] * np.finfo(S.dtype).eps * length
 
-        out.append(T.transpose(T.dot(U, Vh)))
+        for j, i in enumerate(indices):
+            if n_rows[j] < length and rank_deficient[j]:
+                out[i] = _compute_slice_projection(tensor_slices[i], A[i], factors, svd)
+            else:
+                out[i] = projections[j, : n_rows[j]]
 
     return out
 
 
-def _project_tensor_slices(tensor_slices, projections):
-    slices = []
+def _project_tensor_slices(tensor_slices, projections, buckets=None):
+    """Computes the aligned tensor whose i-th slice is :math:`P_i^T X_i`
 
-    for t, p in zip(tensor_slices, projections):
-        slices.append(T.dot(T.transpose(p), t))
+    The products are batched over buckets of slices of similar length
+    (see `_bucket_tensor_slices`), padding the projections with zeros.
+    """
+    if buckets is None:
+        buckets = _bucket_tensor_slices(tensor_slices)
+
+    slices = [None] * len(tensor_slices)
+    for indices, n_rows, stacked_slices in buckets:
+        length = tl.shape(stacked_slices)[1]
+        padded = []
+        for i, rows in zip(indices, n_rows):
+            projection = projections[i]
+            if rows < length:
+                padding = tl.zeros(
+                    (length - rows, tl.shape(projection)[1]), **tl.context(projection)
+                )
+                projection = tl.concatenate([projection, padding], axis=0)
+            padded.append(projection)
+        projected = tl.matmul(tl.transpose(tl.stack(padded), (0, 2, 1)), stacked_slices)
+        if len(buckets) == 1 and indices == list(range(len(tensor_slices))):
+            return projected
+        for j, i in enumerate(indices):
+            slices[i] = projected[j]
 
     return tl.stack(slices)
 
@@ -176,6 +313,7 @@ class _BroThesisLineSearch:
         factors: list,
         projections: list,
         rec_error,
+        buckets=None,
     ):
         r"""Perform one line search step.
 
@@ -196,6 +334,8 @@ class _BroThesisLineSearch:
             The projection matrices from the current iteration.
         rec_error : float
             The reconstruction error from the current iteration.
+        buckets : list, optional
+            The tensor slices grouped by length, see `_bucket_tensor_slices`.
 
         Returns
         -------
@@ -220,7 +360,9 @@ class _BroThesisLineSearch:
             if 2 in self.nn_modes:
                 factors_ls[2] = tl.clip(factors_ls[2], 0)
 
-        projections_ls = _compute_projections(tensor_slices, factors_ls, self.svd)
+        projections_ls = _compute_projections(
+            tensor_slices, factors_ls, self.svd, buckets
+        )
 
         ls_rec_error = _parafac2_reconstruction_error(
             tensor_slices, (weights, factors_ls, projections_ls), self.norm_tensor
@@ -250,8 +392,23 @@ class _BroThesisLineSearch:
             return factors, projections, rec_error
 
 
+def _projected_inner_product(projected_slices, A, B, C):
+    """Inner product between the slices and the PARAFAC2 model, given the projected slices
+
+    As <X_i, P_i B diag(a_i) C^T> = <P_i^T X_i, B diag(a_i) C^T>, only the projected
+    slices, of shape (rank, n_columns), are needed.
+    """
+    BtYC = tl.sum(tl.matmul(projected_slices, C) * B, axis=1)
+    return tl.sum(A * BtYC)
+
+
 def _parafac2_reconstruction_error(
-    tensor_slices, decomposition, norm_matrices=None, projected_tensor=None
+    tensor_slices,
+    decomposition,
+    norm_matrices=None,
+    projected_tensor=None,
+    chunk_size=256,
+    n_jobs=1,
 ):
     """Calculates the reconstruction error of the PARAFAC2 decomposition. This implementation
     uses the inner product with each matrix for efficiency, as this avoids needing to
@@ -261,6 +418,11 @@ def _parafac2_reconstruction_error(
 
         ||tensor - rec||^2 = ||tensor||^2 + ||rec||^2 - 2*<tensor, rec>
 
+    As the projection matrices have orthonormal columns, :math:`||rec||^2` only depends on
+    :math:`A`, :math:`B` and :math:`C`, and the inner product only on the projected slices
+    :math:`P_i^T X_i`. If the projected tensor is not given, the slices are projected by chunks
+    of ``chunk_size`` slices, so that the memory use does not grow with the number of slices.
+
     Parameters
     ----------
     tensor_slices : ndarray or list of ndarrays
@@ -277,6 +439,11 @@ def _parafac2_reconstruction_error(
     projected_tensor : ndarray, optional
         The projections of X into an aligned tensor for CP decomposition. This can be optionally
         provided to avoid recalculating it.
+    chunk_size : int, default is 256
+        Number of slices projected at once when `projected_tensor` is not given.
+    n_jobs : int, default is 1
+        Number of threads used to process the chunks of slices, which share the thread
+        budget of ``tl.set_num_threads``.
 
     Returns
     -------
@@ -294,23 +461,34 @@ def _parafac2_reconstruction_error(
     if weights is not None:
         A = A * weights
 
-    norm_cmf_sq = 0
-    inner_product = 0
-    CtC = tl.dot(tl.transpose(C), C)
+    if projected_tensor is not None:
+        inner_product = _projected_inner_product(projected_tensor, A, B, C)
+    else:
 
-    for i, t_slice in enumerate(tensor_slices):
-        B_i = (projections[i] @ B) * A[i]
+        def chunk_inner_product(start):
+            stop = min(start + chunk_size, len(tensor_slices))
+            projected_slices = tl.stack(
+                [
+                    tl.dot(tl.transpose(projections[i]), tensor_slices[i])
+                    for i in range(start, stop)
+                ]
+            )
+            return _projected_inner_product(projected_slices, A[start:stop], B, C)
 
-        if projected_tensor is None:
-            tmp = tl.dot(tl.transpose(B_i), t_slice)
+        chunks = range(0, len(tensor_slices), chunk_size)
+        if n_jobs == 1:
+            inner_product = sum(chunk_inner_product(start) for start in chunks)
         else:
-            tmp = tl.reshape(A[i], (-1, 1)) * tl.transpose(B) @ projected_tensor[i]
+            with thread_pool(n_jobs) as executor:
+                inner_product = sum(executor.map(chunk_inner_product, chunks))
 
-        inner_product += tl.trace(tl.dot(tmp, C))
-
-        norm_cmf_sq += tl.sum((tl.transpose(B_i) @ B_i) * CtC)
+    norm_cmf_sq = tl.sum(
+        tl.dot(tl.transpose(A), A)
+        * tl.dot(tl.transpose(B), B)
+        * tl.dot(tl.transpose(C), C)
+    )
 
-    return tl.sqrt(norm_X_sq - 2 * inner_product + norm_cmf_sq)
+    return tl.sqrt(tl.clip(norm_X_sq - 2 * inner_product + norm_cmf_sq, 0))
 
 
 def parafac2(
@@ -328,6 +506,7 @@ def parafac2(
     return_errors=False,
     n_iter_parafac=5,
     linesearch=True,
+    compress=False,
 ):
     r"""PARAFAC2 decomposition [1]_ of a third order tensor via alternating least squares (ALS)
 
@@ -420,6 +599,14 @@ def parafac2(
     linesearch : bool, default is False
         Whether to perform line search as proposed by Bro in his PhD dissertation [2]_
         (similar to the PLSToolbox line search described in [3]_).
+    compress : bool or (score_matrices, loading_matrices), default is False
+        If True, the model is fitted to the SVD-compressed tensor slices (see
+        :py:func:`tensorly.preprocessing.svd_compress_tensor_slices`) and the
+        decomposition is decompressed before being returned. This is equivalent to fitting
+        the uncompressed data, but much faster when the slices have many more rows than
+        columns. The output of ``svd_compress_tensor_slices(tensor_slices)`` can also be
+        given directly, to reuse the compressed data across several fits
+        (e.g. with different ranks or initializations).
 
     Returns
     -------
@@ -458,6 +645,16 @@ def parafac2(
     non-negative, then :math:`B` will be non-negative, but not the orthogonal `P_i` matrices.
     Consequently, the `B_i` matrices are unlikely to be non-negative.
     """
+    if compress is True:
+        compress = svd_compress_tensor_slices(tensor_slices, svd=svd)
+    if compress:
+        score_matrices, loading_matrices = compress
+        if len(score_matrices) != len(tensor_slices):
+            raise ValueError(
+                f"The compressed data has {len(score_matrices)} slices but the tensor has {len(tensor_slices)} slices."
+            )
+        tensor_slices = score_matrices
+
     assert (
         rank <= tensor_slices[0].shape[1]
     ), f"PARAFAC2 rank ({rank}) cannot be greater than the number of columns in each tensor slice ({tensor_slices[0].shape[1]})."
@@ -480,6 +677,8 @@ def parafac2(
     if absolute_tol is None:
         absolute_tol = tl.eps(factors[0].dtype) * 1000
 
+    buckets = _bucket_tensor_slices(tensor_slices)
+
     if linesearch and not isinstance(linesearch, _BroThesisLineSearch):
         linesearch = _BroThesisLineSearch(
             norm_tensor, svd, verbose=verbose, nn_modes=nn_modes
@@ -537,8 +736,8 @@ def parafac2(
         else:
             line_iter = False
 
-        projections = _compute_projections(tensor_slices, factors, svd)
-        projected_tensor = _project_tensor_slices(tensor_slices, projections)
+        projections = _compute_projections(tensor_slices, factors, svd, buckets)
+        projected_tensor = _project_tensor_slices(tensor_slices, projections, buckets)
         factors = parafac_updates(projected_tensor, weights, factors)
 
         # Start line search if requested.
@@ -551,6 +750,7 @@ def parafac2(
                 factors,
                 projections,
                 rec_errors[-1],
+                buckets=buckets,
             )
 
         if normalize_factors:
@@ -586,6 +786,10 @@ def parafac2(
                     print(f"PARAFAC2 reconstruction error={rec_errors[-1]}")
 
     parafac2_tensor = Parafac2Tensor((weights, factors, projections))
+    if compress:
+        parafac2_tensor = svd_decompress_parafac2_tensor(
+            parafac2_tensor, loading_matrices
+        )
 
     if return_errors:
         return parafac2_tensor, rec_errors
@@ -678,6 +882,10 @@ class Parafac2(DecompositionMixin):
         Activate return of iteration errors
     n_iter_parafac : int, optional
         Number of PARAFAC iterations to perform for each PARAFAC2 iteration
+    compress : bool, default is False
+        If True, the model is fitted to the SVD-compressed tensor slices.
+        The compressed data is stored in ``compressed_`` and reused when
+        fitting the same tensor again, e.g. after changing the rank or initialization.
 
     Returns
     -------
@@ -719,6 +927,7 @@ class Parafac2(DecompositionMixin):
         return_errors=False,
         n_iter_parafac=5,
         linesearch=False,
+        compress=False,
     ):
         self.rank = rank
         self.n_iter_max = n_iter_max
@@ -733,6 +942,7 @@ class Parafac2(DecompositionMixin):
         self.return_errors = return_errors
         self.n_iter_parafac = n_iter_parafac
         self.linesearch = linesearch
+        self.compress = compress
 
     def fit_transform(self, tensor):
         """Decompose an input tensor
@@ -745,6 +955,13 @@ class Parafac2(DecompositionMixin):
         -------
         self
         """
+        compress = self.compress
+        if compress:
+            if getattr(self, "_compressed_tensor", None) is not tensor:
+                self.compressed_ = svd_compress_tensor_slices(tensor, svd=self.svd)
+                self._compressed_tensor = tensor
+            compress = self.compressed_
+
         self.decomposition_, self.errors_ = parafac2(
             tensor,
             rank=self.rank,
@@ -757,8 +974,9 @@ class Parafac2(DecompositionMixin):
             nn_modes=self.nn_modes,
             random_state=self.random_state,
             verbose=self.verbose,
-            return_errors=self.return_errors,
+            return_errors=True,
             n_iter_parafac=self.n_iter_parafac,
             linesearch=self.linesearch,
+            compress=compress,
         )
         return self.decomposition_
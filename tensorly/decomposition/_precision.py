@@ -0,0 +1,55 @@
+import numpy as np
+
+import tensorly as tl
+
+# License: BSD 3 clause
+
+PRECISIONS = ("full", "mixed")
+
+# The relative error e is computed from e ** 2, so its rounding error in single precision
+# is of the order of eps / e: below this, its decrease is dominated by rounding
+_SINGLE_EPS = float(np.finfo(np.float32).eps)
+
+
+def low_precision_context(tensor, precision="full"):
+    """Context in which the tensor is stored and contracted for the given precision
+
+    With ``precision="mixed"``, a double precision tensor is stored, and its
+    contractions with the factors (e.g. MTTKRP, mode products) computed, in single
+    precision, while the Gram matrices, solves and errors remain in double precision.
+
+    Parameters
+    ----------
+    tensor : tl.tensor
+    precision : {'full', 'mixed'}, default is 'full'
+
+    Returns
+    -------
+    context : dict or None
+        context of the low precision copy of `tensor`, None if everything is computed
+        in the precision of `tensor`, e.g. if it is already in single precision
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(
+            f"Unknown precision {precision!r}, accepted values are {PRECISIONS}."
+        )
+    if precision == "full":
+        return None
+
+    context = tl.context(tensor)
+    if context["dtype"] == tl.float64:
+        return {**context, "dtype": tl.float32}
+    if context["dtype"] == tl.complex128:
+        return {**context, "dtype": tl.complex64}
+    return None
+
+
+def is_stalled(rec_errors):
+    """True if the last iteration in low precision decreased the relative error by less
+    than its rounding error
+
+    The decompositions then fall back to full precision for the remaining iterations.
+    """
+    if len(rec_errors) < 2:
+        return False
+    return rec_errors[-2] - rec_errors[-1] < _SINGLE_EPS / max(rec_errors[-1], 1e-30)
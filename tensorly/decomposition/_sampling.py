@@ -0,0 +1,233 @@
+"""
+Sampling of tensor entries (multi-indices) used by the randomized decompositions.
+"""
+
+import numpy as np
+
+import tensorly as tl
+
+# License: BSD 3 clause
+
+
+def sample_indices(
+    shape, n_samples, probabilities=None, random_state=None, exclude=None
+):
+    """Draws multi-indices whose index along each mode is sampled independently
+
+    The samples of all the modes are drawn in a single vectorized pass: indices
+    following a uniform distribution are obtained by scaling uniform random numbers,
+    the others by inverting the cumulative distributions of all the modes at once.
+
+    Parameters
+    ----------
+    shape : int tuple
+        size of each mode
+    n_samples : int
+        number of multi-indices to draw
+    probabilities : list of {None, 1D-array}, optional
+        probability distribution over the indices of each mode.
+        None (or a None entry) corresponds to a uniform distribution.
+    random_state : {None, int, np.random.RandomState}
+    exclude : 1D-array of int, optional
+        linear indices of multi-indices that must not be drawn.
+        The samples then follow the conditional distribution on the other multi-indices,
+        drawn mode after mode (see `_sample_excluding`), without any rejection.
+
+    Returns
+    -------
+    indices : ndarray of int64
+        of shape (len(shape), n_samples), indices[i] contains the samples for mode i
+    """
+    rng = tl.check_random_state(random_state)
+    if exclude is not None and len(exclude):
+        return _sample_excluding(shape, n_samples, probabilities, rng, exclude)
+
+    n_modes = len(shape)
+    if probabilities is None:
+        probabilities = [None] * n_modes
+
+    draws = rng.random_sample((n_modes, n_samples))
+    sizes = np.asarray(shape, dtype=np.int64)
+    indices = np.minimum((draws * sizes[:, None]).astype(np.int64), sizes[:, None] - 1)
+
+    modes = [i for i in range(n_modes) if probabilities[i] is not None]
+    if modes:
+        # Mode i's cumulative distribution is shifted to [i, i + 1] so a single sorted
+        # search inverts the distributions of all the modes
+        cdfs = []
+        offsets = np.zeros(len(modes), dtype=np.int64)
+        for j, mode in enumerate(modes):
+            cdf = np.cumsum(tl.to_numpy(probabilities[mode]))
+            cdfs.append(cdf / cdf[-1] + j)
+            if j + 1 < len(modes):
+                offsets[j + 1] = offsets[j] + len(cdf)
+        positions = np.searchsorted(
+            np.concatenate(cdfs),
+            draws[modes] + np.arange(len(modes))[:, None],
+            side="right",
+        )
+        indices[modes] = np.minimum(
+            positions - offsets[:, None], sizes[modes, None] - 1
+        )
+
+    return indices
+
+
+def _sample_excluding(shape, n_samples, probabilities, rng, exclude):
+    """Draws multi-indices from the product distribution conditioned on not being in `exclude`
+
+    The index along each mode is drawn conditionally on the previous ones. As long as
+    these form the prefix of excluded multi-indices, the probability of each index
+    continuing such a prefix is scaled by the mass of its non-excluded completions;
+    the other samples leave the excluded prefixes and their remaining modes follow the
+    unconditioned distributions. The cost therefore does not depend on the excluded
+    mass, however close it is to one.
+
+    Parameters
+    ----------
+    shape : int tuple
+    n_samples : int
+    probabilities : list of {None, 1D-array} or None
+    rng : np.random.RandomState
+    exclude : 1D-array of int
+        linear indices of the excluded multi-indices
+
+    Returns
+    -------
+    indices : ndarray of int64
+        of shape (len(shape), n_samples)
+    """
+    n_modes = len(shape)
+    if probabilities is None:
+        probabilities = [None] * n_modes
+    mode_probabilities = []
+    for size, mode_probs in zip(shape, probabilities):
+        if mode_probs is None:
+            mode_probabilities.append(np.full(size, 1 / size))
+        else:
+            mode_probs = tl.to_numpy(mode_probs)
+            mode_probabilities.append(mode_probs / np.sum(mode_probs))
+
+    excluded = np.stack(np.unravel_index(np.unique(exclude), shape)).astype(np.int64)
+    # suffix_probs[mode] = probability of the indices of each excluded multi-index
+    # along the modes after `mode`
+    suffix_probs = [np.ones(excluded.shape[1])]
+    for mode in range(n_modes - 1, 0, -1):
+        suffix_probs.insert(
+            0, suffix_probs[0] * mode_probabilities[mode][excluded[mode]]
+        )
+
+    indices = np.empty((n_modes, n_samples), dtype=np.int64)
+    # Samples sharing a prefix with excluded multi-indices, and these multi-indices
+    groups = [(np.arange(n_samples), np.arange(excluded.shape[1]))]
+    for mode in range(n_modes):
+        next_groups = []
+        for samples, members in groups:
+            children, inverse = np.unique(excluded[mode, members], return_inverse=True)
+            excluded_mass = np.bincount(inverse, weights=suffix_probs[mode][members])
+            weights = mode_probabilities[mode].copy()
+            weights[children] *= np.clip(1 - excluded_mass, 0, None)
+            cdf = np.cumsum(weights)
+            draws = np.searchsorted(
+                cdf, rng.random_sample(len(samples)) * cdf[-1], side="right"
+            )
+            draws = np.minimum(draws, shape[mode] - 1)
+            indices[mode, samples] = draws
+
+            positions = np.minimum(np.searchsorted(children, draws), len(children) - 1)
+            in_prefix = children[positions] == draws
+            free = samples[~in_prefix]
+            if mode + 1 < n_modes and len(free):
+                indices[mode + 1 :, free] = sample_indices(
+                    shape[mode + 1 :],
+                    len(free),
+                    probabilities[mode + 1 :],
+                    random_state=rng,
+                )
+
+            # Split the remaining samples and excluded multi-indices by child
+            order = np.argsort(positions[in_prefix], kind="stable")
+            splits = np.searchsorted(
+                positions[in_prefix][order], np.arange(1, len(children))
+            )
+            member_order = np.argsort(inverse, kind="stable")
+            member_splits = np.searchsorted(
+                inverse[member_order], np.arange(1, len(children))
+            )
+            for child_samples, child_members in zip(
+                np.split(samples[in_prefix][order], splits),
+                np.split(members[member_order], member_splits),
+            ):
+                if len(child_samples):
+                    next_groups.append((child_samples, child_members))
+        groups = next_groups
+
+    return indices
+
+
+def deterministic_indices(probabilities, threshold):
+    """Multi-indices whose probability is at least `threshold`
+
+    The probability of a multi-index is the product of the probabilities of its index
+    along each mode. As each partial product is an upper bound on the full product,
+    the candidates are pruned mode after mode and never exceed 1/threshold.
+
+    Parameters
+    ----------
+    probabilities : list of 1D-array
+        probability distribution over the indices of each mode
+    threshold : float
+        minimum probability of the returned multi-indices
+
+    Returns
+    -------
+    indices : ndarray of int64
+        of shape (len(probabilities), n_indices)
+    index_probabilities : ndarray
+        probability of each of the returned multi-indices
+    """
+    indices = np.zeros((0, 1), dtype=np.int64)
+    index_probabilities = np.ones(1)
+    for mode_probabilities in probabilities:
+        mode_probabilities = tl.to_numpy(mode_probabilities)
+        (candidates,) = np.nonzero(mode_probabilities >= threshold)
+        products = np.outer(index_probabilities, mode_probabilities[candidates])
+        rows, columns = np.nonzero(products >= threshold)
+        indices = np.concatenate([indices[:, rows], candidates[None, columns]], axis=0)
+        index_probabilities = products[rows, columns]
+    return indices, index_probabilities
+
+
+def unique_indices(indices, shape):
+    """Combines repeated multi-indices
+
+    Duplicates are found on the linear indices of the samples, which is much
+    cheaper than looking for unique columns of `indices`.
+
+    Parameters
+    ----------
+    indices : ndarray of int
+        of shape (len(shape), n_samples), as returned by `sample_indices`
+    shape : int tuple
+        size of each mode
+
+    Returns
+    -------
+    unique_indices : ndarray of int64
+        of shape (len(shape), n_unique), the distinct multi-indices, sorted by linear index
+    counts : ndarray of int64
+        number of times each distinct multi-index appears in `indices`
+    """
+    linear_indices = np.ravel_multi_index(tuple(indices), shape)
+    linear_indices, counts = np.unique(linear_indices, return_counts=True)
+    return np.stack(np.unravel_index(linear_indices, shape)).astype(np.int64), counts
+
+
+def index_tensor(indices):
+    """Converts (an array of) sampled indices to a backend tensor of integers
+
+    The dtype needs to be explicitly set to an int type, otherwise tl.tensor converts
+    to a floating type. Backend tensors are also needed to index with jax, which
+    doesn't allow indexing with lists; see https://github.com/google/jax/issues/4564.
+    """
+    return tl.tensor(indices, dtype=tl.int64)
@@ -5,6 +5,7 @@ from ._base_decomposition import DecompositionMixin
 from ..base import matricize
 from ..tr_tensor import validate_tr_rank
 from ..metrics import leverage_score_dist
+from ._sampling import sample_indices, unique_indices, index_tensor
 
 
 def tensor_ring_als(
@@ -86,16 +87,32 @@ def tensor_ring_als(
     # Main loop
     rec_errors = []
     for iter in range(n_iter_max):
+        # Partial chains of the cores after each mode, i.e., right_chains[dim] is the
+        # contraction of cores dim+1, ..., n_dim-1. These are not updated before
+        # reaching dim in the sweep, so they are computed once per sweep.
+        right_chains = [None] * n_dim
+        for dim in range(n_dim - 2, -1, -1):
+            if right_chains[dim + 1] is None:
+                right_chains[dim] = tr_decomp[dim + 1]
+            else:
+                right_chains[dim] = tl.tensordot(
+                    tr_decomp[dim + 1], right_chains[dim + 1], axes=1
+                )
+
+        # Contraction of the (already updated) cores 0, ..., dim-1
+        left_chain = None
+
         for dim in range(n_dim):
             # Compute appropriate transposed unfolding of tensor
             tensor_unf = matricize(tensor, [n for n in range(n_dim) if n != dim], [dim])
 
-            # Compute design matrix
-            subchain_tensor = tr_decomp[(dim + 1) % n_dim]
-            for j in range(2, n_dim):
-                subchain_tensor = tl.tensordot(
-                    subchain_tensor, tr_decomp[(dim + j) % n_dim], axes=1
-                )
+            # Compute design matrix from the cores dim+1, ..., n_dim-1, 0, ..., dim-1
+            if left_chain is None:
+                subchain_tensor = right_chains[dim]
+            elif right_chains[dim] is None:
+                subchain_tensor = left_chain
+            else:
+                subchain_tensor = tl.tensordot(right_chains[dim], left_chain, axes=1)
             tr_idx = (
                 [i + n_dim - dim for i in range(dim)]
                 + [i + 1 for i in range(n_dim - dim - 1)]
@@ -121,6 +138,13 @@ def tensor_ring_als(
                 [0, 2, 1],
             )
 
+            # Extend the left partial chain with the updated core
+            if dim < n_dim - 1:
+                if left_chain is None:
+                    left_chain = tr_decomp[dim]
+                else:
+                    left_chain = tl.tensordot(left_chain, tr_decomp[dim], axes=1)
+
         # Compute relative error if necessary
         if tol > 0 or callback:
             error = tl.norm(tl.matmul(design_mat, sol) - tensor_unf)
@@ -243,11 +267,10 @@ def tensor_ring_als_sampled(
     # Randomly initialize decomposition cores
     tr_decomp = tl.random.random_tr(shape, rank, random_state=rng, **tl.context(tensor))
 
-    # Compute initial sampling distributions
+    # Compute initial sampling distributions. These are kept on the host, where the
+    # samples are drawn, and only the sampled indices are sent to the backend.
     if uniform_sampling:
-        sampling_probs = [
-            np.ones(shape=shape[dim]) / shape[dim] for dim in range(n_dim)
-        ]
+        sampling_probs = [None] * n_dim
         samp_prob_sqrt_inv = [
             np.prod(np.sqrt([shape[n] for n in range(n_dim) if n != dim]))
             for dim in range(n_dim)
@@ -256,7 +279,7 @@ def tensor_ring_als_sampled(
         sampling_probs = [None]
         for dim in range(1, n_dim):
             lev_score_dist = leverage_score_dist(matricize(tr_decomp[dim], [1], [0, 2]))
-            sampling_probs.append(lev_score_dist)
+            sampling_probs.append(tl.to_numpy(lev_score_dist))
 
     # Run callback function if provided
     if callback:
@@ -267,41 +290,34 @@ def tensor_ring_als_sampled(
     rec_errors = []
     for iter in range(n_iter_max):
         for dim in range(n_dim):
-            # Randomly draw row indices
-            samples = [
-                rng.choice(
-                    range(shape[n]),
-                    size=(n_samples[dim]),
-                    p=tl.to_numpy(sampling_probs[n]),
-                )
-                for n in range(n_dim)
-                if n != dim
-            ]
+            # Randomly draw row indices, for all the other modes at once
+            other_modes = [n for n in range(n_dim) if n != dim]
+            samples = sample_indices(
+                [shape[n] for n in other_modes],
+                n_samples[dim],
+                probabilities=[sampling_probs[n] for n in other_modes],
+                random_state=rng,
+            )
 
             # Combine repeated samples
-            samples_unq, samples_cnt = np.unique(samples, axis=1, return_counts=True)
-            samples_unq = samples_unq.tolist()
-            samples_unq.insert(dim, slice(None, None, None))
-            samples_unq = tuple(samples_unq)
-            samples_cnt = tl.tensor(samples_cnt, **tl.context(tensor))
+            samples, samples_cnt = unique_indices(
+                samples, [shape[n] for n in other_modes]
+            )
 
             # Compute row rescaling factors (see discussion in Sec 4.1 in paper by
             # Larsen & Kolda (2022), DOI: 10.1137/21M1441754)
-            rescaling = tl.sqrt(samples_cnt / n_samples[dim])
+            rescaling = np.sqrt(samples_cnt / n_samples[dim])
             if uniform_sampling:
                 rescaling *= samp_prob_sqrt_inv[dim]
             else:
-                for n in range(n_dim):
-                    if n != dim:
-                        # Converting samples_unq[n] to a tl.tensor is necessary for indexing
-                        # to work with jax, which doesn't allow indexing with lists; see
-                        # https://github.com/google/jax/issues/4564. The dtype needs to be
-                        # explicitly set to an int type, otherwise tl.tensor does the
-                        # conversion to floating type which causes issues with the pytorch
-                        # backend.
-                        rescaling /= tl.sqrt(
-                            sampling_probs[n][tl.tensor(samples_unq[n], dtype=tl.int64)]
-                        )
+                for i, n in enumerate(other_modes):
+                    rescaling /= np.sqrt(sampling_probs[n][samples[i]])
+            rescaling = tl.tensor(rescaling, **tl.context(tensor))
+
+            samples = index_tensor(samples)
+            samples_unq = [samples[i] for i in range(n_dim - 1)]
+            samples_unq.insert(dim, slice(None, None, None))
+            samples_unq = tuple(samples_unq)
 
             # Sample core tensors
             sampled_cores = [
@@ -337,7 +353,9 @@ def tensor_ring_als_sampled(
 
             # Compute sampling distribution for updated core
             if not uniform_sampling:
-                sampling_probs[dim] = leverage_score_dist(tl.transpose(sol))
+                sampling_probs[dim] = tl.to_numpy(
+                    leverage_score_dist(tl.transpose(sol))
+                )
 
         # Compute relative error if necessary
         if tol > 0 or callback:
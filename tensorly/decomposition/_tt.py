@@ -1,3 +1,5 @@
+import numpy as np
+
 import tensorly as tl
 from ._base_decomposition import DecompositionMixin
 from ..tt_tensor import validate_tt_rank, TTTensor
@@ -5,7 +7,39 @@ from ..tt_matrix import validate_tt_matrix_rank, TTMatrix
 from ..tenalg.svd import svd_interface
 
 
-def tensor_train(input_tensor, rank, svd="truncated_svd", verbose=False):
+def _delta_truncation_rank(S, norm_sq, delta):
+    """Smallest rank whose truncation error is at most `delta`
+
+    The squared truncation error of keeping the first ``r`` singular triplets
+    of a matrix of squared Frobenius norm `norm_sq` is
+    ``norm_sq - sum(S[:r]**2)``. This holds whether `S` contains the full
+    spectrum or only the leading part of it (e.g. from a randomized sketch),
+    as long as the singular vectors are orthonormal.
+
+    Parameters
+    ----------
+    S : 1D-array
+        leading singular values, sorted in decreasing order
+    norm_sq : float
+        squared Frobenius norm of the matrix
+    delta : float
+        maximum allowed truncation error
+
+    Returns
+    -------
+    rank : int
+        truncation rank, ``len(S)`` if no prefix of `S` is accurate enough
+    converged : bool
+        whether the truncation error at `rank` is at most `delta`
+    """
+    residuals = norm_sq - np.cumsum(tl.to_numpy(S) ** 2)
+    (accurate,) = np.nonzero(residuals <= delta**2)
+    if len(accurate):
+        return int(accurate[0]) + 1, True
+    return len(residuals), False
+
+
+def tensor_train(input_tensor, rank=None, svd="truncated_svd", verbose=False, tol=None):
     """TT decomposition via recursive SVD
 
         Decomposes `input_tensor` into a sequence of order-3 tensors (factors)
@@ -14,14 +48,23 @@ def tensor_train(input_tensor, rank, svd="truncated_svd", verbose=False):
     Parameters
     ----------
     input_tensor : tensorly.tensor
-    rank : {int, int list}
+    rank : {int, int list}, optional
             maximum allowable TT rank of the factors
             if int, then this is the same for all the factors
             if int list, then rank[k] is the rank of the kth factor
+            Can only be omitted if `tol` is given, in which case the ranks are unbounded.
     svd : str, default is 'truncated_svd'
         function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
     verbose : boolean, optional
             level of verbosity
+    tol : float, optional
+        if specified, relative error tolerance of the decomposition.
+        The TT ranks are then chosen adaptively with the delta-truncation of [1]_
+        so that ``||input_tensor - tt||_F <= tol * ||input_tensor||_F``,
+        capped by `rank` if it is also given.
+        With ``svd='randomized_svd'``, each unfolding is sketched with a
+        randomized range finder whose size is doubled until the tolerance is met,
+        instead of computing its full SVD.
 
     Returns
     -------
@@ -32,10 +75,20 @@ def tensor_train(input_tensor, rank, svd="truncated_svd", verbose=False):
     ----------
     .. [1] Ivan V. Oseledets. "Tensor-train decomposition", SIAM J. Scientific Computing, 33(5):2295–2317, 2011.
     """
-    rank = validate_tt_rank(tl.shape(input_tensor), rank=rank)
-    tensor_size = input_tensor.shape
+    tensor_size = tl.shape(input_tensor)
     n_dim = len(tensor_size)
 
+    if rank is None:
+        if tol is None:
+            raise ValueError("Either rank or tol must be specified for tensor_train.")
+        rank = [1] + [int(np.prod(tensor_size))] * (n_dim - 1) + [1]
+    else:
+        rank = validate_tt_rank(tensor_size, rank=rank)
+
+    if tol is not None:
+        # The total error is bounded by the sum of the n_dim - 1 truncation errors
+        delta = tol * tl.to_numpy(tl.norm(input_tensor, 2)) / np.sqrt(max(n_dim - 1, 1))
+
     unfolding = input_tensor
     factors = [None] * n_dim
 
@@ -46,9 +99,28 @@ def tensor_train(input_tensor, rank, svd="truncated_svd", verbose=False):
         unfolding = tl.reshape(unfolding, (n_row, -1))
 
         # SVD of unfolding matrix
-        (n_row, n_column) = unfolding.shape
+        n_row, n_column = unfolding.shape
         current_rank = min(n_row, n_column, rank[k + 1])
-        U, S, V = svd_interface(unfolding, n_eigenvecs=current_rank, method=svd)
+
+        if tol is None:
+            U, S, V = svd_interface(unfolding, n_eigenvecs=current_rank, method=svd)
+        else:
+            norm_sq = tl.to_numpy(tl.norm(unfolding, 2)) ** 2
+            if svd == "randomized_svd":
+                # Start from a sketch twice the size of the previous rank
+                n_eigenvecs = min(current_rank, 2 * rank[k])
+            else:
+                n_eigenvecs = current_rank
+
+            while True:
+                U, S, V = svd_interface(unfolding, n_eigenvecs=n_eigenvecs, method=svd)
+                truncated_rank, converged = _delta_truncation_rank(S, norm_sq, delta)
+                if converged or n_eigenvecs >= current_rank:
+                    break
+                n_eigenvecs = min(current_rank, 2 * n_eigenvecs)
+
+            current_rank = truncated_rank
+            U, S, V = U[:, :current_rank], S[:current_rank], V[:current_rank, :]
 
         rank[k + 1] = current_rank
 
@@ -64,7 +136,7 @@ def tensor_train(input_tensor, rank, svd="truncated_svd", verbose=False):
         unfolding = tl.reshape(S, (-1, 1)) * V
 
     # Getting the last factor
-    (prev_rank, last_dim) = unfolding.shape
+    prev_rank, last_dim = unfolding.shape
     factors[-1] = tl.reshape(unfolding, (prev_rank, last_dim, 1))
 
     if verbose is True:
@@ -149,20 +221,23 @@ class TensorTrain(DecompositionMixin):
         function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
     verbose : boolean, optional
             level of verbosity
+    tol : float, optional
+        if specified, relative error tolerance used to choose the TT ranks adaptively
 
     Returns
     -------
     tt_matrix
     """
 
-    def __init__(self, rank, svd="truncated_svd", verbose=False):
+    def __init__(self, rank=None, svd="truncated_svd", verbose=False, tol=None):
         self.rank = rank
         self.svd = svd
         self.verbose = verbose
+        self.tol = tol
 
     def fit_transform(self, tensor):
         self.decomposition_ = tensor_train(
-            tensor, rank=self.rank, svd=self.svd, verbose=self.verbose
+            tensor, rank=self.rank, svd=self.svd, verbose=self.verbose, tol=self.tol
         )
         return self.decomposition_
 
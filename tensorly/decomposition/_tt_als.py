@@ -0,0 +1,585 @@
+import numpy as np
+
+import tensorly as tl
+from ._base_decomposition import DecompositionMixin
+from ._tt import tensor_train, _delta_truncation_rank
+from ..tt_tensor import validate_tt_rank, tt_to_tensor, TTTensor
+from ..random import random_tt
+from ..tenalg.svd import svd_interface
+
+# License: BSD 3 clause
+
+
+def _right_orthogonalize(factors):
+    """Makes all the TT cores but the first one right-orthonormal, using QR decompositions
+
+    The represented tensor is unchanged and the first core becomes the orthogonality
+    center. Ranks larger than what the cores can support are reduced in the process.
+    """
+    factors = list(factors)
+    for k in range(len(factors) - 1, 0, -1):
+        rank, n_row, next_rank = tl.shape(factors[k])
+        Q, R = tl.qr(tl.transpose(tl.reshape(factors[k], (rank, n_row * next_rank))))
+        factors[k] = tl.reshape(tl.transpose(Q), (-1, n_row, next_rank))
+        factors[k - 1] = tl.tensordot(factors[k - 1], tl.transpose(R), axes=1)
+    return factors
+
+
+def _reverse_tt(factors):
+    """Cores of the TT whose modes are those of `factors`, in reverse order"""
+    return [tl.transpose(factor, (2, 1, 0)) for factor in reversed(factors)]
+
+
+def _reverse_target(target):
+    if isinstance(target, list):
+        return _reverse_tt(target)
+    return tl.transpose(target, list(range(tl.ndim(target)))[::-1])
+
+
+def _tt_norm_sq(factors):
+    """Squared Frobenius norm of a tensor given by its TT cores"""
+    environment = tl.ones((1, 1), **tl.context(factors[0]))
+    for factor in factors:
+        environment = _contract_left(environment, factor, factor)
+    return environment[0, 0]
+
+
+def _contract_left(environment, factor, other):
+    """Contracts a (rank, other_rank) left environment with two cores
+
+    Equivalent to ``einsum("ab,aic,bid->cd", environment, factor, other)``, computed
+    pairwise in O(r^3 n) operations.
+    """
+    environment = tl.tensordot(environment, factor, axes=([0], [0]))
+    return tl.tensordot(environment, other, axes=([0, 1], [0, 1]))
+
+
+def _contract_right(environment, factor, other):
+    """Contracts a (rank, other_rank) right environment with two cores
+
+    Equivalent to ``einsum("aic,bid,cd->ab", factor, other, environment)``, computed
+    pairwise in O(r^3 n) operations.
+    """
+    environment = tl.tensordot(factor, environment, axes=([2], [0]))
+    return tl.tensordot(environment, other, axes=([1, 2], [1, 2]))
+
+
+def _right_environment(target, k, factor, environment):
+    """Adds the kth core to the environment of the cores > k
+
+    For a dense target, the right environment of the cores > k is their product,
+    of shape (rank[k + 1], prod(shape[k + 1:])). For a target given by its TT cores,
+    it is their contraction with the corresponding target cores, of shape
+    (rank[k + 1], target_rank[k + 1]).
+    """
+    if isinstance(target, list):
+        return _contract_right(environment, factor, target[k])
+    rank, n_row, next_rank = tl.shape(factor)
+    environment = tl.dot(tl.reshape(factor, (rank * n_row, next_rank)), environment)
+    return tl.reshape(environment, (rank, -1))
+
+
+def _left_environment(target, k, factor, environment):
+    """Adds the kth core to the environment of the cores < k
+
+    For a dense target, the left environment of the cores < k is the target
+    projected on these cores, of shape (rank[k], prod(shape[k:])).
+    For a target given by its TT cores, it is of shape (rank[k], target_rank[k]).
+    """
+    if isinstance(target, list):
+        return _contract_left(environment, factor, target[k])
+    rank, n_row, next_rank = tl.shape(factor)
+    environment = tl.reshape(environment, (rank * n_row, -1))
+    return tl.dot(tl.transpose(tl.reshape(factor, (-1, next_rank))), environment)
+
+
+def _local_problem(target, k, left, right, n_sites=1):
+    """Projection of the target on all the cores except the `n_sites` ones starting at k
+
+    Returns
+    -------
+    local : 2D-array
+        of shape (rank[k]*shape[k], prod(shape[k + 1:k + n_sites])*rank[k + n_sites])
+    """
+    rank = tl.shape(left)[0]
+    if isinstance(target, list):
+        n_row = tl.shape(target[k])[1]
+        local = tl.tensordot(left, target[k], axes=1)
+        for i in range(1, n_sites):
+            local = tl.tensordot(local, target[k + i], axes=1)
+        local = tl.tensordot(local, right, axes=([n_sites + 1], [1]))
+    else:
+        local_shape = tl.shape(target)[k : k + n_sites]
+        n_row = local_shape[0]
+        left = tl.reshape(left, (rank * int(np.prod(local_shape)), -1))
+        local = tl.dot(left, tl.transpose(right))
+    return tl.reshape(local, (rank * n_row, -1))
+
+
+def _tt_sweep(target, factors, rank, n_sites=1, delta=None, svd="truncated_svd"):
+    """Left-to-right sweep of one-site ALS or two-site DMRG updates
+
+    Parameters
+    ----------
+    target : tensor or list of 3D-arrays
+        dense tensor to approximate, or its TT cores
+    factors : list of 3D-arrays
+        current TT cores, all right-orthonormal except for the first one
+    rank : int list
+        maximum TT rank
+    n_sites : {1, 2}
+        number of consecutive cores updated jointly
+    delta : float, optional
+        if not None, maximum truncation error of each local update
+    svd : str, default is 'truncated_svd'
+        function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+
+    Returns
+    -------
+    factors : list of 3D-arrays
+        updated TT cores, all left-orthonormal except for the last one
+    """
+    n_dim = len(factors)
+    factors = list(factors)
+
+    # The environments of the right-orthonormal cores are computed once per sweep
+    right_environments = [None] * n_dim
+    right_environments[-1] = tl.ones((1, 1), **tl.context(factors[0]))
+    for k in range(n_dim - 1, n_sites - 1, -1):
+        right_environments[k - 1] = _right_environment(
+            target, k, factors[k], right_environments[k]
+        )
+
+    if isinstance(target, list):
+        left_environment = tl.ones((1, 1), **tl.context(factors[0]))
+    else:
+        left_environment = tl.reshape(target, (1, -1))
+
+    for k in range(n_dim - 1):
+        local = _local_problem(
+            target,
+            k,
+            left_environment,
+            right_environments[k + n_sites - 1],
+            n_sites=n_sites,
+        )
+        n_row, n_column = tl.shape(local)
+        current_rank = min(n_row, n_column, rank[k + 1])
+
+        if n_sites == 1 and delta is None and current_rank == n_column:
+            core, _ = tl.qr(local)
+        else:
+            U, S, V = svd_interface(local, n_eigenvecs=min(n_row, n_column), method=svd)
+            if delta is not None:
+                truncated_rank, _ = _delta_truncation_rank(
+                    S, tl.to_numpy(tl.norm(local, 2)) ** 2, delta
+                )
+                current_rank = min(current_rank, truncated_rank)
+            core = U[:, :current_rank]
+            if n_sites == 2 and k == n_dim - 2:
+                factors[-1] = tl.reshape(
+                    tl.reshape(S[:current_rank], (-1, 1)) * V[:current_rank],
+                    (current_rank, -1, 1),
+                )
+
+        previous_rank = tl.shape(left_environment)[0]
+        factors[k] = tl.reshape(core, (previous_rank, -1, tl.shape(core)[1]))
+        left_environment = _left_environment(target, k, factors[k], left_environment)
+
+    if n_sites == 1:
+        local = _local_problem(
+            target, n_dim - 1, left_environment, right_environments[-1]
+        )
+        factors[-1] = tl.reshape(local, (tl.shape(factors[-2])[2], -1, 1))
+
+    return factors
+
+
+def _tensor_train_sweeps(
+    tensor,
+    rank,
+    n_sites,
+    init,
+    n_iter_max,
+    tol,
+    truncation_tol,
+    mask,
+    svd,
+    random_state,
+    verbose,
+    return_errors,
+):
+    """Common implementation of tensor_train_als and tensor_train_dmrg"""
+    if isinstance(tensor, TTTensor):
+        if mask is not None:
+            raise ValueError("Masks are only supported for dense tensors.")
+        target = list(tensor.factors)
+        context = tl.context(target[0])
+        norm_sq = _tt_norm_sq(target)
+    else:
+        target = tensor
+        context = tl.context(tensor)
+        norm_sq = tl.norm(tensor, 2) ** 2
+    shape = tl.shape(tensor)
+    n_dim = len(shape)
+    rank = validate_tt_rank(shape, rank=rank)
+    rng = tl.check_random_state(random_state)
+
+    if isinstance(init, TTTensor):
+        factors = list(init.factors)
+    elif init == "svd" and not isinstance(tensor, TTTensor):
+        if mask is not None:
+            tensor = tensor * mask
+        factors = list(tensor_train(tensor, rank, svd=svd).factors)
+    elif init in ["svd", "random"]:
+        factors = list(random_tt(shape, rank, random_state=rng, **context).factors)
+    else:
+        raise ValueError(
+            f"Got init={init}. However, init should be 'svd', 'random' or a TTTensor."
+        )
+    factors = _right_orthogonalize(factors)
+
+    if mask is None:
+        reversed_target = _reverse_target(target)
+    rec_errors = []
+
+    for iteration in range(n_iter_max):
+        if mask is not None:
+            # Missing values are imputed with the current approximation
+            target = tensor * mask + tt_to_tensor(factors) * (1 - mask)
+            reversed_target = _reverse_target(target)
+            norm_sq = tl.norm(target, 2) ** 2
+
+        if truncation_tol is not None:
+            delta = truncation_tol * tl.sqrt(norm_sq) / np.sqrt(max(n_dim - 1, 1))
+        else:
+            delta = None
+
+        # A forward and a backward sweep leave the orthogonality center on the first core
+        factors = _tt_sweep(target, factors, rank, n_sites, delta, svd)
+        factors = _tt_sweep(
+            reversed_target, _reverse_tt(factors), rank[::-1], n_sites, delta, svd
+        )
+        factors = _reverse_tt(factors)
+
+        # The other cores being orthonormal, ||tensor - tt||^2 = ||tensor||^2 - ||center||^2
+        rec_error = tl.sqrt(tl.abs(norm_sq - tl.norm(factors[0], 2) ** 2)) / tl.sqrt(
+            norm_sq
+        )
+        rec_errors.append(rec_error)
+
+        if verbose:
+            print(f"iteration {iteration}, reconstruction error: {rec_error}")
+
+        if tol and iteration >= 1 and tl.abs(rec_errors[-2] - rec_errors[-1]) < tol:
+            if verbose:
+                print(f"converged in {iteration} iterations.")
+            break
+
+    tt_tensor = TTTensor(factors)
+    if return_errors:
+        return tt_tensor, rec_errors
+    return tt_tensor
+
+
+def tensor_train_als(
+    tensor,
+    rank,
+    init="svd",
+    n_iter_max=100,
+    tol=1e-8,
+    truncation_tol=None,
+    mask=None,
+    svd="truncated_svd",
+    random_state=None,
+    verbose=False,
+    return_errors=False,
+):
+    """TT decomposition via alternating least squares (ALS)
+
+        Refines a Tensor-Train decomposition by optimizing its cores one at a time,
+        sweeping back and forth along the train [1]_. The cores that are not updated
+        are kept orthonormal, so that each local least squares problem is solved by
+        a projection, and the contractions of the target with these cores (the
+        environments) are cached and updated incrementally along the sweeps.
+
+    Parameters
+    ----------
+    tensor : tensorly.tensor or TTTensor
+        tensor to decompose. If given in TT format, each local update costs
+        O(r^3 n) operations, where r is the largest rank and n the largest dimension.
+    rank : {int, int list}
+        TT rank of the decomposition
+        if int, then this is the same for all the factors
+        if int list, then rank[k] is the rank of the kth factor
+    init : {'svd', 'random', TTTensor}, optional
+        initialization of the cores. 'svd' uses `tensor_train` (for dense tensors,
+        'random' is used otherwise) and a TTTensor can be passed to refine
+        an existing decomposition
+    n_iter_max : int, default is 100
+        maximum number of iterations, each made of a forward and a backward sweep
+    tol : float, default is 1e-8
+        the algorithm stops when the variation of the relative reconstruction error
+        between two iterations is less than `tol`
+    truncation_tol : float, optional
+        if specified, the ranks are adaptively reduced: each core is truncated
+        as in ``tensor_train(tol=truncation_tol)``. The ranks can only decrease,
+        use `tensor_train_dmrg` to also increase them.
+    mask : ndarray, optional
+        array of booleans with the same shape as ``tensor``, should be 0 where
+        the values are missing and 1 everywhere else.
+        Missing values are imputed with the current approximation at each iteration.
+    svd : str, default is 'truncated_svd'
+        function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+    random_state : {None, int, np.random.RandomState}
+    verbose : bool, optional
+        level of verbosity
+    return_errors : bool, optional
+        if True, also returns the relative reconstruction error after each iteration
+
+    Returns
+    -------
+    tt_tensor : TTTensor
+    errors : list
+        list of reconstruction errors, only returned if `return_errors` is True
+
+    References
+    ----------
+    .. [1] S. Holtz, T. Rohwedder, R. Schneider, "The Alternating Linear Scheme for
+           Tensor Optimization in the Tensor Train Format", SIAM J. Scientific
+           Computing, 34(2):A683–A713, 2012.
+    """
+    return _tensor_train_sweeps(
+        tensor,
+        rank,
+        n_sites=1,
+        init=init,
+        n_iter_max=n_iter_max,
+        tol=tol,
+        truncation_tol=truncation_tol,
+        mask=mask,
+        svd=svd,
+        random_state=random_state,
+        verbose=verbose,
+        return_errors=return_errors,
+    )
+
+
+def tensor_train_dmrg(
+    tensor,
+    rank,
+    init="svd",
+    n_iter_max=10,
+    tol=1e-8,
+    truncation_tol=None,
+    mask=None,
+    svd="truncated_svd",
+    random_state=None,
+    verbose=False,
+    return_errors=False,
+):
+    """TT decomposition via two-site DMRG sweeps
+
+        Refines a Tensor-Train decomposition by optimizing pairs of neighbouring cores,
+        sweeping back and forth along the train [1]_. The optimal pair is split with
+        a truncated SVD, which allows the ranks to adapt to the data, up to `rank`.
+        As in `tensor_train_als`, the environments of the other (orthonormal) cores
+        are cached and updated incrementally along the sweeps.
+
+    Parameters
+    ----------
+    tensor : tensorly.tensor or TTTensor
+        tensor to decompose. If given in TT format, each local update costs
+        O(r^3 n^2) operations, where r is the largest rank and n the largest dimension.
+    rank : {int, int list}
+        maximum TT rank of the decomposition
+        if int, then this is the same for all the factors
+        if int list, then rank[k] is the maximum rank of the kth factor
+    init : {'svd', 'random', TTTensor}, optional
+        initialization of the cores. 'svd' uses `tensor_train` (for dense tensors,
+        'random' is used otherwise) and a TTTensor, possibly of lower rank,
+        can be passed to refine an existing decomposition
+    n_iter_max : int, default is 10
+        maximum number of iterations, each made of a forward and a backward sweep
+    tol : float, default is 1e-8
+        the algorithm stops when the variation of the relative reconstruction error
+        between two iterations is less than `tol`
+    truncation_tol : float, optional
+        if specified, each pair of cores is split with the smallest rank
+        for which the truncation error is at most that of ``tensor_train(tol=truncation_tol)``
+    mask : ndarray, optional
+        array of booleans with the same shape as ``tensor``, should be 0 where
+        the values are missing and 1 everywhere else.
+        Missing values are imputed with the current approximation at each iteration.
+    svd : str, default is 'truncated_svd'
+        function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+    random_state : {None, int, np.random.RandomState}
+    verbose : bool, optional
+        level of verbosity
+    return_errors : bool, optional
+        if True, also returns the relative reconstruction error after each iteration
+
+    Returns
+    -------
+    tt_tensor : TTTensor
+    errors : list
+        list of reconstruction errors, only returned if `return_errors` is True
+
+    References
+    ----------
+    .. [1] S. Holtz, T. Rohwedder, R. Schneider, "The Alternating Linear Scheme for
+           Tensor Optimization in the Tensor Train Format", SIAM J. Scientific
+           Computing, 34(2):A683–A713, 2012.
+    """
+    return _tensor_train_sweeps(
+        tensor,
+        rank,
+        n_sites=2,
+        init=init,
+        n_iter_max=n_iter_max,
+        tol=tol,
+        truncation_tol=truncation_tol,
+        mask=mask,
+        svd=svd,
+        random_state=random_state,
+        verbose=verbose,
+        return_errors=return_errors,
+    )
+
+
+class TensorTrainALS(DecompositionMixin):
+    """TT decomposition via alternating least squares (ALS)
+
+    Parameters
+    ----------
+    rank : {int, int list}
+        TT rank of the decomposition
+    init : {'svd', 'random', TTTensor}, optional
+        initialization of the cores
+    n_iter_max : int, default is 100
+        maximum number of iterations, each made of a forward and a backward sweep
+    tol : float, default is 1e-8
+        tolerance on the variation of the relative reconstruction error
+    truncation_tol : float, optional
+        if specified, the ranks are adaptively reduced
+    mask : ndarray, optional
+        array of booleans with the same shape as ``tensor``, 0 where values are missing
+    svd : str, default is 'truncated_svd'
+        function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+    random_state : {None, int, np.random.RandomState}
+    verbose : bool, optional
+        level of verbosity
+
+    See Also
+    --------
+    tensor_train_als
+    """
+
+    def __init__(
+        self,
+        rank,
+        init="svd",
+        n_iter_max=100,
+        tol=1e-8,
+        truncation_tol=None,
+        mask=None,
+        svd="truncated_svd",
+        random_state=None,
+        verbose=False,
+    ):
+        self.rank = rank
+        self.init = init
+        self.n_iter_max = n_iter_max
+        self.tol = tol
+        self.truncation_tol = truncation_tol
+        self.mask = mask
+        self.svd = svd
+        self.random_state = random_state
+        self.verbose = verbose
+
+    def fit_transform(self, tensor):
+        tt_tensor, errors = tensor_train_als(
+            tensor,
+            rank=self.rank,
+            init=self.init,
+            n_iter_max=self.n_iter_max,
+            tol=self.tol,
+            truncation_tol=self.truncation_tol,
+            mask=self.mask,
+            svd=self.svd,
+            random_state=self.random_state,
+            verbose=self.verbose,
+            return_errors=True,
+        )
+        self.decomposition_ = tt_tensor
+        self.errors_ = errors
+        return self.decomposition_
+
+
+class TensorTrainDMRG(DecompositionMixin):
+    """TT decomposition via two-site DMRG sweeps
+
+    Parameters
+    ----------
+    rank : {int, int list}
+        maximum TT rank of the decomposition
+    init : {'svd', 'random', TTTensor}, optional
+        initialization of the cores
+    n_iter_max : int, default is 10
+        maximum number of iterations, each made of a forward and a backward sweep
+    tol : float, default is 1e-8
+        tolerance on the variation of the relative reconstruction error
+    truncation_tol : float, optional
+        if specified, relative tolerance used to choose the ranks adaptively
+    mask : ndarray, optional
+        array of booleans with the same shape as ``tensor``, 0 where values are missing
+    svd : str, default is 'truncated_svd'
+        function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+    random_state : {None, int, np.random.RandomState}
+    verbose : bool, optional
+        level of verbosity
+
+    See Also
+    --------
+    tensor_train_dmrg
+    """
+
+    def __init__(
+        self,
+        rank,
+        init="svd",
+        n_iter_max=10,
+        tol=1e-8,
+        truncation_tol=None,
+        mask=None,
+        svd="truncated_svd",
+        random_state=None,
+        verbose=False,
+    ):
+        self.rank = rank
+        self.init = init
+        self.n_iter_max = n_iter_max
+        self.tol = tol
+        self.truncation_tol = truncation_tol
+        self.mask = mask
+        self.svd = svd
+        self.random_state = random_state
+        self.verbose = verbose
+
+    def fit_transform(self, tensor):
+        tt_tensor, errors = tensor_train_dmrg(
+            tensor,
+            rank=self.rank,
+            init=self.init,
+            n_iter_max=self.n_iter_max,
+            tol=self.tol,
+            truncation_tol=self.truncation_tol,
+            mask=self.mask,
+            svd=self.svd,
+            random_state=self.random_state,
+            verbose=self.verbose,
+            return_errors=True,
+        )
+        self.decomposition_ = tt_tensor
+        self.errors_ = errors
+        return self.decomposition_
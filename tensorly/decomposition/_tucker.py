@@ -1,7 +1,7 @@
 import tensorly as tl
 from ._base_decomposition import DecompositionMixin
 from ..base import unfold
-from ..tenalg import multi_mode_dot, mode_dot
+from ..tenalg import multi_mode_dot, mode_dot, KroneckerOperator
 from ..tucker_tensor import (
     tucker_to_tensor,
     TuckerTensor,
@@ -9,16 +9,30 @@ from ..tucker_tensor import (
     tucker_normalize,
 )
 from ..tenalg.proximal import hals_nnls, active_set_nnls, fista
-from math import sqrt
+from math import sqrt, prod
 import warnings
 from collections.abc import Iterable
 from ..tenalg.svd import svd_interface
+from ._precision import low_precision_context, is_stalled
 
 # Author: Jean Kossaifi <jean.kossaifi+tensors@gmail.com>
 
 # License: BSD 3 clause
 
 
+def _multi_mode_dot_transposed(tensor, factors, modes, workspace, skip=None):
+    """``multi_mode_dot(tensor, factors, modes, skip=skip, transpose=True)``, with the
+    intermediate products alternating between two buffers of `workspace`
+    """
+    factors_modes = sorted(zip(factors, modes), key=lambda x: x[1])
+    factors_modes = [fm for i, fm in enumerate(factors_modes) if i != skip]
+    for i, (factor, mode) in enumerate(factors_modes):
+        tensor = workspace.mode_dot(
+            ("mode_dot", i % 2), tensor, tl.conj(tl.transpose(factor)), mode
+        )
+    return tensor
+
+
 def initialize_tucker(
     tensor,
     rank,
@@ -90,7 +104,7 @@ def initialize_tucker(
         ]
 
     else:
-        (core, factors) = init
+        core, factors = init
 
     if non_negative is True:
         factors = [tl.abs(f) for f in factors]
@@ -111,6 +125,7 @@ def partial_tucker(
     verbose=False,
     mask=None,
     svd_mask_repeats=5,
+    precision="full",
 ):
     """Partial tucker decomposition via Higher Order Orthogonal Iteration (HOI)
 
@@ -142,6 +157,11 @@ def partial_tucker(
         the values are missing and 1 everywhere else. Note:  if tensor is
         sparse, then mask should also be sparse with a fill value of 1 (or
         True).
+    precision : {'full', 'mixed'}, default is 'full'
+        If 'mixed', a double precision tensor is stored, and contracted with the
+        factors, in single precision, while the SVDs and errors remain in double
+        precision. Once the decrease of the error stalls at the level of the single
+        precision rounding, the remaining iterations are in full precision.
 
     Returns
     -------
@@ -180,31 +200,65 @@ def partial_tucker(
 
     rec_errors = []
     norm_tensor = tl.norm(tensor, 2)
+    # The partial mode products and unfoldings reuse the same buffers
+    workspace = tl.backend.Workspace()
+    low_context = low_precision_context(tensor, precision)
+    low_tensor = None
 
     for iteration in range(n_iter_max):
         if mask is not None:
             tensor = tensor * mask + multi_mode_dot(
                 core, factors, modes=modes, transpose=False
             ) * (1 - mask)
+        if low_context is not None and (low_tensor is None or mask is not None):
+            low_tensor = tl.tensor(tensor, **low_context)
 
         for index, mode in enumerate(modes):
-            core_approximation = multi_mode_dot(
-                tensor, factors, modes=modes, skip=index, transpose=True
-            )
+            if low_context is None:
+                core_approximation = _multi_mode_dot_transposed(
+                    tensor, factors, modes, workspace, skip=index
+                )
+            else:
+                # Contraction in low precision, SVD in full precision
+                core_approximation = tl.tensor(
+                    _multi_mode_dot_transposed(
+                        low_tensor,
+                        [tl.tensor(f, **low_context) for f in factors],
+                        modes,
+                        workspace,
+                        skip=index,
+                    ),
+                    **tl.context(tensor),
+                )
             eigenvecs, _, _ = svd_interface(
-                unfold(core_approximation, mode),
+                workspace.unfold("unfolding", core_approximation, mode),
                 n_eigenvecs=rank[index],
                 random_state=random_state,
             )
             factors[index] = eigenvecs
 
-        core = multi_mode_dot(tensor, factors, modes=modes, transpose=True)
+        if low_context is None:
+            core = multi_mode_dot(tensor, factors, modes=modes, transpose=True)
+        else:
+            core = tl.tensor(
+                multi_mode_dot(
+                    low_tensor,
+                    [tl.tensor(f, **low_context) for f in factors],
+                    modes=modes,
+                    transpose=True,
+                ),
+                **tl.context(tensor),
+            )
 
         # The factors are orthonormal and therefore do not affect the reconstructed tensor's norm
         rec_error = sqrt(tl.abs(norm_tensor**2 - tl.norm(core, 2) ** 2)) / norm_tensor
         rec_errors.append(rec_error)
 
-        if iteration > 1:
+        if low_context is not None and is_stalled(rec_errors):
+            if verbose:
+                print("Error stalled in mixed precision, switching to full.")
+            low_context = low_tensor = None
+        elif iteration > 1:
             if verbose:
                 print(
                     f"reconstruction error={rec_errors[-1]}, variation={rec_errors[-2] - rec_errors[-1]}."
@@ -230,6 +284,7 @@ def tucker(
     random_state=None,
     mask=None,
     verbose=False,
+    precision="full",
 ):
     """Tucker decomposition via Higher Order Orthogonal Iteration (HOI)
 
@@ -266,6 +321,11 @@ def tucker(
         True).
     verbose : int, optional
         level of verbosity
+    precision : {'full', 'mixed'}, default is 'full'
+        If 'mixed', a double precision tensor is stored, and contracted with the
+        factors, in single precision, while the SVDs and errors remain in double
+        precision. Once the decrease of the error stalls at the level of the single
+        precision rounding, the remaining iterations are in full precision.
 
     Returns
     -------
@@ -282,7 +342,7 @@ def tucker(
     """
     if fixed_factors:
         try:
-            (core, factors) = init
+            core, factors = init
         except:
             raise ValueError(
                 f'Got fixed_factor={fixed_factors} but no appropriate Tucker tensor was passed for "init".'
@@ -309,6 +369,7 @@ def tucker(
             random_state=random_state,
             mask=mask,
             verbose=verbose,
+            precision=precision,
         )
 
         factors = list(new_factors)
@@ -334,6 +395,7 @@ def tucker(
             random_state=random_state,
             mask=mask,
             verbose=verbose,
+            precision=precision,
         )
         tensor = TuckerTensor((core, factors))
         if return_errors:
@@ -467,6 +529,8 @@ def non_negative_tucker_hals(
     return_errors=False,
     exact=False,
     algorithm="fista",
+    inner_iter_ratio=0.5,
+    inner_tol=1e-2,
 ):
     r"""Non-negative Tucker decomposition with HALS
 
@@ -513,6 +577,15 @@ def non_negative_tucker_hals(
     algorithm : {'fista', 'active_set'}
         Non negative least square solution to update the core. 
         Default: 'fista'
+    inner_iter_ratio : float, default is 0.5
+        The number of inner HALS sweeps on a factor is bounded by
+        ``1 + inner_iter_ratio * complexity_ratio``, where ``complexity_ratio`` is the cost
+        of computing UtM and UtU divided by the cost of one sweep.
+        Ignored if `exact` is True.
+    inner_tol : float, default is 1e-2
+        The inner HALS sweeps on a factor stop when the squared norm of the update
+        falls below `inner_tol` times the squared norm of the first update.
+        Ignored if `exact` is True.
 
     Returns
     -------
@@ -602,21 +675,45 @@ def non_negative_tucker_hals(
     norm_tensor = tl.norm(tensor, 2)
     rec_errors = []
 
+    # Cost of computing UtM (projection of the tensor on all the other factors,
+    # followed by the product with the unfolded core) relative to one HALS sweep
+    complexity_ratios = []
+    for mode in range(n_modes):
+        shape = list(tl.shape(tensor))
+        cost = 0
+        for i in range(n_modes):
+            if i != mode:
+                cost += prod(shape) * rank[i]
+                shape[i] = rank[i]
+        cost += prod(shape) * rank[mode]
+        complexity_ratios.append(cost / (shape[mode] * rank[mode] * (rank[mode] + 1)))
+
+    # Gram matrices of the factors, updated along with the factors
+    grams = [tl.dot(tl.conj(tl.transpose(factor)), factor) for factor in nn_factors]
+
     # Iterate over one step of NTD
     for iteration in range(n_iter_max):
+        # Projections of the tensor on the factors of the last modes, shared by the
+        # updates of the first modes: suffixes[i] = tensor x_{j >= i} factors[j]^T
+        suffixes = [None] * n_modes + [tensor]
+        for i in range(n_modes - 1, 0, -1):
+            suffixes[i] = multi_mode_dot(
+                suffixes[i + 1], [nn_factors[i]], modes=[i], transpose=True
+            )
+
         # One pass of least squares on each updated mode
         for mode in modes:
-            # Computing Hadamard of cross-products
-            pseudo_inverse = nn_factors.copy()
-            for i, factor in enumerate(nn_factors):
-                if i != mode:
-                    pseudo_inverse[i] = tl.dot(tl.conj(tl.transpose(factor)), factor)
             # UtU
-            core_cross = multi_mode_dot(nn_core, pseudo_inverse, skip=mode)
+            core_cross = multi_mode_dot(nn_core, grams, skip=mode)
             UtU = tl.dot(unfold(core_cross, mode), tl.transpose(unfold(nn_core, mode)))
 
             # UtM
-            tensor_cross = multi_mode_dot(tensor, nn_factors, skip=mode, transpose=True)
+            tensor_cross = multi_mode_dot(
+                suffixes[mode + 1],
+                nn_factors[:mode],
+                modes=range(mode),
+                transpose=True,
+            )
             MtU = tl.dot(
                 unfold(tensor_cross, mode), tl.transpose(unfold(nn_core, mode))
             )
@@ -628,36 +725,42 @@ def non_negative_tucker_hals(
                 UtU,
                 tl.transpose(nn_factors[mode]),
                 n_iter_max=100,
+                tol=inner_tol,
                 sparsity_coefficient=sparsity_coefficients[mode],
                 exact=exact,
+                complexity_ratio=complexity_ratios[mode],
+                alpha=inner_iter_ratio,
             )
             nn_factors[mode] = tl.transpose(nn_factor)
-        # updating core
+            grams[mode] = tl.dot(
+                tl.conj(tl.transpose(nn_factors[mode])), nn_factors[mode]
+            )
+
+        # updating core, the last mode is always updated, so the projection of the
+        # tensor on all the factors is obtained from its tensor_cross
+        core_estimation = multi_mode_dot(
+            tensor_cross, [nn_factors[-1]], modes=[n_modes - 1], transpose=True
+        )
         if algorithm == "fista":
-            pseudo_inverse[-1] = tl.dot(tl.transpose(nn_factors[-1]), nn_factors[-1])
-            core_estimation = multi_mode_dot(tensor, nn_factors, transpose=True)
             learning_rate = 1
 
-            for MtM in pseudo_inverse:
+            for MtM in grams:
                 learning_rate *= 1 / (tl.truncated_svd(MtM)[1][0])
             nn_core = fista(
                 core_estimation,
-                pseudo_inverse,
+                grams,
                 x=nn_core,
                 n_iter_max=n_iter_max,
                 sparsity_coef=core_sparsity_coefficient,
                 lr=learning_rate,
             )
         if algorithm == "active_set":
-            pseudo_inverse[-1] = tl.dot(tl.transpose(nn_factors[-1]), nn_factors[-1])
-            core_estimation_vec = tl.base.tensor_to_vec(
-                tl.tenalg.mode_dot(
-                    tensor_cross, tl.transpose(nn_factors[modes[-1]]), modes[-1]
-                )
-            )
-            pseudo_inverse_kr = tl.tenalg.kronecker(pseudo_inverse)
+            # The Kronecker product of the Gram matrices is never formed
             vectorcore = active_set_nnls(
-                core_estimation_vec, pseudo_inverse_kr, x=nn_core, n_iter_max=n_iter_max
+                tl.base.tensor_to_vec(core_estimation),
+                KroneckerOperator(grams),
+                x=nn_core,
+                n_iter_max=n_iter_max,
             )
             nn_core = tl.reshape(vectorcore, tl.shape(nn_core))
 
@@ -684,6 +787,9 @@ def non_negative_tucker_hals(
                 break
         if normalize_factors:
             nn_core, nn_factors = tucker_normalize((nn_core, nn_factors))
+            grams = [
+                tl.dot(tl.conj(tl.transpose(factor)), factor) for factor in nn_factors
+            ]
     tensor = TuckerTensor((nn_core, nn_factors))
     if return_errors:
         return tensor, rec_errors
@@ -726,6 +832,11 @@ class Tucker(DecompositionMixin):
     random_state : {None, int, np.random.RandomState}
     verbose : int, optional
         level of verbosity
+    precision : {'full', 'mixed'}, default is 'full'
+        If 'mixed', a double precision tensor is stored, and contracted with the
+        factors, in single precision, while the SVDs and errors remain in double
+        precision. Once the decrease of the error stalls at the level of the single
+        precision rounding, the remaining iterations are in full precision.
 
     Returns
     -------
@@ -753,6 +864,7 @@ class Tucker(DecompositionMixin):
         random_state=None,
         mask=None,
         verbose=False,
+        precision="full",
     ):
         self.rank = rank
         self.fixed_factors = fixed_factors
@@ -764,6 +876,7 @@ class Tucker(DecompositionMixin):
         self.random_state = random_state
         self.mask = mask
         self.verbose = verbose
+        self.precision = precision
 
     def fit_transform(self, tensor):
         tucker_tensor = tucker(
@@ -778,6 +891,7 @@ class Tucker(DecompositionMixin):
             random_state=self.random_state,
             mask=self.mask,
             verbose=self.verbose,
+            precision=self.precision,
         )
         self.decomposition_ = tucker_tensor
         return tucker_tensor
@@ -932,6 +1046,11 @@ class Tucker_NN_HALS(DecompositionMixin):
     algorithm : {'fista', 'active_set'}
         Non negative least square solution to update the core.
         Default: 'fista'
+    inner_iter_ratio : float, default is 0.5
+        Bound on the number of inner HALS sweeps, relative to the cost of computing
+        UtM and UtU. See `non_negative_tucker_hals`.
+    inner_tol : float, default is 1e-2
+        Relative progress below which the inner HALS sweeps stop.
 
     Returns
     -------
@@ -963,6 +1082,8 @@ class Tucker_NN_HALS(DecompositionMixin):
         return_errors=False,
         exact=False,
         algorithm="fista",
+        inner_iter_ratio=0.5,
+        inner_tol=1e-2,
     ):
         self.rank = rank
         self.n_iter_max = n_iter_max
@@ -978,6 +1099,8 @@ class Tucker_NN_HALS(DecompositionMixin):
         self.return_errors = return_errors
         self.exact = exact
         self.algorithm = algorithm
+        self.inner_iter_ratio = inner_iter_ratio
+        self.inner_tol = inner_tol
 
     def fit_transform(self, tensor):
         tucker_tensor, errors = non_negative_tucker_hals(
@@ -996,6 +1119,8 @@ class Tucker_NN_HALS(DecompositionMixin):
             fixed_modes=self.fixed_modes,
             exact=self.exact,
             algorithm=self.algorithm,
+            inner_iter_ratio=self.inner_iter_ratio,
+            inner_tol=self.inner_tol,
         )
         self.decomposition_ = tucker_tensor
         self.errors_ = errors
@@ -0,0 +1,182 @@
+import numpy as np
+import pytest
+
+import tensorly as tl
+from .._constrained_parafac2 import (
+    constrained_parafac2,
+    ConstrainedParafac2,
+    _coupled_evolving_factors,
+    _regularized_inverses,
+)
+from ...metrics.factors import congruence_coefficient
+from ...parafac2_tensor import apply_parafac2_projections, parafac2_to_slices
+from ...tenalg import proximal
+from ...testing import (
+    assert_,
+    assert_array_almost_equal,
+    assert_class_wrapper_correctly_passes_arguments,
+)
+
+
+@pytest.mark.parametrize(
+    "constraints",
+    [{}, {"non_negative": True}, {"non_negative": {0: True, 2: True, 1: True}}],
+)
+def test_constrained_parafac2(monkeypatch, constraints):
+    rng = tl.check_random_state(1234)
+    rank, n_slices, n_rows, n_columns = 3, 10, 20, 8
+    # Planted non-negative PARAFAC2 tensor: the evolving factors are cyclic shifts
+    # of the rows of a blueprint, i.e. its product with permutation matrices
+    A = tl.tensor(rng.uniform(0.1, 1, (n_slices, rank)))
+    C = tl.tensor(rng.uniform(0, 1, (n_columns, rank)))
+    blueprint = rng.uniform(0, 1, (n_rows, rank))
+    B = [tl.tensor(np.roll(blueprint, i, axis=0)) for i in range(n_slices)]
+    slices = [tl.dot(B_i * a_i, tl.transpose(C)) for B_i, a_i in zip(B, A)]
+
+    parafac2_tensor, errors = constrained_parafac2(
+        slices,
+        rank,
+        n_iter_max=200,
+        random_state=rng,
+        return_errors=True,
+        **constraints,
+    )
+    assert_(len(errors) <= 200)
+    assert_(errors[-1] <= errors[0])
+    assert_(errors[-1] < 0.01, f"reconstruction error {errors[-1]} higher than 0.01")
+
+    # The planted factors are recovered
+    _, (rec_A, rec_B, rec_C) = apply_parafac2_projections(parafac2_tensor)
+    assert_(congruence_coefficient(rec_A, A)[0] > 0.99)
+    assert_(congruence_coefficient(rec_C, C)[0] > 0.99)
+    for rec_B_i, B_i in zip(rec_B, B):
+        assert_(congruence_coefficient(rec_B_i, B_i)[0] > 0.99)
+
+    # The constraints are satisfied, up to the feasibility tolerance for the B_i
+    if constraints:
+        assert_(tl.all(rec_A >= 0))
+        assert_(tl.all(rec_C >= 0))
+        for rec_B_i in rec_B:
+            assert_(tl.all(rec_B_i >= -1e-3 * tl.max(tl.abs(rec_B_i))))
+
+    for rec_slice, true_slice in zip(parafac2_to_slices(parafac2_tensor), slices):
+        assert_(tl.shape(rec_slice) == tl.shape(true_slice))
+
+    assert_class_wrapper_correctly_passes_arguments(
+        monkeypatch,
+        constrained_parafac2,
+        ConstrainedParafac2,
+        ignore_args={"return_errors"},
+        rank=3,
+    )
+
+
+def test_constrained_parafac2_admm_options():
+    """The ADMM options of constrained_parafac give the same fit"""
+    rng = tl.check_random_state(1234)
+    slices = [tl.tensor(rng.random_sample((12, 8))) for _ in range(6)]
+    kwargs = dict(rank=2, n_iter_max=100, non_negative=True, random_state=1)
+    _, errors = constrained_parafac2(slices, return_errors=True, **kwargs)
+    parafac2_tensor, options_errors = constrained_parafac2(
+        slices,
+        return_errors=True,
+        adaptive_rho=True,
+        over_relaxation=1.5,
+        n_jobs=2,
+        **kwargs,
+    )
+    _, (A, _, C) = apply_parafac2_projections(parafac2_tensor)
+    assert_(tl.all(A >= 0) and tl.all(C >= 0))
+    assert_(abs(options_errors[-1] - errors[-1]) < 0.01)
+
+
+def test_constrained_parafac2_smoothness():
+    """Smoothness on the evolving mode reduces the roughness of the B_i"""
+    rng = tl.check_random_state(1234)
+    rank = 2
+    slices = [tl.tensor(rng.random_sample((20, 6))) for _ in range(5)]
+
+    def roughness(parafac2_tensor):
+        _, (_, B_list, _) = apply_parafac2_projections(parafac2_tensor)
+        return sum(
+            tl.norm(B_i[1:] - B_i[:-1]) ** 2 / tl.norm(B_i) ** 2 for B_i in B_list
+        )
+
+    unconstrained = constrained_parafac2(slices, rank, n_iter_max=50)
+    smooth = constrained_parafac2(slices, rank, n_iter_max=50, smoothness={1: 10.0})
+    assert_(roughness(smooth) < roughness(unconstrained))
+
+
+def test_constrained_parafac2_unimodality(monkeypatch):
+    """The constraints, registered ones included, hold on the result"""
+    # Registered constraints are only kept for this test
+    monkeypatch.setattr(proximal, "_CONSTRAINTS", dict(proximal._CONSTRAINTS))
+    proximal.register_constraint("box", lambda x, bounds: tl.clip(x, *bounds))
+    rng = tl.check_random_state(1234)
+    rank = 2
+    slices = [tl.tensor(rng.random_sample((12, 10))) for _ in range(6)]
+
+    parafac2_tensor = constrained_parafac2(
+        slices,
+        rank,
+        n_iter_max=100,
+        random_state=rng,
+        non_negative={0: True},
+        unimodality={2: True},
+        constraints={"box": {0: (0, 0.5)}},
+    )
+    _, (A, _, C) = apply_parafac2_projections(parafac2_tensor)
+    assert_(tl.all(A >= 0) and tl.all(A <= 0.5))
+    for column in tl.transpose(C):
+        peak = int(tl.argmax(column))
+        assert_(tl.all(column[1 : peak + 1] - column[:peak] >= 0))
+        assert_(tl.all(column[peak + 1 :] - column[peak:-1] <= 0))
+
+
+def test_coupled_evolving_factors():
+    """The ADMM with cached inverses converges to the PARAFAC2 least squares solution"""
+    rng = tl.check_random_state(1234)
+    rank, n_rows, n_slices = 2, 6, 5
+    blueprint = tl.tensor(rng.standard_normal((rank, rank)))
+    true_B = []
+    grams = []
+    for _ in range(n_slices):
+        projection, _ = tl.qr(tl.tensor(rng.standard_normal((n_rows, rank))))
+        true_B.append(tl.dot(projection, blueprint))
+        factor = tl.tensor(rng.standard_normal((n_rows, rank)))
+        grams.append(tl.dot(tl.transpose(factor), factor))
+    # The unconstrained minimizers satisfy the PARAFAC2 constraint
+    rhs = [tl.dot(B_i, gram) for B_i, gram in zip(true_B, grams)]
+    inverses, rho = _regularized_inverses(tl.stack(grams), 1)
+
+    factors_B = [
+        B_i + 0.1 * tl.tensor(rng.standard_normal((n_rows, rank))) for B_i in true_B
+    ]
+    aux = (
+        [tl.copy(B_i) for B_i in factors_B],
+        [tl.zeros((n_rows, rank)) for _ in factors_B],
+        [tl.copy(B_i) for B_i in factors_B],
+        [tl.zeros((n_rows, rank)) for _ in factors_B],
+    )
+    factors_B, (coupled, _, _, _), projections, estimated_blueprint = (
+        _coupled_evolving_factors(
+            rhs,
+            inverses,
+            rho,
+            factors_B,
+            aux,
+            blueprint + 0.1,
+            n_iter_max=2000,
+            tol=1e-12,
+            prox=None,
+        )
+    )
+    for B_i, coupled_i, projection, true_B_i in zip(
+        factors_B, coupled, projections, true_B
+    ):
+        assert_array_almost_equal(coupled_i, true_B_i, decimal=4)
+        assert_array_almost_equal(B_i, coupled_i, decimal=4)
+        assert_array_almost_equal(coupled_i, tl.dot(projection, estimated_blueprint))
+        assert_array_almost_equal(
+            tl.dot(tl.transpose(projection), projection), tl.eye(rank)
+        )
@@ -16,6 +16,7 @@ from .._nn_cp import (
     non_negative_parafac_hals,
     CP_NN,
     CP_NN_HALS,
+    _multiplicative_update,
 )
 from ...cp_tensor import cp_to_tensor
 from ...cp_tensor import cp_to_tensor
@@ -276,6 +277,48 @@ def test_parafac_linesearch():
     )
 
 
+def test_parafac_mixed_precision():
+    """Test that the mixed precision converges to the same solution"""
+    rng = tl.check_random_state(1234)
+    shape = (10, 11, 12)
+    tensor = tl.cp_to_tensor(random_cp(shape, 3, random_state=rng))
+    tensor = tensor + T.tensor(1e-4 * rng.standard_normal(shape))
+
+    kwargs = dict(rank=3, init="random", random_state=1, n_iter_max=500, tol=1e-12)
+    _, errors = parafac(tensor, return_errors=True, **kwargs)
+    cp_tensor, mixed_errors = parafac(
+        tensor, return_errors=True, precision="mixed", **kwargs
+    )
+    rec_error = T.norm(tensor - tl.cp_to_tensor(cp_tensor)) / T.norm(tensor)
+    assert_(T.abs(rec_error - errors[-1]) < 1e-8)
+    assert_(T.abs(mixed_errors[-1] - errors[-1]) < 1e-8)
+
+    with pytest.raises(ValueError):
+        parafac(tensor, 3, precision="half")
+
+
+def test_parafac_integer_tensor():
+    """Test for parafac on tensors whose dtype differs from that of the factors"""
+    rng = tl.check_random_state(1234)
+    tensor = T.tensor(rng.randint(0, 10, size=(4, 5, 6)), dtype=T.int64)
+    cp_tensor, errors = parafac(tensor, 2, init="svd", return_errors=True)
+    assert_(all(T.context(f)["dtype"] == T.float64 for f in cp_tensor.factors))
+    assert_(errors[-1] < 1)
+
+    # Float64 factors of a float32 tensor give a float64 MTTKRP
+    tensor = T.tensor(rng.random_sample((4, 5, 6)), dtype=T.float32)
+    cp_tensor = random_cp((4, 5, 6), 2, random_state=rng)
+    workspace = tl.backend.Workspace()
+    for mode in range(3):
+        mttkrp = tl.tenalg.unfolding_dot_khatri_rao(
+            tensor, cp_tensor, mode, workspace=workspace
+        )
+        assert_(T.context(mttkrp)["dtype"] == T.float64)
+        assert_array_almost_equal(
+            mttkrp, tl.tenalg.unfolding_dot_khatri_rao(tensor, cp_tensor, mode)
+        )
+
+
 @pytest.mark.parametrize("true_rank,rank", [(1, 1), (3, 3)])
 @pytest.mark.parametrize("init", ["svd", "random"])
 @pytest.mark.parametrize("normalize_factors", [False, True])
@@ -384,6 +427,58 @@ def test_non_negative_parafac(
         )
 
 
+@pytest.mark.parametrize("hals", [True, False])
+def test_non_negative_parafac_bpp(hals):
+    """Test for the block principal pivoting solver of non-negative PARAFAC"""
+    rng = tl.check_random_state(1234)
+    cp_factors = random_cp((10, 12, 8), rank=3, full=False, random_state=rng)
+    cp_factors = CPTensor((cp_factors[0], [tl.abs(f) for f in cp_factors[1]]))
+    tensor = tl.cp_to_tensor(cp_factors)
+
+    if hals:
+        func = non_negative_parafac_hals
+    else:
+        func = non_negative_parafac
+    nn_res, errors = func(
+        tensor,
+        rank=3,
+        n_iter_max=100,
+        tol=1.0e-10,
+        init="svd",
+        random_state=rng,
+        return_errors=True,
+        solver="bpp",
+    )
+    assert_(np.all(np.diff(errors) <= 1.0e-8))
+    for factor in nn_res.factors:
+        assert_(T.all(factor >= 0))
+    assert_(errors[-1] < 1.0e-3, "norm 2 of reconstruction higher than tol")
+
+    with pytest.raises(ValueError):
+        func(tensor, rank=3, solver="unknown")
+
+
+@pytest.mark.skipif(
+    tl.get_backend() not in ("numpy", "pytorch"),
+    reason="In-place multiplicative updates only with NumPy and PyTorch",
+)
+def test_multiplicative_update():
+    """The in-place multiplicative update matches the out-of-place one"""
+    rng = tl.check_random_state(1234)
+    factor = tl.tensor(rng.random_sample((7, 3)))
+    mttkrp = tl.tensor(rng.random_sample((7, 3)) - 0.2)
+    accum = tl.tensor(rng.random_sample((3, 3)))
+    epsilon = tl.eps(factor.dtype)
+    numerator = tl.clip(mttkrp, a_min=epsilon, a_max=None)
+    denominator = tl.clip(tl.dot(factor, accum), a_min=epsilon, a_max=None)
+    expected = factor * numerator / denominator
+
+    workspace = [tl.zeros((10, 3)) for _ in range(2)]
+    result = _multiplicative_update(factor, mttkrp, accum, epsilon, workspace)
+    assert_array_almost_equal(result, expected)
+    assert_array_almost_equal(factor, expected)
+
+
 def test_initialize_nn_cp():
     """Test that if we initialise with an existing init, then it isn't modified."""
     init = CPTensor([None, [-tl.ones((30, 3)), -tl.ones((20, 3)), -tl.ones((10, 3))]])
@@ -518,3 +613,35 @@ def test_randomised_parafac(monkeypatch):
         rank=3,
         n_samples=100,
     )
+
+
+@pytest.mark.parametrize("deterministic_threshold", [None, 1 / 100])
+def test_randomised_parafac_leverage(deterministic_threshold):
+    """Test for randomised_parafac with leverage score sampling"""
+    rng = tl.check_random_state(1234)
+    t_shape = (20, 20, 20)
+    rank = 4
+
+    # Factors with a few rows of much larger magnitude
+    weights, factors = random_cp(t_shape, rank, random_state=rng)
+    factors = [
+        f * T.tensor(np.where(rng.random_sample((T.shape(f)[0], 1)) < 0.1, 20, 1.0))
+        for f in factors
+    ]
+    tensor = cp_to_tensor((weights, factors))
+
+    cp_tensor = randomised_parafac(
+        tensor,
+        rank=rank,
+        n_samples=100,
+        n_iter_max=60,
+        tol=0,
+        random_state=rng,
+        sampling="leverage",
+        deterministic_threshold=deterministic_threshold,
+    )
+    error = float(T.norm(cp_to_tensor(cp_tensor) - tensor, 2) / T.norm(tensor, 2))
+    assert_(error < 0.1, msg=f"reconstruction error of {error} is too high")
+
+    with pytest.raises(ValueError):
+        randomised_parafac(tensor, rank=rank, n_samples=100, sampling="unknown")
@@ -17,6 +17,10 @@ from .._parafac2 import (
     parafac2,
     initialize_decomposition,
     _BroThesisLineSearch,
+    _bucket_tensor_slices,
+    _compute_projections,
+    _project_tensor_slices,
+    _parafac2_reconstruction_error,
 )
 from ...parafac2_tensor import Parafac2Tensor, parafac2_to_tensor, parafac2_to_slices
 from ...metrics.factors import congruence_coefficient
@@ -122,7 +126,11 @@ def test_parafac2(monkeypatch, normalize_factors, init, linesearch):
     )  # Check that the previous iteration didn't meet the criteria
 
     assert_class_wrapper_correctly_passes_arguments(
-        monkeypatch, parafac2, Parafac2, ignore_args={"return_errors"}, rank=3
+        monkeypatch,
+        parafac2,
+        Parafac2,
+        ignore_args={"return_errors", "compress"},
+        rank=3,
     )
 
 
@@ -360,6 +368,122 @@ def test_parafac2_slice_and_tensor_input():
     assert_array_almost_equal(slice_rec_tensor, tensor_rec_tensor)
 
 
+@pytest.mark.parametrize("max_padding", [0, 0.25, 10])
+def test_compute_projections_buckets(max_padding):
+    rng = tl.check_random_state(1234)
+    rank = 3
+    slices = [tl.tensor(rng.random_sample((5 + rng.randint(10), 8))) for _ in range(20)]
+    # A slice whose padded problem is rank deficient
+    slices[2] = tl.zeros((5, 8))
+    factors = [
+        tl.tensor(rng.random_sample((20, rank))),
+        tl.tensor(rng.random_sample((rank, rank))),
+        tl.tensor(rng.random_sample((8, rank))),
+    ]
+
+    buckets = _bucket_tensor_slices(slices, max_padding=max_padding)
+    assert_(sorted(i for indices, _, _ in buckets for i in indices) == list(range(20)))
+
+    projections = _compute_projections(slices, factors, "truncated_svd", buckets)
+    # Passing the SVD as a callable uses the per-slice computation
+    expected = _compute_projections(slices, factors, tl.truncated_svd)
+    for projection, expected_projection, tensor_slice in zip(
+        projections, expected, slices
+    ):
+        assert_(tl.shape(projection) == (tl.shape(tensor_slice)[0], rank))
+        assert_array_almost_equal(projection, expected_projection)
+
+    projected = _project_tensor_slices(slices, projections, buckets)
+    for i, (projection, tensor_slice) in enumerate(zip(projections, slices)):
+        assert_array_almost_equal(
+            projected[i], tl.dot(tl.transpose(projection), tensor_slice)
+        )
+
+
+@pytest.mark.parametrize("chunk_size, n_jobs", [(256, 1), (3, 1), (3, 4)])
+def test_parafac2_reconstruction_error(chunk_size, n_jobs):
+    rng = tl.check_random_state(1234)
+    rank = 3
+
+    random_parafac2_tensor = random_parafac2(
+        shapes=[(10 + rng.randint(5), 8) for _ in range(10)],
+        rank=rank,
+        random_state=rng,
+        dtype=tl.float64,
+    )
+    weights = tl.tensor(rng.random_sample(rank) + 0.5)
+    _, factors, projections = random_parafac2_tensor
+    decomposition = (weights, factors, projections)
+    slices = [
+        tensor_slice + tl.tensor(rng.random_sample(tl.shape(tensor_slice)))
+        for tensor_slice in parafac2_to_slices(decomposition)
+    ]
+
+    true_error = tl.sqrt(
+        sum(
+            tl.norm(tensor_slice - rec_slice) ** 2
+            for tensor_slice, rec_slice in zip(
+                slices, parafac2_to_slices(decomposition)
+            )
+        )
+    )
+    error = _parafac2_reconstruction_error(
+        slices, decomposition, chunk_size=chunk_size, n_jobs=n_jobs
+    )
+    assert_allclose(error, true_error)
+
+    projected_tensor = _project_tensor_slices(slices, projections)
+    error = _parafac2_reconstruction_error(
+        slices, decomposition, projected_tensor=projected_tensor
+    )
+    assert_allclose(error, true_error)
+
+
+def test_parafac2_compress():
+    rng = tl.check_random_state(1234)
+    rank = 3
+
+    random_parafac2_tensor = random_parafac2(
+        shapes=[(30 + rng.randint(5), 10) for _ in range(10)],
+        rank=rank,
+        random_state=rng,
+        dtype=tl.float64,
+    )
+    slices = parafac2_to_slices(random_parafac2_tensor)
+
+    rec, errors = parafac2(
+        slices, rank, init="svd", n_iter_max=5, linesearch=False, return_errors=True
+    )
+    compressed_rec, compressed_errors = parafac2(
+        slices,
+        rank,
+        init="svd",
+        n_iter_max=5,
+        linesearch=False,
+        return_errors=True,
+        compress=True,
+    )
+    for projection, compressed_projection in zip(rec[2], compressed_rec[2]):
+        assert_(tl.shape(projection) == tl.shape(compressed_projection))
+    assert_allclose(errors, compressed_errors)
+    for rec_slice, compressed_rec_slice in zip(
+        parafac2_to_slices(rec), parafac2_to_slices(compressed_rec)
+    ):
+        assert_array_almost_equal(rec_slice, compressed_rec_slice)
+
+    # The compressed data is reused by the class wrapper
+    pf2 = Parafac2(rank, init="svd", n_iter_max=5, compress=True)
+    pf2.fit_transform(slices)
+    compressed = pf2.compressed_
+    pf2.rank = 2
+    pf2.fit_transform(slices)
+    assert_(pf2.compressed_ is compressed)
+    assert_(tl.shape(pf2.decomposition_[1][0]) == (10, 2))
+
+    with pytest.raises(ValueError):
+        parafac2(slices, rank, compress=(compressed[0][:5], compressed[1][:5]))
+
+
 def test_parafac2_normalize_factors():
     rng = tl.check_random_state(1234)
     rank = 2  # Rank 2 so we only need to test rank of minimum and maximum
@@ -0,0 +1,80 @@
+import numpy as np
+
+import tensorly as tl
+from .._sampling import sample_indices, deterministic_indices, unique_indices
+from ...testing import assert_, assert_array_equal, assert_array_almost_equal
+
+
+def test_sample_indices():
+    """Test for sample_indices"""
+    rng = tl.check_random_state(1234)
+    shape = (3, 5, 4)
+    n_samples = 100000
+    probabilities = [
+        tl.tensor([0.1, 0.2, 0.7], dtype=tl.float64),
+        None,
+        tl.tensor([0.0, 0.5, 0.5, 0.0], dtype=tl.float64),
+    ]
+    indices = sample_indices(shape, n_samples, probabilities, random_state=rng)
+    assert_(indices.shape == (len(shape), n_samples))
+
+    # Empirical frequencies match the distributions
+    expected = [tl.to_numpy(probabilities[0]), np.ones(5) / 5, [0.0, 0.5, 0.5, 0.0]]
+    for mode_indices, size, mode_expected in zip(indices, shape, expected):
+        assert_(np.min(mode_indices) >= 0 and np.max(mode_indices) < size)
+        frequencies = np.bincount(mode_indices, minlength=size) / n_samples
+        assert_array_almost_equal(frequencies, mode_expected, decimal=2)
+
+    # Indices with a zero probability are never drawn
+    assert_(np.all(np.isin(indices[2], [1, 2])))
+
+    # Excluded multi-indices are never drawn
+    exclude = np.ravel_multi_index(([2, 2], [0, 1], [1, 2]), shape)
+    indices = sample_indices(
+        shape, 1000, probabilities, random_state=rng, exclude=exclude
+    )
+    assert_(indices.shape == (len(shape), 1000))
+    assert_(not np.any(np.isin(np.ravel_multi_index(tuple(indices), shape), exclude)))
+
+    # The samples follow the distribution conditioned on not being excluded
+    n_samples = 200000
+    indices = sample_indices(
+        shape, n_samples, probabilities, random_state=rng, exclude=exclude
+    )
+    expected = np.einsum("i,j,k->ijk", *expected).ravel()
+    expected[exclude] = 0
+    expected /= np.sum(expected)
+    frequencies = np.bincount(
+        np.ravel_multi_index(tuple(indices), shape), minlength=np.prod(shape)
+    )
+    assert_array_almost_equal(frequencies / n_samples, expected, decimal=2)
+
+    # Even when the excluded multi-indices hold almost all the mass
+    probabilities = [np.array([1 - 1e-12] + [1e-12 / 99] * 99)] * 3
+    indices = sample_indices(
+        (100, 100, 100), 1000, probabilities, random_state=rng, exclude=[0]
+    )
+    assert_(np.all(np.ravel_multi_index(tuple(indices), (100, 100, 100)) != 0))
+
+
+def test_deterministic_indices():
+    """Test for deterministic_indices"""
+    probabilities = [np.array([0.1, 0.2, 0.7]), np.array([0.5, 0.3, 0.2])]
+    indices, index_probabilities = deterministic_indices(probabilities, 0.1)
+
+    all_probabilities = np.outer(*probabilities)
+    expected = np.stack(np.nonzero(all_probabilities >= 0.1))
+    order = np.argsort(np.ravel_multi_index(tuple(indices), (3, 3)))
+    assert_array_equal(indices[:, order], expected)
+    assert_array_almost_equal(
+        index_probabilities[order], all_probabilities[all_probabilities >= 0.1]
+    )
+
+
+def test_unique_indices():
+    """Test for unique_indices"""
+    shape = (3, 4)
+    indices = np.array([[2, 0, 2, 1, 0], [1, 3, 1, 0, 3]])
+    unique, counts = unique_indices(indices, shape)
+    assert_array_equal(unique, [[0, 1, 2], [3, 0, 1]])
+    assert_array_equal(counts, [2, 1, 2])
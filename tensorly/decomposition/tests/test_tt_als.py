@@ -0,0 +1,100 @@
+import pytest
+import numpy as np
+
+import tensorly as tl
+from .._tt_als import (
+    tensor_train_als,
+    tensor_train_dmrg,
+    TensorTrainALS,
+    TensorTrainDMRG,
+)
+from ...random import random_tt
+from ...testing import (
+    assert_,
+    assert_equal,
+    assert_array_almost_equal,
+    assert_class_wrapper_correctly_passes_arguments,
+)
+
+
+@pytest.mark.parametrize(
+    "decomposition, DecompositionClass",
+    [(tensor_train_als, TensorTrainALS), (tensor_train_dmrg, TensorTrainDMRG)],
+)
+def test_tensor_train_als(decomposition, DecompositionClass, monkeypatch):
+    """Test for tensor_train_als and tensor_train_dmrg"""
+    rng = tl.check_random_state(1234)
+    shape, rank = (4, 5, 6, 3), (1, 3, 4, 2, 1)
+    tt_true = random_tt(shape, rank, random_state=rng)
+    tensor = tt_true.to_tensor()
+
+    # Exact recovery from a random initialization
+    tt, errors = decomposition(
+        tensor, rank, init="random", random_state=rng, return_errors=True
+    )
+    assert_equal(tt.rank, rank)
+    assert_array_almost_equal(tt.to_tensor(), tensor, decimal=5)
+    assert_(errors[-1] < 1e-5)
+
+    # The reported errors match the actual reconstruction error
+    noise = tl.tensor(rng.random_sample(shape))
+    noisy_tensor = tensor + 0.1 * tl.norm(tensor, 2) * noise / tl.norm(noise, 2)
+    tt, errors = decomposition(noisy_tensor, rank, return_errors=True)
+    rec_error = tl.norm(tt.to_tensor() - noisy_tensor, 2) / tl.norm(noisy_tensor, 2)
+    assert_array_almost_equal(errors[-1], rec_error)
+    for i in range(len(errors) - 1):
+        assert_(errors[i + 1] <= errors[i] + 1e-8)
+
+    # Refining an existing decomposition improves it
+    init = tl.decomposition.tensor_train(noisy_tensor, rank)
+    init_error = tl.norm(init.to_tensor() - noisy_tensor, 2)
+    tt = decomposition(noisy_tensor, rank, init=init)
+    assert_(tl.norm(tt.to_tensor() - noisy_tensor, 2) <= init_error * (1 + 1e-8))
+
+    # Tensors given in TT format
+    tt = decomposition(tt_true, rank, init="random", random_state=rng)
+    assert_array_almost_equal(tt.to_tensor(), tensor, decimal=5)
+
+    # Missing values
+    mask = tl.tensor(rng.random_sample(shape) > 0.2, dtype=tl.float64)
+    tt = decomposition(tensor * mask, rank, mask=mask, n_iter_max=200)
+    masked_init = tl.decomposition.tensor_train(tensor * mask, rank)
+    assert_(
+        tl.norm(tt.to_tensor() - tensor, 2)
+        < tl.norm(masked_init.to_tensor() - tensor, 2)
+    )
+
+    with pytest.raises(ValueError):
+        decomposition(tensor, rank, init="unknown")
+    with pytest.raises(ValueError):
+        decomposition(tt_true, rank, mask=mask)
+
+    assert_class_wrapper_correctly_passes_arguments(
+        monkeypatch,
+        decomposition,
+        DecompositionClass,
+        ignore_args={"return_errors"},
+        rank=3,
+    )
+
+
+def test_tensor_train_rank_adaptation():
+    """Test that DMRG grows the ranks and both methods can reduce them"""
+    rng = tl.check_random_state(1234)
+    shape, rank = (4, 5, 6, 3), (1, 3, 4, 2, 1)
+    tensor = random_tt(shape, rank, full=True, random_state=rng)
+
+    # DMRG increases the ranks of a rank-1 initialization up to the true ones
+    init = random_tt(shape, 1, random_state=rng)
+    tt = tensor_train_dmrg(tensor, 6, init=init, truncation_tol=1e-6)
+    assert_equal(tt.rank, rank)
+    assert_array_almost_equal(tt.to_tensor(), tensor, decimal=5)
+
+    # The rank is still bounded by the maximum rank
+    tt = tensor_train_dmrg(tensor, 2, init=init)
+    assert_(max(tt.rank) <= 2)
+
+    # ALS truncates overestimated ranks
+    tt = tensor_train_als(tensor, 6, truncation_tol=1e-6)
+    assert_equal(tt.rank, rank)
+    assert_array_almost_equal(tt.to_tensor(), tensor, decimal=5)
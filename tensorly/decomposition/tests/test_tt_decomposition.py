@@ -1,9 +1,12 @@
+import pytest
+
 import tensorly as tl
 from .._tt import tensor_train, tensor_train_matrix, TensorTrain, TensorTrainMatrix
 from ...tt_matrix import tt_matrix_to_tensor
 from ...random import random_tt
 from ...testing import (
     assert_,
+    assert_equal,
     assert_array_almost_equal,
     assert_class_wrapper_correctly_passes_arguments,
 )
@@ -77,10 +80,37 @@ def test_tensor_train(monkeypatch):
     assert_(error < tol, "norm 2 of reconstruction higher than tol")
 
     assert_class_wrapper_correctly_passes_arguments(
-        monkeypatch, tensor_train, TensorTrain, ignore_args={}, rank=3
+        monkeypatch, tensor_train, TensorTrain, ignore_args={"rank"}, rank=3
     )
 
 
+@pytest.mark.parametrize("svd", ["truncated_svd", "randomized_svd"])
+def test_tensor_train_tol(svd):
+    """Test for the rank-adaptive tensor_train (delta-truncation)"""
+    rng = tl.check_random_state(1234)
+    true_rank = (1, 2, 3, 2, 1)
+    tensor = random_tt((4, 5, 6, 4), rank=true_rank, full=True, random_state=rng)
+    noise = tl.tensor(rng.random_sample((4, 5, 6, 4)))
+    noisy_tensor = tensor + 1e-3 * tl.norm(tensor, 2) * noise / tl.norm(noise, 2)
+
+    # The error bound is guaranteed for any tolerance
+    for tol in [1e-1, 1e-2, 1e-4]:
+        tt = tensor_train(noisy_tensor, tol=tol, svd=svd)
+        error = tl.norm(tl.tt_to_tensor(tt) - noisy_tensor, 2)
+        assert_(error <= tol * tl.norm(noisy_tensor, 2) * (1 + 1e-6))
+
+    # Above the noise level, the ranks of the noiseless tensor are recovered
+    tt = tensor_train(noisy_tensor, tol=1e-2, svd=svd)
+    assert_equal(tt.rank, true_rank)
+
+    # rank still acts as an upper bound
+    tt = tensor_train(noisy_tensor, rank=(1, 2, 2, 2, 1), tol=1e-8, svd=svd)
+    assert_equal(tt.rank, (1, 2, 2, 2, 1))
+
+    with pytest.raises(ValueError):
+        tensor_train(noisy_tensor)
+
+
 def test_tensor_train_matrix(monkeypatch):
     """Test for tensor_train_matrix decomposition"""
     tensor = random_tt((2, 2, 2, 3, 3, 3), rank=2, full=True)
@@ -17,6 +17,7 @@ from ...testing import (
     assert_equal,
     assert_,
     assert_array_equal,
+    assert_array_almost_equal,
     assert_class_wrapper_correctly_passes_arguments,
 )
 
@@ -176,6 +177,36 @@ def test_masked_tucker():
     assert_(mask_err < 0.001, "norm 2 of reconstruction higher than 0.001")
 
 
+def test_tucker_mixed_precision():
+    """Test that the mixed precision converges to the same solution"""
+    rng = tl.check_random_state(1234)
+    shape = (10, 11, 12)
+    tensor = random_tucker(shape, (3, 4, 3), full=True, random_state=rng)
+    tensor = tensor + tl.tensor(1e-4 * rng.standard_normal(shape))
+
+    kwargs = dict(rank=(3, 4, 3), init="random", random_state=1, tol=1e-12)
+    _, errors = tucker(tensor, return_errors=True, **kwargs)
+    tucker_tensor, mixed_errors = tucker(
+        tensor, return_errors=True, precision="mixed", **kwargs
+    )
+    rec_error = tl.norm(tensor - tucker_to_tensor(tucker_tensor)) / tl.norm(tensor)
+    assert_(tl.abs(rec_error - errors[-1]) < 1e-8)
+    assert_(tl.abs(mixed_errors[-1] - errors[-1]) < 1e-8)
+
+    with pytest.raises(ValueError):
+        tucker(tensor, (3, 4, 3), precision="half")
+
+
+def test_tucker_integer_tensor():
+    """Test for tucker on tensors whose dtype differs from that of the factors"""
+    rng = tl.check_random_state(1234)
+    tensor = tl.tensor(rng.randint(0, 10, size=(4, 5, 6)), dtype=tl.int64)
+    core, factors = tucker(tensor, (2, 3, 2), init="svd")
+    assert_(tl.context(core)["dtype"] == tl.float64)
+    (core, factors), _ = partial_tucker(tensor, (2, 3), modes=[0, 1], init="random")
+    assert_(tl.context(core)["dtype"] == tl.float64)
+
+
 @pytest.mark.parametrize("init", ["svd", "random"])
 @pytest.mark.parametrize("hals", [False, True])
 def test_non_negative_tucker(init, hals, monkeypatch):
@@ -239,3 +270,43 @@ def test_non_negative_tucker(init, hals, monkeypatch):
             ignore_args={"return_errors"},
             rank=3,
         )
+
+
+def test_non_negative_tucker_hals_active_set():
+    """Test for non-negative Tucker HALS with the active set core update"""
+    rng = tl.check_random_state(1234)
+    core, factors = random_tucker(
+        (8, 7, 6), rank=[3, 2, 2], non_negative=True, random_state=rng
+    )
+    tensor = tucker_to_tensor((core, factors))
+    (nn_core, nn_factors), errors = non_negative_tucker_hals(
+        tensor,
+        rank=[3, 2, 2],
+        n_iter_max=20,
+        algorithm="active_set",
+        return_errors=True,
+    )
+    for factor in nn_factors:
+        assert_(tl.all(factor >= 0))
+    assert_(tl.all(nn_core >= 0))
+    assert_(errors[-1] < 0.1, "norm 2 of reconstruction error higher than tol")
+
+
+@pytest.mark.parametrize("algorithm", ["fista", "active_set"])
+def test_non_negative_tucker_hals_normalize_factors(algorithm):
+    """Test for non-negative Tucker HALS with normalized factors"""
+    rng = tl.check_random_state(1234)
+    tensor = tl.tensor(rng.random_sample((12, 13, 14)))
+    (nn_core, nn_factors), errors = non_negative_tucker_hals(
+        tensor,
+        rank=[3, 4, 5],
+        normalize_factors=True,
+        algorithm=algorithm,
+        return_errors=True,
+    )
+    for factor in nn_factors:
+        assert_(tl.all(factor >= 0))
+        assert_array_almost_equal(tl.norm(factor, axis=0), tl.ones(tl.shape(factor)[1]))
+    assert_(tl.all(nn_core >= 0))
+    assert_(errors[-1] <= errors[0])
+    assert_(errors[-1] < 0.6, "norm 2 of reconstruction error higher than tol")
@@ -1,4 +1,3 @@
-from scipy.optimize import linear_sum_assignment
 from .. import backend as T
 import numpy as np
 
@@ -34,6 +33,8 @@ def congruence_coefficient(matrix1, matrix2, absolute_value=True):
     congruence : float
     permutation : list
     """
+    from scipy.optimize import linear_sum_assignment
+
     if T.is_tensor(matrix1):
         matrix1 = [matrix1]
     if T.is_tensor(matrix2):
@@ -61,6 +62,7 @@ def congruence_coefficient(matrix1, matrix2, absolute_value=True):
     all_congruences = 1
     for congruence in all_congruences_list:
         all_congruences *= congruence
+
     row_ind, col_ind = linear_sum_assignment(
         -all_congruences
     )  # Use -corr because scipy didn't doesn't support maximising prior to v1.4
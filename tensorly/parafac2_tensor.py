@@ -1,5 +1,4 @@
-"""Core operations on PARAFAC2 tensors whose second mode evolve over their first.
-"""
+"""Core operations on PARAFAC2 tensors whose second mode evolve over their first."""
 
 # Authors: Marie Roald
 #          Yngve Mardal Moe
@@ -360,6 +359,34 @@ def parafac2_to_slices(parafac2_tensor, validate=True):
         P is the projection matrices and C is the last factor matrix of the
         Parafac2Tensor.
     """
+    return list(parafac2_iter_slices(parafac2_tensor, validate=validate))
+
+
+def parafac2_iter_slices(parafac2_tensor, validate=True):
+    r"""Iterate over the slices along the first mode of a PARAFAC2 tensor.
+
+    Lazy version of ``parafac2_to_slices``: the slices are constructed one at a time,
+    when requested, so that only one slice needs to be held in memory.
+
+    Parameters
+    ----------
+    parafac2_tensor : Parafac2Tensor - (weight, factors, projection_matrices)
+        * weights : 1D array of shape (rank, )
+            weights of the factors
+        * factors : List of factors of the PARAFAC2 decomposition
+            Contains the matrices :math:`A`, :math:`B` and :math:`C`
+        * projection_matrices : List of projection matrices used to create evolving
+            factors.
+    validate : bool, default is True
+        Whether to validate the PARAFAC2 tensor before constructing the slices.
+
+    Yields
+    ------
+    ndarray
+        The full slices, of shapes [P[i].shape[1], C.shape[1]], where
+        P is the projection matrices and C is the last factor matrix of the
+        Parafac2Tensor.
+    """
     if validate:
         _validate_parafac2_tensor(parafac2_tensor)
     weights, (A, B, C), projections = parafac2_tensor
@@ -369,7 +396,8 @@ def parafac2_to_slices(parafac2_tensor, validate=True):
 
     decomposition = weights, (A, B, C), projections
     I, _ = A.shape
-    return [parafac2_to_slice(decomposition, i, validate=False) for i in range(I)]
+    for i in range(I):
+        yield parafac2_to_slice(decomposition, i, validate=False)
 
 
 def parafac2_to_tensor(parafac2_tensor):
@@ -420,11 +448,12 @@ def parafac2_to_tensor(parafac2_tensor):
         Full constructed tensor. Uneven slices are padded with zeros.
     """
     _, (A, _, C), projections = parafac2_tensor
-    slices = parafac2_to_slices(parafac2_tensor)
     lengths = [projection.shape[0] for projection in projections]
 
-    tensor = T.zeros((A.shape[0], max(lengths), C.shape[0]), **T.context(slices[0]))
-    for i, (slice_, length) in enumerate(zip(slices, lengths)):
+    tensor = T.zeros((A.shape[0], max(lengths), C.shape[0]), **T.context(C))
+    for i, (slice_, length) in enumerate(
+        zip(parafac2_iter_slices(parafac2_tensor), lengths)
+    ):
         tensor = T.index_update(tensor, T.index[i, :length], slice_)
     return tensor
 
@@ -2,10 +2,35 @@ from tensorly import backend as T
 
 from .parafac2_tensor import Parafac2Tensor
 from .tenalg.svd import svd_interface
+from .utils.threads import thread_pool
+
+
+def _svd_compress_slice(tensor_slice, rank_limit, compression_threshold, svd):
+    n_rows, _ = T.shape(tensor_slice)
+
+    if n_rows <= rank_limit and not compression_threshold:
+        return tensor_slice, None
+
+    U, s, Vh = svd_interface(tensor_slice, n_eigenvecs=rank_limit, method=svd)
+
+    # Threshold SVD, keeping only singular values that satisfy s_i >= s_0 * epsilon
+    # where epsilon is the compression threshold
+    num_svds = len([s_i for s_i in s if s_i >= (s[0] * compression_threshold)])
+    U, s, Vh = U[:, :num_svds], s[:num_svds], Vh[:num_svds, :]
+
+    # Array broadcasting happens at the last dimension, since Vh is num_svds x n_cols
+    # we need to transpose it, multiply in the singular values and then transpose
+    # it again. This is equivalent to writing diag(s) @ Vh. If we skip the
+    # transposes, we would get Vh @ diag(s), which is wrong.
+    return T.transpose(s * T.transpose(Vh)), U
 
 
 def svd_compress_tensor_slices(
-    tensor_slices, compression_threshold=0.0, max_rank=None, svd="truncated_svd"
+    tensor_slices,
+    compression_threshold=0.0,
+    max_rank=None,
+    svd="truncated_svd",
+    n_jobs=1,
 ):
     r"""Compress data with the SVD for running PARAFAC2.
 
@@ -51,6 +76,10 @@ def svd_compress_tensor_slices(
         SVD solving.
     svd : str, default is 'truncated_svd'
         Function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
+    n_jobs : int, default is 1
+        Number of threads used to compute the SVDs of the slices, which run concurrently
+        as the backends release the GIL during the SVD, and share the thread budget of
+        ``tl.set_num_threads``. If 1, the slices are compressed sequentially.
 
     Returns
     -------
@@ -71,9 +100,6 @@ def svd_compress_tensor_slices(
            (ICDE) 2022 May 9 (pp. 2454-2467). IEEE.
 
     """
-    loading_matrices = [None for _ in tensor_slices]
-    score_matrices = [None for _ in tensor_slices]
-
     _, n_cols = T.shape(tensor_slices[0])
 
     if max_rank is not None:
@@ -81,26 +107,17 @@ def svd_compress_tensor_slices(
     else:
         rank_limit = n_cols
 
-    for i, tensor_slice in enumerate(tensor_slices):
-        n_rows, _ = T.shape(tensor_slice)
-
-        if n_rows <= rank_limit and not compression_threshold:
-            score_matrices[i] = tensor_slice
-            continue
+    def compress(tensor_slice):
+        return _svd_compress_slice(tensor_slice, rank_limit, compression_threshold, svd)
 
-        U, s, Vh = svd_interface(tensor_slice, n_eigenvecs=rank_limit, method=svd)
-
-        # Threshold SVD, keeping only singular values that satisfy s_i >= s_0 * epsilon
-        # where epsilon is the compression threshold
-        num_svds = len([s_i for s_i in s if s_i >= (s[0] * compression_threshold)])
-        U, s, Vh = U[:, :num_svds], s[:num_svds], Vh[:num_svds, :]
+    if n_jobs == 1:
+        compressed = [compress(tensor_slice) for tensor_slice in tensor_slices]
+    else:
+        with thread_pool(n_jobs) as executor:
+            compressed = list(executor.map(compress, tensor_slices))
 
-        # Array broadcasting happens at the last dimension, since Vh is num_svds x n_cols
-        # we need to transpose it, multiply in the singular values and then transpose
-        # it again. This is equivalent to writing diag(s) @ Vh. If we skip the
-        # transposes, we would get Vh @ diag(s), which is wrong.
-        score_matrices[i] = T.transpose(s * T.transpose(Vh))
-        loading_matrices[i] = U
+    score_matrices = [scores for scores, _ in compressed]
+    loading_matrices = [loadings for _, loadings in compressed]
 
     return score_matrices, loading_matrices
 
@@ -2,7 +2,7 @@ import tensorly as tl
 import numpy as np
 from ..base import unfold, vec_to_tensor
 from ..base import partial_tensor_to_vec, partial_unfold
-from ..tenalg import kronecker
+from ..tenalg import KroneckerOperator
 from ..tucker_tensor import tucker_to_tensor, tucker_to_vec
 from .. import backend as T
 
@@ -96,7 +96,8 @@ class TuckerRegressor:
                 phi = partial_tensor_to_vec(
                     T.dot(
                         partial_unfold(X, i),
-                        T.dot(kronecker(W, skip_matrix=i), T.transpose(unfold(G, i))),
+                        KroneckerOperator(W[:i] + W[i + 1 :])
+                        @ T.transpose(unfold(G, i)),
                     )
                 )
                 # Regress phi on y: we could call a package here, e.g. scikit-learn
@@ -109,7 +110,10 @@ class TuckerRegressor:
                 )
                 W[i] = W_i
 
-            phi = T.dot(partial_tensor_to_vec(X), kronecker(W))
+            # phi = X kronecker(W), computed without forming the Kronecker product
+            phi = T.transpose(
+                KroneckerOperator(W).T @ T.transpose(partial_tensor_to_vec(X))
+            )
             G = vec_to_tensor(
                 T.solve(
                     T.dot(T.transpose(phi), phi)
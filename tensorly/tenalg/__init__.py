@@ -10,6 +10,7 @@ import threading
 from ..backend import BackendManager, dynamically_dispatched_class_attribute
 from .base_tenalg import TenalgBackend
 from .svd import SVD_FUNS, svd_interface, truncated_svd
+from .kronecker_operator import KroneckerOperator
 
 
 class TenalgBackendManager(BackendManager):
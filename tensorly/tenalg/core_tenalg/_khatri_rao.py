@@ -91,18 +91,19 @@ def khatri_rao(matrices, weights=None, skip_matrix=None, mask=None):
                 f"Matrix {i} has {matrix.shape[1]} columns != {n_columns}."
             )
 
-    for i, e in enumerate(matrices[1:]):
-        if not i:
-            if weights is None:
-                res = matrices[0]
-            else:
-                res = matrices[0] * T.reshape(weights, (1, -1))
-        s1, s2 = T.shape(res)
-        s3, s4 = T.shape(e)
-
-        a = T.reshape(res, (s1, 1, s2))
-        b = T.reshape(e, (1, s3, s4))
-        res = T.reshape(a * b, (-1, n_columns))
+    with T.pinned() as backend:
+        for i, e in enumerate(matrices[1:]):
+            if not i:
+                if weights is None:
+                    res = matrices[0]
+                else:
+                    res = matrices[0] * backend.reshape(weights, (1, -1))
+            s1, s2 = backend.shape(res)
+            s3, s4 = backend.shape(e)
+
+            a = backend.reshape(res, (s1, 1, s2))
+            b = backend.reshape(e, (1, s3, s4))
+            res = backend.reshape(a * b, (-1, n_columns))
 
     m = T.reshape(mask, (-1, 1)) if mask is not None else 1
 
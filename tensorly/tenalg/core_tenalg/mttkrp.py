@@ -1,3 +1,5 @@
+from math import prod
+
 from .n_mode_product import multi_mode_dot
 from ._khatri_rao import khatri_rao
 from ... import backend as T
@@ -6,7 +8,7 @@ from ...base import unfold
 # Author: Jean Kossaifi
 
 
-def unfolding_dot_khatri_rao(tensor, cp_tensor, mode):
+def unfolding_dot_khatri_rao(tensor, cp_tensor, mode, workspace=None):
     """mode-n unfolding times khatri-rao product of factors
 
     Parameters
@@ -17,6 +19,9 @@ def unfolding_dot_khatri_rao(tensor, cp_tensor, mode):
         list of matrices of which to the khatri-rao product
     mode : int
         mode on which to unfold `tensor`
+    workspace : tl.backend.Workspace, optional
+        if given, the Khatri-Rao product is written in its buffers, and `tensor` is
+        not unfolded. The result is valid until the next call with that workspace
 
     Returns
     -------
@@ -45,12 +50,38 @@ def unfolding_dot_khatri_rao(tensor, cp_tensor, mode):
 
     """
     weights, factors = cp_tensor
-    kr_factors = khatri_rao(factors, weights=weights, skip_matrix=mode)
-    mttkrp = T.dot(unfold(tensor, mode), T.conj(kr_factors))
-    return mttkrp
+    if workspace is None or not workspace.supports_out(tensor):
+        kr_factors = khatri_rao(factors, weights=weights, skip_matrix=mode)
+        mttkrp = T.dot(unfold(tensor, mode), T.conj(kr_factors))
+        return mttkrp
+
+    # Conjugating the factors rather than their product avoids a large temporary
+    if weights is not None:
+        weights = T.conj(weights)
+    kr_factors = workspace.khatri_rao(
+        "khatri_rao", [T.conj(f) for f in factors], weights=weights, skip_matrix=mode
+    )
+    # The rows of the Khatri-Rao product are indexed by the modes before `mode`, then
+    # those after: viewing `tensor` as a stack of matrices avoids unfolding it
+    shape = T.shape(tensor)
+    n_before, n_after = prod(shape[:mode]), prod(shape[mode + 1 :])
+    if n_before == 1:
+        return workspace.matmul(
+            "mttkrp", T.reshape(tensor, (shape[mode], -1)), kr_factors
+        )
+    if n_after == 1:
+        return workspace.matmul(
+            "mttkrp", T.transpose(T.reshape(tensor, (-1, shape[mode]))), kr_factors
+        )
+    partial_mttkrps = workspace.matmul(
+        "partial_mttkrps",
+        T.reshape(tensor, (n_before, shape[mode], n_after)),
+        T.reshape(kr_factors, (n_before, n_after, -1)),
+    )
+    return T.sum(partial_mttkrps, axis=0)
 
 
-def unfolding_dot_khatri_rao_memory(tensor, cp_tensor, mode):
+def unfolding_dot_khatri_rao_memory(tensor, cp_tensor, mode, workspace=None):
     """mode-n unfolding times khatri-rao product of factors
 
     Parameters
@@ -61,6 +92,8 @@ def unfolding_dot_khatri_rao_memory(tensor, cp_tensor, mode):
         list of matrices of which to the khatri-rao product
     mode : int
         mode on which to unfold `tensor`
+    workspace : tl.backend.Workspace, optional
+        unused, for compatibility with `unfolding_dot_khatri_rao`
 
     Returns
     -------
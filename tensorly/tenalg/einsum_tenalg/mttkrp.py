@@ -3,7 +3,7 @@ import tensorly as tl
 # Author: Jean Kossaifi
 
 
-def unfolding_dot_khatri_rao(tensor, cp_tensor, mode):
+def unfolding_dot_khatri_rao(tensor, cp_tensor, mode, workspace=None):
     """mode-n unfolding times khatri-rao product of factors
 
     Parameters
@@ -14,6 +14,8 @@ def unfolding_dot_khatri_rao(tensor, cp_tensor, mode):
         list of matrices of which to the khatri-rao product
     mode : int
         mode on which to unfold `tensor`
+    workspace : tl.backend.Workspace, optional
+        unused, for compatibility with the core implementation
 
     Returns
     -------
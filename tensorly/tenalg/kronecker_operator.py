@@ -0,0 +1,148 @@
+"""
+Kronecker product of matrices as a linear operator, that is never formed explicitly.
+"""
+
+from math import prod
+
+import tensorly as tl
+from ..base import fold, unfold
+
+# License: BSD 3 clause
+
+
+class KroneckerOperator:
+    """Kronecker product of a list of matrices, applied without being formed
+
+    ``KroneckerOperator(matrices)`` represents ``tl.tenalg.kronecker(matrices)``:
+    its products with vectors and matrices are computed as successive mode products
+    on the tensorized vectors, so the memory needed is that of the factors,
+    ``sum(n_rows * n_columns)``, rather than ``prod(n_rows) * prod(n_columns)``.
+
+    Parameters
+    ----------
+    matrices : ndarray list
+        factors of the Kronecker product
+
+    Examples
+    --------
+    >>> import tensorly as tl
+    >>> from tensorly.tenalg import KroneckerOperator
+    >>> matrices = [tl.tensor([[2., 0.], [1., 1.]]), tl.eye(3)]
+    >>> operator = KroneckerOperator(matrices)
+    >>> operator.shape
+    (6, 6)
+    >>> vector = tl.ones(6)
+    >>> bool(tl.all(operator @ vector == tl.dot(tl.tenalg.kronecker(matrices), vector)))
+    True
+    """
+
+    # Makes NumPy defer ``ndarray @ KroneckerOperator`` to __rmatmul__
+    __array_ufunc__ = None
+
+    def __init__(self, matrices):
+        self.matrices = list(matrices)
+
+    @property
+    def row_shape(self):
+        """Number of rows of each factor"""
+        return tuple(tl.shape(matrix)[0] for matrix in self.matrices)
+
+    @property
+    def column_shape(self):
+        """Number of columns of each factor"""
+        return tuple(tl.shape(matrix)[1] for matrix in self.matrices)
+
+    @property
+    def shape(self):
+        return (prod(self.row_shape), prod(self.column_shape))
+
+    @property
+    def T(self):
+        """Transpose of the operator, the Kronecker product of the transposed factors"""
+        return KroneckerOperator([tl.transpose(matrix) for matrix in self.matrices])
+
+    def __repr__(self):
+        return f"KroneckerOperator of shape {self.shape} with factors of shapes {list(zip(self.row_shape, self.column_shape))}"
+
+    def _apply(self, functions, other, in_shape, out_shape):
+        """Applies functions[i] to the mode-i unfoldings of the tensorized `other`"""
+        is_vector = tl.ndim(other) == 1
+        tensor = tl.reshape(other, in_shape + ((1,) if is_vector else (-1,)))
+        for mode, function in enumerate(functions):
+            new_shape = list(tl.shape(tensor))
+            new_shape[mode] = out_shape[mode]
+            tensor = fold(function(unfold(tensor, mode)), mode, new_shape)
+        if is_vector:
+            return tl.reshape(tensor, (-1,))
+        return tl.reshape(tensor, (prod(out_shape), -1))
+
+    def __matmul__(self, other):
+        """Product with a vector of length ``shape[1]`` or a matrix with ``shape[1]`` rows"""
+        if isinstance(other, KroneckerOperator):
+            return KroneckerOperator(
+                [tl.dot(a, b) for a, b in zip(self.matrices, other.matrices)]
+            )
+        functions = [
+            lambda x, matrix=matrix: tl.dot(matrix, x) for matrix in self.matrices
+        ]
+        return self._apply(functions, other, self.column_shape, self.row_shape)
+
+    def __rmatmul__(self, other):
+        """Product of a vector or matrix with ``shape[0]`` columns with the operator"""
+        if tl.ndim(other) == 1:
+            return self.T @ other
+        return tl.transpose(self.T @ tl.transpose(other))
+
+    def solve(self, rhs):
+        """Solves ``self @ x = rhs`` with one solve per factor
+
+        The factors must be square and invertible.
+
+        Parameters
+        ----------
+        rhs : ndarray
+            vector of length ``shape[0]`` or matrix with ``shape[0]`` rows
+
+        Returns
+        -------
+        x : ndarray
+            of the same shape as `rhs`
+        """
+        functions = [
+            lambda x, matrix=matrix: tl.solve(matrix, x) for matrix in self.matrices
+        ]
+        return self._apply(functions, rhs, self.row_shape, self.column_shape)
+
+    def eigh(self):
+        """Eigendecomposition of an operator with symmetric factors
+
+        The eigenvalues are the Kronecker product of the eigenvalues of the factors, the
+        eigenvectors the Kronecker product of their eigenvectors.
+
+        Returns
+        -------
+        eigenvalues : 1D-array
+            of length ``shape[0]``, not sorted
+        eigenvectors : KroneckerOperator
+            whose columns are the eigenvectors
+        """
+        eigenvalues, eigenvectors = zip(*[tl.eigh(matrix) for matrix in self.matrices])
+        return _kronecker_vectors(eigenvalues), KroneckerOperator(eigenvectors)
+
+    def diag(self):
+        """Diagonal of the operator, the Kronecker product of the diagonals of the factors"""
+        return _kronecker_vectors([tl.diag(matrix) for matrix in self.matrices])
+
+    def to_tensor(self):
+        """Dense Kronecker product, as returned by `tensorly.tenalg.kronecker`"""
+        return tl.tenalg.kronecker(self.matrices)
+
+
+def _kronecker_vectors(vectors):
+    """Kronecker product of a list of vectors"""
+    result = vectors[0]
+    for vector in vectors[1:]:
+        result = tl.reshape(
+            tl.reshape(result, (-1, 1)) * tl.reshape(vector, (1, -1)), (-1,)
+        )
+    return result
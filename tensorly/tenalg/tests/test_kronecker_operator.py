@@ -0,0 +1,65 @@
+import numpy as np
+
+from .. import kronecker, KroneckerOperator
+from ...testing import assert_, assert_array_almost_equal
+import tensorly as tl
+
+
+def test_kronecker_operator():
+    """Test for the products of KroneckerOperator"""
+    rng = tl.check_random_state(1234)
+    matrices = [
+        tl.tensor(rng.random_sample((3, 4))),
+        tl.tensor(rng.random_sample((2, 2))),
+        tl.tensor(rng.random_sample((5, 3))),
+    ]
+    operator = KroneckerOperator(matrices)
+    dense = kronecker(matrices)
+    assert_(operator.shape == tl.shape(dense))
+    assert_array_almost_equal(operator.to_tensor(), dense)
+
+    vector = tl.tensor(rng.random_sample(24))
+    assert_array_almost_equal(operator @ vector, tl.dot(dense, vector))
+    matrix = tl.tensor(rng.random_sample((24, 7)))
+    assert_array_almost_equal(operator @ matrix, tl.dot(dense, matrix))
+
+    # Transpose and products on the left
+    assert_array_almost_equal(operator.T.to_tensor(), tl.transpose(dense))
+    matrix = tl.tensor(rng.random_sample((7, 30)))
+    assert_array_almost_equal(operator.__rmatmul__(matrix), tl.dot(matrix, dense))
+
+    # Product of two Kronecker operators
+    other = KroneckerOperator([tl.transpose(m) for m in matrices])
+    assert_array_almost_equal(
+        (other @ operator).to_tensor(), tl.dot(tl.transpose(dense), dense)
+    )
+
+
+def test_kronecker_operator_square():
+    """Test for solve, eigh and diag of KroneckerOperator"""
+    rng = tl.check_random_state(1234)
+    matrices = []
+    for size in [3, 2, 4]:
+        matrix = tl.tensor(rng.random_sample((size, size)))
+        matrices.append(tl.dot(matrix, tl.transpose(matrix)) + tl.eye(size))
+    operator = KroneckerOperator(matrices)
+    dense = kronecker(matrices)
+
+    assert_array_almost_equal(operator.diag(), tl.diag(dense))
+
+    rhs = tl.tensor(rng.random_sample(24))
+    assert_array_almost_equal(operator.solve(rhs), tl.solve(dense, rhs))
+    rhs = tl.tensor(rng.random_sample((24, 3)))
+    assert_array_almost_equal(operator.solve(rhs), tl.solve(dense, rhs))
+
+    eigenvalues, eigenvectors = operator.eigh()
+    eigenvectors = eigenvectors.to_tensor()
+    assert_array_almost_equal(
+        tl.dot(
+            eigenvectors * tl.reshape(eigenvalues, (1, -1)), tl.transpose(eigenvectors)
+        ),
+        dense,
+    )
+    assert_array_almost_equal(
+        np.sort(tl.to_numpy(eigenvalues)), np.linalg.eigvalsh(tl.to_numpy(dense))
+    )
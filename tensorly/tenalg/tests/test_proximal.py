@@ -6,6 +6,7 @@ from ..proximal import (
     smoothness_prox,
     soft_thresholding,
     hals_nnls,
+    bpp_nnls,
     fista,
     active_set_nnls,
     procrustes,
@@ -18,9 +19,14 @@ from ..proximal import (
     l2_prox,
     l2_square_prox,
     admm,
+    proximal_operator,
+    validate_constraints,
+    register_constraint,
 )
+from .. import proximal
 from ...testing import assert_, assert_array_equal, assert_array_almost_equal
 from tensorly import tensor_to_vec, truncated_svd
+from tensorly.tenalg import KroneckerOperator
 import pytest
 import tensorly as tl
 
@@ -57,6 +63,17 @@ def test_hard_thresholding():
     # Check that we did not change the original tensor
     assert_array_equal(copy_tensor, tensor)
 
+    # Extreme numbers of non-zeros
+    assert_array_equal(hard_thresholding(tensor, 0), T.zeros((3, 3)))
+    assert_array_equal(hard_thresholding(tensor, 9), tensor)
+
+    # The largest entries are kept, for a random tensor
+    rng = tl.check_random_state(1234)
+    tensor = T.tensor(rng.standard_normal((20, 30)))
+    res = hard_thresholding(tensor, 50)
+    assert_(int(T.sum(res != 0)) == 50)
+    assert_(T.min(T.abs(res[res != 0])) >= T.max(T.abs(tensor[res == 0])))
+
 
 def test_soft_sparsity():
     """Test for soft_sparsity operator"""
@@ -81,6 +98,12 @@ def test_simplex():
     true_res = T.tensor([[0.23, 0.25, 0], [0.33, 0.75, 0.55], [0.43, 0, 0.45]])
     assert_array_almost_equal(true_res, res, decimal=2)
 
+    # Columns of a random tensor are projected on the simplex
+    tensor = T.tensor(np.random.standard_normal((50, 40)))
+    res = simplex_prox(tensor, 2)
+    assert_(T.all(res >= 0))
+    assert_array_almost_equal(T.sum(res, axis=0), 2 * T.ones(40))
+
 
 def test_normalized_sparsity():
     """Test for normalized_sparsity operator"""
@@ -100,6 +123,13 @@ def test_monotonicity():
     tensor_monoton = monotonicity_prox(tensor, decreasing=True)
     assert_(np.all(np.diff(tensor_monoton, axis=0) <= 0))
 
+    # Isotonic regression: the violators are pooled into their mean
+    tensor = T.tensor([[1, 3], [3, 2], [2, 1], [4, 0], [0, 5]], dtype=tl.float32)
+    true_res = T.tensor(
+        [[1, 1.5], [2.25, 1.5], [2.25, 1.5], [2.25, 1.5], [2.25, 5]], dtype=tl.float32
+    )
+    assert_array_almost_equal(monotonicity_prox(tensor), true_res)
+
 
 def test_unimodality():
     """Test for unimdality operator"""
@@ -119,6 +149,33 @@ def test_unimodality():
                 np.all(np.diff(tensor_unimodal[int(max_location) :, i], axis=0) <= 0)
             )
 
+    # The projection is the best increasing fit of a prefix followed by
+    # the best decreasing fit of the suffix
+    tensor = T.tensor(np.random.rand(12, 3))
+    tensor_unimodal = unimodality_prox(tensor)
+    for i in range(3):
+        column = tensor[:, i]
+        errors = []
+        for split in range(13):
+            fit = T.concatenate(
+                [
+                    (
+                        T.reshape(monotonicity_prox(column[:split]), (-1,))
+                        if split
+                        else column[:0]
+                    ),
+                    (
+                        T.reshape(
+                            monotonicity_prox(column[split:], decreasing=True), (-1,)
+                        )
+                        if split < 12
+                        else column[:0]
+                    ),
+                ]
+            )
+            errors.append(T.norm(fit - column))
+        assert_array_almost_equal(T.norm(tensor_unimodal[:, i] - column), min(errors))
+
 
 def test_l2_prox():
     """Test for l2 prox operator"""
@@ -213,6 +270,81 @@ def test_hals_nnls():
     assert_array_almost_equal(true_res, x_hals, decimal=2)
 
 
+@pytest.mark.parametrize("sparsity_coefficient", [None, 0.1])
+def test_hals_nnls_in_place(monkeypatch, sparsity_coefficient):
+    """The in-place update of mutable backends matches the functional update"""
+    rng = tl.check_random_state(1234)
+    a = T.tensor(rng.random_sample((30, 8)))
+    b = T.tensor(rng.random_sample((30, 12)))
+    atb = T.dot(T.transpose(a), b)
+    ata = T.dot(T.transpose(a), a)
+    init = T.tensor(rng.random_sample((8, 12)))
+
+    results = []
+    for mutable_backends in [(), (T.get_backend(),)]:
+        monkeypatch.setattr(
+            "tensorly.tenalg.proximal._MUTABLE_BACKENDS", mutable_backends
+        )
+        if T.get_backend() in ("jax", "tensorflow", "paddle") and mutable_backends:
+            continue
+        x, rec_error, iteration, _ = hals_nnls(
+            atb,
+            ata,
+            T.copy(init),
+            n_iter_max=20,
+            sparsity_coefficient=sparsity_coefficient,
+        )
+        assert_(T.all(x >= 0))
+        results.append((x, rec_error, iteration))
+
+    for x, rec_error, iteration in results[1:]:
+        assert_array_almost_equal(x, results[0][0])
+        assert_array_almost_equal(rec_error, results[0][1])
+        assert_(iteration == results[0][2])
+
+
+def test_hals_nnls_complexity_ratio():
+    """The number of sweeps is bounded by the complexity ratio given by the caller"""
+    rng = tl.check_random_state(1234)
+    a = T.tensor(rng.random_sample((30, 8)))
+    b = T.tensor(rng.random_sample((30, 12)))
+    atb = T.dot(T.transpose(a), b)
+    ata = T.dot(T.transpose(a), a)
+
+    for complexity_ratio, alpha in [(0, 0.5), (10, 0.5), (10, 0.1)]:
+        _, _, iteration, ratio = hals_nnls(
+            atb, ata, tol=0, complexity_ratio=complexity_ratio, alpha=alpha
+        )
+        assert_(ratio == complexity_ratio)
+        assert_(iteration <= 2 + alpha * complexity_ratio)
+
+    # Loose relative progress stops earlier than a tight one
+    n_iterations = [
+        hals_nnls(atb, ata, tol=tol, complexity_ratio=1000)[2] for tol in [1e-1, 1e-8]
+    ]
+    assert_(n_iterations[0] < n_iterations[1])
+
+
+def test_bpp_nnls():
+    """Test for bpp_nnls operator"""
+    rng = tl.check_random_state(1234)
+    a = T.tensor(rng.random_sample((20, 10)))
+    true_res = T.tensor(rng.random_sample((10, 30)))
+    atb = T.dot(T.transpose(a), T.dot(a, true_res))
+    ata = T.dot(T.transpose(a), a)
+    assert_array_almost_equal(true_res, bpp_nnls(atb, ata))
+
+    # KKT conditions of a problem with active constraints, with and without warm start
+    b = T.tensor(rng.standard_normal((20, 30)))
+    atb = T.dot(T.transpose(a), b)
+    for init in [None, T.tensor(rng.random_sample((10, 30)))]:
+        x = bpp_nnls(atb, ata, V=init)
+        gradient = T.dot(ata, x) - atb
+        assert_(T.all(x >= 0))
+        assert_(T.min(gradient) > -1e-8)
+        assert_array_almost_equal(x * gradient, T.zeros((10, 30)))
+
+
 def test_fista():
     """Test for fista operator"""
     a = T.tensor(np.random.rand(20, 10))
@@ -223,6 +355,19 @@ def test_fista():
     x_fista = fista(atb, ata, tol=10e-16, n_iter_max=5000)
     assert_array_almost_equal(true_res, x_fista, decimal=2)
 
+    # Kronecker structured Gram matrix
+    rng = tl.check_random_state(1234)
+    grams = []
+    for n_rows, n_columns in [(8, 3), (7, 4)]:
+        a = T.tensor(rng.random_sample((n_rows, n_columns)))
+        grams.append(T.dot(T.transpose(a), a))
+    true_res = T.tensor(rng.random_sample((3, 4)))
+    atb = tl.tenalg.multi_mode_dot(true_res, grams)
+    x_list = fista(atb, grams, tol=10e-16, n_iter_max=5000)
+    x_operator = fista(atb, KroneckerOperator(grams), tol=10e-16, n_iter_max=5000)
+    assert_array_almost_equal(true_res, x_list, decimal=2)
+    assert_array_almost_equal(x_list, x_operator)
+
 
 def test_admm():
     """Test for admm operator"""
@@ -236,6 +381,128 @@ def test_admm():
     x_admm, _, _ = admm(T.transpose(atb), T.transpose(ata), x=x_init, dual_var=dual)
     assert_array_almost_equal(true_res, T.transpose(x_admm), decimal=2)
 
+    # Constrained problem, with and without adaptive rho and over-relaxation
+    rng = tl.check_random_state(1234)
+    a = T.tensor(rng.random_sample((30, 5)))
+    b = T.tensor(rng.standard_normal((30, 4)))
+    atb = T.dot(T.transpose(a), b)
+    ata = T.dot(T.transpose(a), a)
+    true_res = T.transpose(bpp_nnls(atb, ata))
+    for adaptive_rho, over_relaxation in [(False, 1.0), (True, 1.0), (True, 1.6)]:
+        x_admm, _, _ = admm(
+            T.transpose(atb),
+            T.transpose(ata),
+            x=T.zeros((4, 5)),
+            dual_var=T.zeros((4, 5)),
+            n_iter_max=2000,
+            n_const=2,
+            order=1,
+            non_negative=True,
+            tol=1e-8,
+            adaptive_rho=adaptive_rho,
+            over_relaxation=over_relaxation,
+        )
+        assert_array_almost_equal(true_res, x_admm, decimal=4)
+
+
+@pytest.mark.parametrize("n_jobs", [2, 3])
+def test_row_blocks(n_jobs):
+    """Test for the parallel updates of blocks of rows of the nnls and admm solvers"""
+    rng = tl.check_random_state(1234)
+    a = T.tensor(rng.random_sample((30, 4)))
+    b = T.tensor(rng.random_sample((30, 11)))
+    atb = T.dot(T.transpose(a), b)
+    ata = T.dot(T.transpose(a), a)
+
+    assert_array_almost_equal(bpp_nnls(atb, ata, n_jobs=n_jobs), bpp_nnls(atb, ata))
+    assert_array_almost_equal(
+        hals_nnls(atb, ata, n_jobs=n_jobs, exact=True)[0],
+        hals_nnls(atb, ata, exact=True)[0],
+    )
+
+    # Without early stopping, the blocks follow the same iterations
+    for constraint in [dict(non_negative=True), dict(simplex=1)]:
+        results = [
+            admm(
+                T.transpose(atb),
+                ata,
+                x=T.zeros((11, 4)),
+                dual_var=T.zeros((11, 4)),
+                n_iter_max=50,
+                n_const=1,
+                order=0,
+                tol=0,
+                n_jobs=jobs,
+                **constraint,
+            )
+            for jobs in [1, n_jobs]
+        ]
+        for block_result, result in zip(*results):
+            assert_array_almost_equal(block_result, result)
+
+
+def test_proximal_operator(monkeypatch):
+    """Test for proximal_operator with several and registered constraints"""
+    # Registered constraints are only kept for this test
+    monkeypatch.setattr(proximal, "_CONSTRAINTS", dict(proximal._CONSTRAINTS))
+    rng = tl.check_random_state(1234)
+    tensor = T.tensor(rng.standard_normal((10, 3)))
+
+    assert_array_equal(
+        proximal_operator(tensor, non_negative=True), T.clip(tensor, 0, T.max(tensor))
+    )
+    assert_array_equal(
+        proximal_operator(tensor, non_negative={1: True}, n_const=2), tensor
+    )
+
+    # The proximal operator of the sum of two convex functions
+    assert_(
+        validate_constraints(non_negative=True, l1_reg=0.5)
+        == (("non_negative", "l1_reg"), (None, 0.5))
+    )
+    assert_array_almost_equal(
+        proximal_operator(tensor, non_negative=True, l1_reg=0.5),
+        T.clip(tensor - 0.5, 0, None),
+    )
+
+    # The projection on the intersection of convex sets
+    register_constraint(
+        "l2_ball", lambda x, radius: x * radius / max(radius, T.norm(x))
+    )
+    register_constraint("box", lambda x, bounds: T.clip(x, *bounds))
+    projection = proximal_operator(
+        tensor, non_negative=True, constraints={"l2_ball": 1.0}
+    )
+    clipped = T.clip(tensor, 0, None)
+    assert_array_almost_equal(projection, clipped / T.norm(clipped))
+    assert_array_almost_equal(
+        proximal_operator(tensor, constraints={"box": {0: (-1, 1)}}, n_const=2),
+        T.clip(tensor, -1, 1),
+    )
+    assert_array_equal(
+        proximal_operator(
+            tensor, constraints={"box": {0: (-1, 1)}}, n_const=2, order=1
+        ),
+        tensor,
+    )
+
+    with pytest.raises(ValueError):
+        proximal_operator(tensor, constraints={"unknown": 1.0})
+
+    # Any number of convex projections are composed
+    projection = proximal_operator(
+        tensor, non_negative=True, simplex=1.0, monotonicity=True
+    )
+    assert_(T.all(projection >= -1e-6))
+    assert_array_almost_equal(T.sum(projection, axis=0), T.ones(3), decimal=3)
+    # But not more than two other convex functions, nor non-convex constraints
+    with pytest.raises(ValueError):
+        proximal_operator(tensor, l1_reg=0.1, l2_reg=0.1, l2_square_reg=0.1)
+    with pytest.raises(ValueError):
+        proximal_operator(tensor, non_negative=True, hard_sparsity=5)
+    with pytest.raises(ValueError):
+        proximal_operator(tensor, unimodality=True, constraints={"l2_ball": 1.0})
+
 
 @skip_tensorflow
 def test_active_set_nnls():
@@ -248,3 +515,14 @@ def test_active_set_nnls():
     x_as = active_set_nnls(tensor_to_vec(atb), ata)
     x_as = T.reshape(x_as, T.shape(atb))
     assert_array_almost_equal(true_res, x_as, decimal=2)
+
+    # Kronecker structured Gram matrix, given by its factors
+    rng = tl.check_random_state(1234)
+    grams = []
+    for n_rows, n_columns in [(8, 3), (7, 4), (6, 2)]:
+        a = T.tensor(rng.random_sample((n_rows, n_columns)))
+        grams.append(T.dot(T.transpose(a), a))
+    utm = T.tensor(rng.standard_normal(24))
+    x_dense = active_set_nnls(utm, tl.tenalg.kronecker(grams))
+    x_structured = active_set_nnls(utm, grams)
+    assert_array_almost_equal(x_dense, x_structured)
@@ -146,6 +146,94 @@ def test_set_backend_local_threadsafe_paddle():
         assert executor.submit(tl.get_backend).result() == global_default
 
 
+def test_pinned_backend():
+    backend_name = tl.get_backend()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with tl.backend.pinned() as backend:
+            assert backend is tl.backend.current_backend()
+            assert backend.backend_name == backend_name
+
+            # Nothing changes for the other threads, nor for the dynamic dispatch
+            with tl.backend_context("numpy", local_threadsafe=True):
+                assert backend.backend_name == backend_name
+                assert tl.get_backend() == "numpy"
+            assert executor.submit(tl.get_backend).result() == backend_name
+
+            tensor = backend.tensor([1.0, 2.0, 3.0])
+            assert_array_equal(backend.dot(tensor, tensor), tl.dot(tensor, tensor))
+        assert tl.get_backend() == backend_name
+
+
+def test_workspace():
+    rng = tl.check_random_state(1234)
+    matrices = [tl.tensor(rng.random_sample((n, 3))) for n in (4, 5, 6)]
+    weights = tl.tensor(rng.random_sample(3))
+    tensor = tl.tensor(rng.random_sample((4, 5, 6)))
+    workspace = tl.backend.Workspace()
+
+    for _ in range(2):
+        for skip in [None, 0, 1, 2]:
+            assert_array_almost_equal(
+                workspace.khatri_rao("kr", matrices, weights=weights, skip_matrix=skip),
+                tl.tenalg.khatri_rao(matrices, weights=weights, skip_matrix=skip),
+            )
+        for mode in range(3):
+            assert_array_equal(
+                workspace.unfold("unfolding", tensor, mode), tl.unfold(tensor, mode)
+            )
+            matrix = tl.transpose(matrices[mode])
+            assert_array_almost_equal(
+                workspace.mode_dot("mode_dot", tensor, matrix, mode),
+                tl.tenalg.mode_dot(tensor, matrix, mode),
+            )
+            mttkrp = tl.tenalg.unfolding_dot_khatri_rao(
+                tensor, (weights, matrices), mode, workspace=workspace
+            )
+            assert_array_almost_equal(
+                mttkrp,
+                tl.tenalg.unfolding_dot_khatri_rao(tensor, (weights, matrices), mode),
+            )
+
+    a, b = matrices[0], tl.reshape(weights, (1, -1))
+    assert_array_almost_equal(
+        workspace.matmul("matmul", a, tl.transpose(a)), tl.dot(a, tl.transpose(a))
+    )
+    assert_array_almost_equal(workspace.add("op", a, b), a + b)
+    assert_array_almost_equal(workspace.subtract("op", a, b), a - b)
+    assert_array_almost_equal(workspace.multiply("op", a, 2.0), a * 2.0)
+    assert_array_almost_equal(workspace.divide("op", a, b), a / b)
+
+    # Operands of different dtypes give a result of the promoted dtype
+    integers = tl.tensor(rng.randint(0, 10, size=(4, 3)), dtype=tl.int64)
+    for result, expected in [
+        (
+            workspace.matmul("matmul", integers, tl.transpose(a)),
+            tl.dot(integers, tl.transpose(a)),
+        ),
+        (
+            workspace.mode_dot("mode_dot", integers, tl.transpose(a), 0),
+            tl.tenalg.mode_dot(integers, tl.transpose(a), 0),
+        ),
+        (workspace.multiply("op", integers, 0.5), integers * 0.5),
+        (workspace.divide("op", integers, 2), integers / 2),
+        (workspace.add("op", integers, a), integers + a),
+    ]:
+        assert_(tl.context(result)["dtype"] == tl.float64)
+        assert_array_almost_equal(result, expected)
+    assert_array_almost_equal(
+        workspace.khatri_rao("kr", [integers, a]), tl.tenalg.khatri_rao([integers, a])
+    )
+
+    # Buffers are only reallocated when they are too small
+    if workspace.supports_out(a):
+        buffer = workspace.get("buffer", (4, 5), **tl.context(a))
+        buffer[...] = 1.0
+        assert_array_equal(workspace.get("buffer", (2, 3), **tl.context(a)), 1.0)
+        workspace.clear()
+        assert_array_equal(workspace.get("buffer", (2, 3), **tl.context(a)), 0.0)
+
+
 def test_backend_and_tensorly_module_attributes():
     for dtype in ["int32", "int64", "float32", "float64"]:
         assert dtype in dir(tl)
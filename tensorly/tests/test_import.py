@@ -0,0 +1,116 @@
+import os
+import subprocess
+import sys
+
+import tensorly as tl
+from ..testing import assert_
+
+
+def _run_python(*args):
+    """Runs a new interpreter with the NumPy backend, and returns what it prints"""
+    env = dict(
+        os.environ,
+        TENSORLY_BACKEND="numpy",
+        PYTHONPATH=os.path.dirname(os.path.dirname(tl.__file__)),
+    )
+    result = subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout, result.stderr
+
+
+# Attributes of the tensorly namespace that are not dispatched to the backend
+PUBLIC_NAMES = [
+    "SVD_FUNS", "_factorized_tensor", "backend", "base", "cp_mode_dot", "cp_norm",
+    "cp_normalize", "cp_tensor", "cp_to_tensor", "cp_to_unfolded", "cp_to_vec",
+    "datasets", "decomposition", "fold", "get_backend", "metrics", "pad_tt_rank",
+    "parafac2_tensor", "partial_fold", "partial_tensor_to_vec", "partial_unfold",
+    "partial_vec_to_tensor", "plugins", "random", "regression", "set_backend",
+    "svd_interface", "tenalg", "tensor_to_vec", "tr_tensor", "tr_to_tensor",
+    "tr_to_unfolded", "tr_to_vec", "truncated_svd", "tt_matrix", "tt_matrix_to_matrix",
+    "tt_matrix_to_tensor", "tt_matrix_to_unfolded", "tt_matrix_to_vec", "tt_tensor",
+    "tt_to_tensor", "tt_to_unfolded", "tt_to_vec", "tucker_mode_dot", "tucker_tensor",
+    "tucker_to_tensor", "tucker_to_unfolded", "tucker_to_vec", "unfold",
+    "validate_cp_rank", "validate_tr_rank", "validate_tt_matrix_rank",
+    "validate_tt_rank", "validate_tucker_rank", "vec_to_tensor",
+]  # fmt: skip
+
+# Budget of `import tensorly`: the only modules of TensorLy it loads, and the only
+# packages it loads that are not part of the standard library
+IMPORTED_MODULES = {
+    "tensorly",
+    "tensorly.backend",
+    "tensorly.backend.core",
+    "tensorly.backend.numpy_backend",
+    "tensorly.backend.workspace",
+    "tensorly.base",
+    "tensorly.utils",
+    "tensorly.utils.deprecation",
+    "tensorly.utils.threads",
+}
+IMPORTED_PACKAGES = {"numpy", "tensorly"}
+
+
+def test_lazy_imports():
+    """import tensorly doesn't load scipy nor the submodules that are not needed"""
+    stdout, _ = _run_python(
+        "-c", "import sys, tensorly; print(' '.join(sorted(sys.modules)))"
+    )
+    modules = stdout.split()
+    for name in ["scipy", "tensorly.decomposition", "tensorly.datasets"]:
+        assert_(name not in modules, f"{name} is imported by `import tensorly`")
+
+    # The public API is unchanged
+    stdout, _ = _run_python(
+        "-c",
+        "import tensorly as tl; from tensorly import cp_to_tensor, SVD_FUNS; "
+        "print(tl.decomposition.parafac.__name__, tl.tenalg.khatri_rao.__name__)",
+    )
+    assert_(stdout.split() == ["parafac", "khatri_rao"])
+
+
+def test_namespace():
+    """Every attribute of the tensorly namespace resolves in a fresh interpreter"""
+    # Each name must resolve by itself, not because accessing another name imported
+    # its module: they are all checked before any of them is accessed
+    stdout, _ = _run_python(
+        "-c",
+        "import sys, tensorly as tl\n"
+        f"names = {PUBLIC_NAMES!r} + tl.backend.get_backend_dir()\n"
+        "resolvable = set(vars(tl)) | set(tl._LAZY_SUBMODULES) | set(tl._LAZY_MODULE_OF)"
+        " | set(dir(tl.backend))\n"
+        "missing = [n for n in names if n not in resolvable]\n"
+        "missing += [n for n in names if not hasattr(tl, n)]\n"
+        "print(' '.join(missing))",
+    )
+    assert_(not stdout.split(), f"tensorly has no attributes {stdout.split()}")
+
+
+def test_import_budget():
+    """`import tensorly` only loads the modules it needs
+
+    A deterministic counterpart of timing the import, see `make importtime`.
+    """
+    stdout, _ = _run_python(
+        "-c",
+        "import sys, sysconfig\n"
+        "before = set(sys.modules)\n"
+        "import tensorly\n"
+        "paths = {sysconfig.get_path('purelib'), sysconfig.get_path('platlib')}\n"
+        "for name in sorted(set(sys.modules) - before):\n"
+        "    path = getattr(sys.modules[name], '__file__', None) or ''\n"
+        "    third_party = any(path.startswith(p) for p in paths)\n"
+        "    if name.startswith('tensorly') or third_party:\n"
+        "        print(name)",
+    )
+    modules = set(stdout.split())
+    tensorly_modules = {name for name in modules if name.split(".")[0] == "tensorly"}
+    assert_(
+        tensorly_modules <= IMPORTED_MODULES,
+        f"import tensorly loads {sorted(tensorly_modules - IMPORTED_MODULES)}",
+    )
+    packages = {name.split(".")[0] for name in modules}
+    assert_(
+        packages <= IMPORTED_PACKAGES,
+        f"import tensorly loads {sorted(packages - IMPORTED_PACKAGES)}",
+    )
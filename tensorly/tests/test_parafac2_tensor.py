@@ -10,6 +10,7 @@ from ..parafac2_tensor import (
     _validate_parafac2_tensor,
     parafac2_to_slice,
     parafac2_to_slices,
+    parafac2_iter_slices,
     parafac2_normalise,
     apply_parafac2_projections,
 )
@@ -18,6 +19,7 @@ from ..testing import (
     assert_array_almost_equal,
     assert_equal,
     assert_raises,
+    assert_,
 )
 from ..random import random_parafac2
 
@@ -133,6 +135,11 @@ def test_parafac2_to_slices():
     ):
         assert_array_equal(true_slice, est_slice)
 
+    slices = parafac2_iter_slices((weights, factors, projections))
+    assert_(not isinstance(slices, list))
+    for true_slice in true_res:
+        assert_array_equal(true_slice, next(slices))
+
 
 def test_parafac2_to_unfolded():
     """Test for parafac2_to_unfolded
@@ -140,3 +140,17 @@ def test_svd_compression_gives_orthonormal_loadings():
     for loading_matrix in loadings:
         gramian = tl.matmul(tl.transpose(loading_matrix), loading_matrix)
         assert_allclose(gramian, tl.eye(tl.shape(gramian)[0]), atol=1e-10)
+
+
+def test_svd_compression_n_jobs():
+    """Compressing the slices in a thread pool gives the sequential result"""
+    rng = tl.check_random_state(1234)
+    tensor_slices = [tl.tensor(rng.random_sample((20, 5))) for _ in range(7)]
+    compressed_slices, loadings = svd_compress_tensor_slices(tensor_slices)
+    parallel_slices, parallel_loadings = svd_compress_tensor_slices(
+        tensor_slices, n_jobs=3
+    )
+    for compressed, parallel in zip(compressed_slices, parallel_slices):
+        assert_allclose(compressed, parallel)
+    for loading, parallel in zip(loadings, parallel_loadings):
+        assert_allclose(loading, parallel)
@@ -7,10 +7,8 @@ from .base import unfold, tensor_to_vec
 from .tenalg import multi_mode_dot, mode_dot
 from . import backend as tl
 import numpy as np
-from scipy.optimize import brentq
 import warnings
 
-
 # Author: Jean Kossaifi <jean.kossaifi+tensors@gmail.com>
 
 # License: BSD 3 clause
@@ -419,6 +417,8 @@ def validate_tucker_rank(tensor_shape, rank="same", rounding="round", fixed_mode
             + n_fixed_params * x
             - rank * n_param_tensor
         )
+        from scipy.optimize import brentq
+
         fraction_param = brentq(fun, 0.0, max(rank, 1.0))
         rank = [max(int(rounding_fun(s * fraction_param)), 1) for s in tensor_shape]
 
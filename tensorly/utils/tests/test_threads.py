@@ -0,0 +1,99 @@
+import sys
+
+import pytest
+
+import tensorly as tl
+from ..threads import split_threads, thread_pool
+from ...backend import BackendManager
+from ...backend.numpy_backend import NumpyBackend
+from ...testing import assert_
+
+
+class FakeTorch:
+    """Records the number of threads set, as torch.set_num_threads would"""
+
+    def __init__(self, n_threads):
+        self.n_threads = n_threads
+
+    def get_num_threads(self):
+        return self.n_threads
+
+    def set_num_threads(self, n_threads):
+        self.n_threads = n_threads
+
+
+def test_threads(monkeypatch):
+    torch = FakeTorch(8)
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    default = tl.get_num_threads()
+
+    with tl.threads(4):
+        assert_(tl.get_num_threads() == 4)
+        assert_(torch.n_threads == 4)
+
+        # The workers of a thread pool share the budget
+        with split_threads(3):
+            assert_(torch.n_threads == 1)
+            assert_(tl.get_num_threads() == 4)
+        with split_threads(2):
+            assert_(torch.n_threads == 2)
+        assert_(torch.n_threads == 4)
+
+        with tl.threads(2):
+            assert_(tl.get_num_threads() == 2)
+        assert_(tl.get_num_threads() == 4)
+        assert_(torch.n_threads == 4)
+
+    assert_(tl.get_num_threads() == default)
+    assert_(torch.n_threads == 8)
+
+    with pytest.raises(ValueError):
+        tl.set_num_threads(0)
+    with pytest.raises(ValueError):
+        tl.set_num_threads(1.5)
+
+
+def test_split_threads_overlapping(monkeypatch):
+    torch = FakeTorch(8)
+    monkeypatch.setitem(sys.modules, "torch", torch)
+
+    # Pools running at the same time from different threads share the budget, and
+    # may exit in any order
+    with tl.threads(8):
+        first, second = split_threads(2), split_threads(4)
+        first.__enter__()
+        assert_(torch.n_threads == 4)
+        second.__enter__()
+        assert_(torch.n_threads == 1)
+        first.__exit__(None, None, None)
+        assert_(torch.n_threads == 2)
+        second.__exit__(None, None, None)
+        assert_(torch.n_threads == 8)
+    assert_(torch.n_threads == 8)
+
+
+def test_threads_blas():
+    threadpoolctl = pytest.importorskip("threadpoolctl")
+
+    def blas_threads():
+        return [
+            info["num_threads"]
+            for info in threadpoolctl.threadpool_info()
+            if info["user_api"] == "blas"
+        ]
+
+    previous = blas_threads()
+    with tl.threads(1):
+        assert_(all(n_threads == 1 for n_threads in blas_threads()))
+    assert_(blas_threads() == previous)
+
+
+def test_thread_pool_backend():
+    # A backend only set in the calling thread is used by the workers
+    backend = NumpyBackend()
+    with tl.backend_context(backend, local_threadsafe=True):
+        with thread_pool(2) as executor:
+            backends = list(
+                executor.map(lambda _: BackendManager.current_backend(), range(4))
+            )
+    assert_(all(worker_backend is backend for worker_backend in backends))
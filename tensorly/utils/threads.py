@@ -0,0 +1,221 @@
+"""
+Number of threads used by the backends, and shared by the thread pools of TensorLy
+"""
+
+import os
+import sys
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# License: BSD 3 clause
+
+# Thread budget set by the user, None if not set
+_NUM_THREADS = None
+
+# Workers of the thread pools currently running, which share the thread budget, and
+# callable restoring the limits from before the first of these pools
+_SPLIT_LOCK = threading.Lock()
+_SPLIT_WORKERS = 0
+_RESTORE_SPLIT = None
+
+
+def get_num_threads():
+    """Returns the number of threads TensorLy and the backends may use
+
+    Returns
+    -------
+    n_threads : int
+        value given to `set_num_threads` or `threads`, by default the number of CPUs
+    """
+    if _NUM_THREADS is not None:
+        return _NUM_THREADS
+    return os.cpu_count() or 1
+
+
+def _set_backend_threads(n_threads, tensorflow=True):
+    """Sets the number of threads of the BLAS libraries, PyTorch and TensorFlow
+
+    The BLAS libraries (e.g. OpenBLAS, MKL, used by NumPy) are only limited if
+    threadpoolctl is installed, and PyTorch and TensorFlow only if they are imported.
+
+    Returns
+    -------
+    restore : callable
+        restores the previous number of threads
+    """
+    restores = []
+
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        pass
+    else:
+        limits = threadpool_limits(limits=n_threads, user_api="blas")
+        restores.append(limits.restore_original_limits)
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        previous_torch_threads = torch.get_num_threads()
+        torch.set_num_threads(n_threads)
+        restores.append(lambda: torch.set_num_threads(previous_torch_threads))
+
+    tf = sys.modules.get("tensorflow") if tensorflow else None
+    if tf is not None:
+        previous_tf_threads = tf.config.threading.get_intra_op_parallelism_threads()
+        try:
+            tf.config.threading.set_intra_op_parallelism_threads(n_threads)
+        except RuntimeError:
+            warnings.warn(
+                "The number of threads of TensorFlow can only be set before it runs any "
+                "operation, it is left unchanged.",
+                RuntimeWarning,
+            )
+        else:
+
+            def restore_tf():
+                try:
+                    tf.config.threading.set_intra_op_parallelism_threads(
+                        previous_tf_threads
+                    )
+                except RuntimeError:
+                    pass
+
+            restores.append(restore_tf)
+
+    def restore():
+        for function in reversed(restores):
+            function()
+
+    return restore
+
+
+def _check_num_threads(n_threads):
+    if int(n_threads) != n_threads or n_threads < 1:
+        raise ValueError(
+            f"The number of threads should be a positive integer, got {n_threads}."
+        )
+    return int(n_threads)
+
+
+def set_num_threads(n_threads):
+    """Sets the number of threads TensorLy and the backends may use
+
+    Limits the threads of the BLAS libraries used by NumPy (only if threadpoolctl
+    is installed), of PyTorch and of TensorFlow (if they are imported; TensorFlow
+    only before it has run any operation). The thread pools of TensorLy (e.g. the
+    `n_jobs` of `tensorly.tenalg.proximal.hals_nnls`) share this budget: each of their
+    workers gets a fraction of it.
+
+    Parameters
+    ----------
+    n_threads : int
+
+    See also
+    --------
+    threads : context manager setting the number of threads temporarily
+    """
+    global _NUM_THREADS
+    n_threads = _check_num_threads(n_threads)
+    _set_backend_threads(n_threads)
+    _NUM_THREADS = n_threads
+
+
+@contextmanager
+def threads(n_threads):
+    """Context manager setting the number of threads TensorLy and the backends may use
+
+    The limits are those of `set_num_threads`, and the previous ones are restored on
+    exit. They apply to the whole process: e.g. to run several decompositions in a
+    pool of 4 processes on 16 cores, call ``tl.set_num_threads(4)`` in each process.
+
+    Parameters
+    ----------
+    n_threads : int
+
+    Examples
+    --------
+    >>> import tensorly as tl
+    >>> with tl.threads(1):
+    ...     tl.get_num_threads()
+    1
+    """
+    global _NUM_THREADS
+    n_threads = _check_num_threads(n_threads)
+    previous_num_threads = _NUM_THREADS
+    restore = _set_backend_threads(n_threads)
+    _NUM_THREADS = n_threads
+    try:
+        yield
+    finally:
+        _NUM_THREADS = previous_num_threads
+        restore()
+
+
+@contextmanager
+def split_threads(n_workers):
+    """Shares the thread budget between `n_workers` workers running concurrently
+
+    Within the context, the BLAS libraries and PyTorch use ``get_num_threads() //
+    n_workers`` threads (at least one), so that the workers of a thread pool do not
+    oversubscribe the cores. As these limits apply to the whole process, the workers of
+    pools running at the same time (e.g. from different threads) share the budget, and
+    the previous limits are restored once the last of them exits.
+
+    Parameters
+    ----------
+    n_workers : int
+    """
+    if n_workers <= 1:
+        yield
+        return
+
+    _add_split_workers(n_workers)
+    try:
+        yield
+    finally:
+        _add_split_workers(-n_workers)
+
+
+def _add_split_workers(n_workers):
+    global _SPLIT_WORKERS, _RESTORE_SPLIT
+    with _SPLIT_LOCK:
+        _SPLIT_WORKERS += n_workers
+        if not _SPLIT_WORKERS:
+            _RESTORE_SPLIT()
+            _RESTORE_SPLIT = None
+            return
+        # The threads of TensorFlow cannot be changed once it is used
+        restore = _set_backend_threads(
+            max(1, get_num_threads() // _SPLIT_WORKERS), tensorflow=False
+        )
+        if _RESTORE_SPLIT is None:
+            _RESTORE_SPLIT = restore
+
+
+@contextmanager
+def thread_pool(n_workers):
+    """Thread pool of `n_workers` workers running with the backend of the caller
+
+    The backend of the caller, even if it is only set for its thread (e.g. with
+    ``tl.backend_context(backend, local_threadsafe=True)``), is set locally in each
+    worker, and the workers share the thread budget as in `split_threads`.
+
+    Parameters
+    ----------
+    n_workers : int
+
+    Yields
+    ------
+    executor : concurrent.futures.ThreadPoolExecutor
+    """
+    from ..backend import BackendManager
+
+    backend = BackendManager.current_backend()
+    with split_threads(n_workers), ThreadPoolExecutor(
+        max_workers=n_workers,
+        initializer=BackendManager.set_backend,
+        initargs=(backend, True),
+    ) as executor:
+        yield executor